@@ -0,0 +1,61 @@
+"""
+Compare two benchmark reports produced by benchmarks.run.
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+import sys
+
+
+METRICS = [
+    ('p50 ms', lambda result: result['latency_ms']['p50']),
+    ('p95 ms', lambda result: result['latency_ms']['p95']),
+    ('p99 ms', lambda result: result['latency_ms']['p99']),
+    ('req/s', lambda result: result['rps']),
+    ('queries', lambda result: (result['queries_per_request'] or {}).get('mean')),
+]
+
+
+def change(before, after):
+    if before is None or after is None:
+        return ''
+    if not before:
+        return 'n/a'
+    return f'{(after - before) / before * 100:+.1f}%'
+
+
+def compare(before, after):
+    """Rows of (scenario, metric, before, after, change) for scenarios present in both reports"""
+    rows = []
+    for name, result in after['scenarios'].items():
+        baseline = before['scenarios'].get(name)
+        if baseline is None:
+            continue
+        for metric, read in METRICS:
+            old, new = read(baseline), read(result)
+            rows.append((name, metric, old, new, change(old, new)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('before', help='Baseline report')
+    parser.add_argument('after', help='New report')
+    args = parser.parse_args(argv)
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"{'scenario':<20} {'metric':<8} {'before':>10} {'after':>10} {'change':>9}")
+    for name, metric, old, new, delta in compare(before, after):
+        old = '-' if old is None else f'{old:g}'
+        new = '-' if new is None else f'{new:g}'
+        print(f'{name:<20} {metric:<8} {old:>10} {new:>10} {delta:>9}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
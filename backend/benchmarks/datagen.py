@@ -0,0 +1,71 @@
+"""
+Synthetic data generator for benchmarks: N employees x D days of attendance
+"""
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from core import departments, summary
+from core.models import Attendance, Employee
+
+
+EMPLOYEE_PREFIX = 'BENCH'
+DEPARTMENTS = ['Engineering', 'Sales', 'Marketing', 'Finance', 'HR', 'Support', 'Operations', 'Legal']
+FIRST_NAMES = ['Aarav', 'Priya', 'Rohan', 'Ananya', 'Vikram', 'Sneha', 'Arjun', 'Kavya', 'Rahul', 'Meera']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Gupta', 'Nair', 'Singh', 'Das', 'Mehta', 'Rao']
+ABSENCE_RATE = 0.1
+BATCH_SIZE = 2000
+
+
+def employee_id(index):
+    """Deterministic employee id for the index-th generated employee"""
+    return f'{EMPLOYEE_PREFIX}{index:06d}'
+
+
+def clear():
+    """Delete previously generated benchmark data (attendance cascades), then resync summaries"""
+    deleted, _ = Employee.objects.filter(employee_id__startswith=EMPLOYEE_PREFIX).delete()
+    summary.rebuild()
+    return deleted
+
+
+def generate(employees, days, seed=0, today=None):
+    """
+    Create `employees` employees with one attendance mark per day for the last
+    `days` days (ending today). The same seed always yields the same data set.
+    Returns the generated employee ids.
+    """
+    rng = random.Random(seed)
+    today = today or timezone.now().date()
+    ids = [employee_id(index) for index in range(employees)]
+
+    with transaction.atomic():
+        department_names = departments.resolve(DEPARTMENTS)
+        Employee.objects.bulk_create([
+            Employee(
+                employee_id=ids[index],
+                full_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                email=f'{ids[index].lower()}@bench.example.com',
+                department=department_names[DEPARTMENTS[index % len(DEPARTMENTS)]]
+            )
+            for index in range(employees)
+        ], batch_size=BATCH_SIZE)
+
+        pks = Employee.objects.filter(employee_id__in=ids).values_list('pk', flat=True)
+        batch = []
+        for pk in pks.iterator(chunk_size=BATCH_SIZE):
+            for day in range(days):
+                status = 'Absent' if rng.random() < ABSENCE_RATE else 'Present'
+                batch.append(Attendance(employee_id=pk, date=today - timedelta(days=day), status=status))
+            if len(batch) >= BATCH_SIZE:
+                Attendance.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+                batch = []
+        if batch:
+            Attendance.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+        # bulk_create skips signals, so resync the headcounts and summary table in one pass
+        summary.rebuild()
+
+    return ids
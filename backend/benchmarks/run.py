@@ -0,0 +1,265 @@
+"""
+Run API benchmark scenarios and report latency, throughput and queries per request as JSON.
+
+    python -m benchmarks.run --employees 1000 --days 30 --requests 200 --output before.json
+    python -m benchmarks.run --target http://127.0.0.1:8000 --generate --concurrency 8
+
+The default `client` target creates a throwaway test database, fills it with
+generated data and calls the API in-process through Django's test client, so
+SQL queries can be counted. An http(s) URL benchmarks a running server
+(e.g. gunicorn) over the network instead; there the data must already exist in
+the server's database, or be created with --generate.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib import error, parse, request as urlrequest
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies, status_codes, elapsed, queries):
+    """Aggregate raw samples of one scenario into the report format"""
+    ms = sorted(latency * 1000 for latency in latencies)
+    result = {
+        'requests': len(latencies),
+        'errors': sum(1 for code in status_codes if not 200 <= code < 300),
+        'status_codes': dict(sorted(Counter(str(code) for code in status_codes).items())),
+        'elapsed_s': round(elapsed, 4),
+        'rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'p50': percentile(ms, 50),
+            'p95': percentile(ms, 95),
+            'p99': percentile(ms, 99),
+            'mean': sum(ms) / len(ms) if ms else None,
+            'max': ms[-1] if ms else None
+        },
+        'queries_per_request': None
+    }
+    result['latency_ms'] = {
+        key: round(value, 3) if value is not None else None
+        for key, value in result['latency_ms'].items()
+    }
+    if queries:
+        result['queries_per_request'] = {
+            'mean': round(sum(queries) / len(queries), 2),
+            'max': max(queries)
+        }
+    return result
+
+
+class ClientTarget:
+    """Calls the API in-process through Django's test client, counting queries per request"""
+    name = 'client'
+
+    def __init__(self):
+        from django.test import Client
+        self.client = Client()
+
+    def send(self, req):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            if req.method == 'GET':
+                response = self.client.get(req.path, req.params, secure=True)
+            else:
+                response = self.client.generic(
+                    req.method, req.path, json.dumps(req.body),
+                    content_type='application/json', secure=True
+                )
+            if response.streaming:
+                b''.join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        return elapsed, response.status_code, len(captured)
+
+    def run(self, scenario, ctx, iterations, offset, concurrency):
+        # The test client shares one database connection, so requests run one at a time
+        return [self.send(scenario.build(ctx, offset + i)) for i in range(iterations)]
+
+
+class HttpTarget:
+    """Calls a running server over HTTP with a pool of worker threads"""
+
+    def __init__(self, base_url, timeout=30):
+        self.name = base_url
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def send(self, req):
+        url = self.base_url + req.path
+        if req.params:
+            url += '?' + parse.urlencode(req.params)
+        data = json.dumps(req.body).encode() if req.body is not None else None
+        http_request = urlrequest.Request(url, data=data, method=req.method, headers={
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        })
+
+        start = time.perf_counter()
+        try:
+            with urlrequest.urlopen(http_request, timeout=self.timeout) as response:
+                response.read()
+                status_code = response.status
+        except error.HTTPError as e:
+            e.read()
+            status_code = e.code
+        except (error.URLError, OSError):
+            status_code = 0
+        return time.perf_counter() - start, status_code, None
+
+    def run(self, scenario, ctx, iterations, offset, concurrency):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(lambda i: self.send(scenario.build(ctx, offset + i)), range(iterations)))
+
+
+def run_scenario(target, scenario, ctx, iterations, warmup, concurrency, offset):
+    """Warm up, then time `iterations` requests of one scenario"""
+    if warmup:
+        target.run(scenario, ctx, warmup, offset, concurrency)
+
+    start = time.perf_counter()
+    samples = target.run(scenario, ctx, iterations, offset + warmup, concurrency)
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, _, _ in samples]
+    status_codes = [status_code for _, status_code, _ in samples]
+    queries = [count for _, _, count in samples if count is not None]
+    return summarize(latencies, status_codes, elapsed, queries)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv):
+    from .scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', default='client', help="'client' (default) or the base URL of a running server")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated scenarios (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--employees', type=int, default=200, help='Generated employees (default: 200)')
+    parser.add_argument('--days', type=int, default=30, help='Generated days of attendance (default: 30)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for generated data (default: 0)')
+    parser.add_argument('--requests', type=int, default=200, help='Timed requests per scenario (default: 200)')
+    parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per scenario (default: 10)')
+    parser.add_argument('--concurrency', type=int, default=1, help='Parallel requests, http target only (default: 1)')
+    parser.add_argument('--generate', action='store_true',
+                        help="http target: replace benchmark data in the configured database before running")
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+    if args.employees < 1 or args.days < 1 or args.requests < 1:
+        parser.error('--employees, --days and --requests must be positive.')
+    if args.target != 'client' and not args.target.startswith(('http://', 'https://')):
+        parser.error("--target must be 'client' or an http(s) URL.")
+    return args
+
+
+def main(argv=None):
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hrms.settings')
+
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from django.utils import timezone
+
+    from . import datagen
+    from .scenarios import SCENARIOS, Context
+
+    args = parse_args(argv)
+    use_client = args.target == 'client'
+
+    old_name = None
+    if use_client:
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    try:
+        if use_client or args.generate:
+            if not use_client:
+                datagen.clear()
+            started = time.perf_counter()
+            employee_ids = datagen.generate(args.employees, args.days, seed=args.seed)
+            generate_s = round(time.perf_counter() - started, 3)
+        else:
+            employee_ids = [datagen.employee_id(index) for index in range(args.employees)]
+            generate_s = None
+
+        target = ClientTarget() if use_client else HttpTarget(args.target)
+        ctx = Context(employee_ids=employee_ids, days=args.days, today=timezone.now().date())
+
+        # Write scenarios go last so reads see the generated data set unchanged
+        ordered = sorted(args.scenarios, key=lambda name: SCENARIOS[name].writes)
+        results = {}
+        for name in ordered:
+            print(f'Running {name}...', file=sys.stderr)
+            results[name] = run_scenario(
+                target, SCENARIOS[name], ctx, args.requests, args.warmup, args.concurrency, offset=0
+            )
+    finally:
+        if use_client:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    report = {
+        'meta': {
+            'target': target.name,
+            'database': connection.vendor,
+            'employees': args.employees,
+            'days': args.days,
+            'seed': args.seed,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'concurrency': 1 if use_client else args.concurrency,
+            'generate_s': generate_s,
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'timestamp': timezone.now().isoformat()
+        },
+        'scenarios': results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+        print(f'Wrote {args.output}', file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
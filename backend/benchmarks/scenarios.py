@@ -0,0 +1,117 @@
+"""
+Benchmark scenarios. Each scenario turns an iteration number into one request.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable
+
+from .datagen import DEPARTMENTS, EMPLOYEE_PREFIX, FIRST_NAMES, LAST_NAMES
+
+
+@dataclass
+class Context:
+    """What scenarios know about the generated data set"""
+    employee_ids: list
+    days: int
+    today: object
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    params: dict = field(default_factory=dict)
+    body: dict = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    build: Callable[[Context, int], Request]
+    writes: bool = False
+
+
+def employee_list(ctx, i):
+    pages = max(1, len(ctx.employee_ids) // 50)
+    return Request('GET', '/api/employees/', {'page': 1 + i % min(pages, 5), 'page_size': 50})
+
+
+def employee_cursor(ctx, i):
+    return Request('GET', '/api/employees/', {'page_size': 50})
+
+
+def attendance_list(ctx, i):
+    return Request('GET', '/api/attendance/', {'page_size': 100})
+
+
+def attendance_filter(ctx, i):
+    return Request('GET', '/api/attendance/', {
+        'department': DEPARTMENTS[i % len(DEPARTMENTS)],
+        'status': 'Absent',
+        'date_from': str(ctx.today - timedelta(days=min(ctx.days, 7) - 1)),
+        'page_size': 100
+    })
+
+
+def employee_stats(ctx, i):
+    employee_id = ctx.employee_ids[i % len(ctx.employee_ids)]
+    return Request('GET', f'/api/employees/{employee_id}/stats/')
+
+
+def stats_batch(ctx, i):
+    return Request('GET', '/api/stats/employees/', {'department': DEPARTMENTS[i % len(DEPARTMENTS)]})
+
+
+def mark_attendance(ctx, i):
+    """One new mark per request, on days before the generated range so it never conflicts"""
+    employee_id = ctx.employee_ids[i % len(ctx.employee_ids)]
+    date = ctx.today - timedelta(days=ctx.days + i // len(ctx.employee_ids))
+    return Request('POST', '/api/attendance/', body={
+        'employee_id': employee_id,
+        'date': str(date),
+        'status': 'Present'
+    })
+
+
+def create_employee(ctx, i):
+    """One new employee per request; the BENCH prefix lets datagen.clear() remove them"""
+    employee_id = f'{EMPLOYEE_PREFIX}N{i:06d}'
+    return Request('POST', '/api/employees/', body={
+        'employee_id': employee_id,
+        'full_name': f'New Employee {i}',
+        'email': f'{employee_id.lower()}@bench.example.com',
+        'department': DEPARTMENTS[i % len(DEPARTMENTS)]
+    })
+
+
+def employee_search(ctx, i):
+    """Rotate through an exact ID, an ID prefix (ten matches) and a name (about 1% of employees)"""
+    employee_id = ctx.employee_ids[i % len(ctx.employee_ids)]
+    queries = [
+        employee_id.lower(),
+        employee_id[:-1],
+        f'{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[i // 3 % len(LAST_NAMES)][:3]}',
+    ]
+    return Request('GET', '/api/employees/search/', {'q': queries[i % len(queries)], 'page_size': 20})
+
+
+def dashboard(ctx, i):
+    return Request('GET', '/api/dashboard/')
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario('employees-list', 'Employee list, page-number pagination', employee_list),
+        Scenario('employees-cursor', 'Employee list, first cursor page', employee_cursor),
+        Scenario('employee-search', 'Employee search by ID, ID prefix or name', employee_search),
+        Scenario('attendance-list', 'Attendance list, first page', attendance_list),
+        Scenario('attendance-filter', 'Attendance filtered by department, status and date range', attendance_filter),
+        Scenario('employee-stats', 'Attendance stats for one employee', employee_stats),
+        Scenario('stats-batch', 'Attendance stats for a department', stats_batch),
+        Scenario('mark-attendance', 'Mark attendance for one employee', mark_attendance, writes=True),
+        Scenario('create-employee', 'Create one employee', create_employee, writes=True),
+        Scenario('dashboard', 'Dashboard summary', dashboard),
+    ]
+}
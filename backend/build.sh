@@ -9,6 +9,7 @@ pip install -r requirements.txt
 echo "Running database migrations..."
 python manage.py makemigrations --noinput
 python manage.py migrate --noinput
+python manage.py create_attendance_partitions
 
 echo "Collecting static files..."
 python manage.py collectstatic --no-input
@@ -2,23 +2,76 @@
 Django admin configuration for HRMS models
 """
 from django.contrib import admin
-from .models import Employee, Attendance
+from . import search
+from .models import Department, Employee, Attendance, AttendanceArchive, DailyAttendanceSummary
+
+
+@admin.register(Department)
+class DepartmentAdmin(admin.ModelAdmin):
+    list_display = ['name', 'headcount', 'updated_at']
+    search_fields = ['name']
+    ordering = ['name']
+    readonly_fields = ['headcount', 'created_at', 'updated_at']
 
 
 @admin.register(Employee)
 class EmployeeAdmin(admin.ModelAdmin):
     list_display = ['employee_id', 'full_name', 'email', 'department', 'created_at']
+    list_select_related = ['department']
     list_filter = ['department', 'created_at']
-    search_fields = ['employee_id', 'full_name', 'email', 'department']
+    search_fields = ['employee_id', 'full_name', 'email', 'department__name']
     ordering = ['-created_at']
     readonly_fields = ['created_at', 'updated_at']
 
+    def get_search_results(self, request, queryset, search_term):
+        """Use the indexed employee search instead of icontains on every search field"""
+        if not search_term.strip():
+            return queryset, False
+        return search.filter_employees(queryset, search_term), False
+
 
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
     list_display = ['employee', 'date', 'status', 'created_at']
+    list_select_related = ['employee']
     list_filter = ['status', 'date', 'created_at']
     search_fields = ['employee__employee_id', 'employee__full_name']
     ordering = ['-date']
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'date'
+    raw_id_fields = ['employee']
+
+
+@admin.register(AttendanceArchive)
+class AttendanceArchiveAdmin(admin.ModelAdmin):
+    list_display = ['employee', 'month', 'present_days', 'recorded_days']
+    list_select_related = ['employee']
+    list_filter = ['month']
+    search_fields = ['employee__employee_id', 'employee__full_name']
+    ordering = ['-month']
+    raw_id_fields = ['employee']
+    date_hierarchy = 'month'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='Present days')
+    def present_days(self, obj):
+        return bin(obj.present_mask).count('1')
+
+    @admin.display(description='Recorded days')
+    def recorded_days(self, obj):
+        return bin(obj.known_mask).count('1')
+
+
+@admin.register(DailyAttendanceSummary)
+class DailyAttendanceSummaryAdmin(admin.ModelAdmin):
+    list_display = ['date', 'department', 'present', 'absent', 'headcount', 'updated_at']
+    list_select_related = ['department']
+    list_filter = ['department', 'date']
+    ordering = ['-date', 'department_id']
+    readonly_fields = ['updated_at']
+    date_hierarchy = 'date'
@@ -0,0 +1,295 @@
+"""
+Archived attendance for HRMS Lite.
+
+Months close ATTENDANCE_OPEN_MONTHS months after the current one: their
+attendance can no longer be marked, edited or deleted, and
+`manage.py archive_attendance` rolls them into one AttendanceArchive row per
+employee and month (a present-days and a recorded-days bitmap) and removes the
+Attendance rows. Stats and exports read archived months through the helpers
+below, so they return the same numbers before and after archiving.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import (
+    Case,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+    When
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import partitions
+from .filters import filter_by_employee, get_date_range, get_statuses, parse_date_param
+from .models import Attendance, AttendanceArchive
+
+
+# Bits 0..30 stand for days 1..31
+FULL_MONTH = (1 << 31) - 1
+
+
+class BitCount(Func):
+    """Number of bits set in an integer"""
+    function = 'bit_count'
+    output_field = IntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # Portable fallback: add up the 31 day bits one by one
+        sql, params = compiler.compile(self.source_expressions[0])
+        terms = ' + '.join(f'(({sql} >> {bit}) & 1)' for bit in range(31))
+        return f'({terms})', params * 31
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # bit_count() is registered on every SQLite connection below
+        return super().as_sql(compiler, connection, **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        if connection.pg_version < 140000:
+            return self.as_sql(compiler, connection, **extra_context)
+        return super().as_sql(
+            compiler, connection, template='bit_count(%(expressions)s::bit(31))::integer', **extra_context
+        )
+
+
+@receiver(connection_created)
+def register_sqlite_functions(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function(
+            'bit_count', 1, lambda value: None if value is None else bin(value).count('1'), deterministic=True
+        )
+
+
+def closed_before(today=None):
+    """First day that can still be written; earlier attendance is closed. None when months never close."""
+    months = settings.ATTENDANCE_OPEN_MONTHS
+    if months is None:
+        return None
+    start = (today or timezone.now().date()).replace(day=1)
+    for _ in range(months):
+        start = (start - timedelta(days=1)).replace(day=1)
+    return start
+
+
+def is_closed(day):
+    cutoff = closed_before()
+    return cutoff is not None and day < cutoff
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def day_bit(day):
+    return 1 << (day.day - 1)
+
+
+def range_mask(month, date_from=None, date_to=None):
+    """Bits of the days of `month` within the inclusive date range"""
+    mask = FULL_MONTH
+    if date_from and month_start(date_from) == month:
+        mask &= FULL_MONTH & ~(day_bit(date_from) - 1)
+    if date_to and month_start(date_to) == month:
+        mask &= (day_bit(date_to) << 1) - 1
+    return mask
+
+
+def days(month, present_mask, known_mask):
+    """(date, status) of every recorded day of an archived month"""
+    day = month
+    while day.month == month.month:
+        bit = day_bit(day)
+        if known_mask & bit:
+            yield day, 'Present' if present_mask & bit else 'Absent'
+        day += timedelta(days=1)
+
+
+def archived_counts(date_from=None, date_to=None):
+    """
+    (total days, present days) expressions for annotating an Employee
+    queryset with its archived attendance within an optional date range
+    """
+    archives = AttendanceArchive.objects.filter(employee=OuterRef('pk')).order_by()
+    if date_from:
+        archives = archives.filter(month__gte=month_start(date_from))
+    if date_to:
+        archives = archives.filter(month__lte=date_to)
+
+    # Only the months at the ends of the range are partly included
+    boundaries = {month_start(day) for day in (date_from, date_to) if day}
+
+    def days_set(field):
+        days = F(field)
+        if boundaries:
+            days = days.bitand(Case(
+                *[When(month=month, then=Value(range_mask(month, date_from, date_to))) for month in boundaries],
+                default=Value(FULL_MONTH),
+                output_field=IntegerField()
+            ))
+        # A plain SUM without GROUP BY always returns one row, so the outer
+        # query needs no COALESCE and doesn't add the subquery to its GROUP BY
+        total = Func(Func(BitCount(days), function='SUM'), Value(0), function='COALESCE', output_field=IntegerField())
+        return Subquery(archives.annotate(days=total).values('days'), output_field=IntegerField())
+
+    return days_set('known_mask'), days_set('present_mask')
+
+
+def export_rows(attendances, params, chunk_size):
+    """
+    (employee_id, name, department, date, status) of the archived days
+    matching the export filters, month by month, followed by the live rows in
+    `attendances` in (date, id) order. Only closed months are archived, so
+    the rows come out ordered by date. Each side is read with its own query in
+    index order and nothing is sorted in the database; within a day archived
+    rows are ordered by employee_id (they no longer have row ids).
+    """
+    date = parse_date_param(params, 'date')
+    date_from, date_to = get_date_range(params, start='date_from', end='date_to')
+    statuses = get_statuses(params)
+
+    archives = filter_by_employee(AttendanceArchive.objects.all(), params)
+    if date:
+        archives = archives.filter(month=month_start(date))
+    if date_from:
+        archives = archives.filter(month__gte=month_start(date_from))
+    if date_to:
+        archives = archives.filter(month__lte=date_to)
+
+    columns = ('employee__employee_id', 'employee__full_name', 'employee__department__name')
+    archived = archives.order_by('month').values_list(
+        'month', *columns, 'present_mask', 'known_mask'
+    ).iterator(chunk_size=chunk_size)
+    live = attendances.order_by('date', 'id').values_list(
+        *columns, 'date', 'status'
+    ).iterator(chunk_size=chunk_size)
+
+    def wanted(day, status):
+        return (
+            (not date or day == date) and
+            (not date_from or day >= date_from) and
+            (not date_to or day <= date_to) and
+            (not statuses or status in statuses)
+        )
+
+    def merged():
+        # The archive rows of one month are buffered and expanded into days
+        for month, group in groupby(archived, key=lambda row: row[0]):
+            expanded = [
+                (employee_id, name, department, day, status)
+                for _, employee_id, name, department, present_mask, known_mask in group
+                for day, status in days(month, present_mask, known_mask)
+                if wanted(day, status)
+            ]
+            expanded.sort(key=lambda row: (row[3], row[0]))
+            yield from expanded
+        yield from live
+
+    return merged()
+
+
+def employee_marks(employee):
+    """(date, status) of all of an employee's attendance, live and archived"""
+    marks = list(employee.attendances.values_list('date', 'status'))
+    for month, present_mask, known_mask in employee.attendance_archives.values_list(
+        'month', 'present_mask', 'known_mask'
+    ):
+        marks.extend(days(month, present_mask, known_mask))
+    return marks
+
+
+def daily_counts(date_from=None, date_to=None):
+    """{(date, department_id): {'present': n, 'absent': n}} of the archived attendance in a date range"""
+    archives = AttendanceArchive.objects.all()
+    if date_from:
+        archives = archives.filter(month__gte=month_start(date_from))
+    if date_to:
+        archives = archives.filter(month__lte=date_to)
+
+    counts = defaultdict(lambda: {'present': 0, 'absent': 0})
+    for month, department, present_mask, known_mask in archives.values_list(
+        'month', 'employee__department', 'present_mask', 'known_mask'
+    ).iterator():
+        for day, status in days(month, present_mask, known_mask):
+            if (not date_from or day >= date_from) and (not date_to or day <= date_to):
+                counts[(day, department)]['present' if status == 'Present' else 'absent'] += 1
+    return counts
+
+
+def archivable_months(before):
+    """First days of the months with live attendance dated before `before`"""
+    oldest = Attendance.objects.filter(date__lt=before).order_by('date').values_list('date', flat=True).first()
+    if oldest is None:
+        return []
+    return [start for start, _ in partitions.periods(oldest, before - timedelta(days=1), 'month')]
+
+
+def archive_month(month):
+    """
+    Roll one month of Attendance into AttendanceArchive rows and delete the
+    rows, in one transaction. Existing archive rows of the month are merged,
+    with live rows winning for days recorded in both.
+    Returns (attendance rows archived, archive rows written).
+    """
+    end = partitions.next_period(month, 'month')
+    with transaction.atomic():
+        masks = defaultdict(lambda: [0, 0])
+        rows = 0
+        for employee_pk, day, status in Attendance.objects.filter(
+            date__gte=month, date__lt=end
+        ).values_list('employee_id', 'date', 'status').iterator():
+            bit = day_bit(day)
+            masks[employee_pk][1] |= bit
+            if status == 'Present':
+                masks[employee_pk][0] |= bit
+            rows += 1
+        if not rows:
+            return 0, 0
+
+        for employee_pk, present_mask, known_mask in AttendanceArchive.objects.filter(
+            month=month, employee__in=masks.keys()
+        ).values_list('employee_id', 'present_mask', 'known_mask'):
+            live_present, live_known = masks[employee_pk]
+            masks[employee_pk] = [(present_mask & ~live_known) | live_present, known_mask | live_known]
+
+        AttendanceArchive.objects.bulk_create(
+            [
+                AttendanceArchive(employee_id=employee_pk, month=month, present_mask=present, known_mask=known)
+                for employee_pk, (present, known) in masks.items()
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['employee', 'month'],
+            update_fields=['present_mask', 'known_mask']
+        )
+        delete_month(month, end)
+    return rows, len(masks)
+
+
+def delete_month(start, end):
+    """
+    Remove a month of Attendance without per-row signals (the daily summaries
+    keep counting archived days). A PostgreSQL partition holding exactly this
+    month is dropped instead.
+    """
+    if partitions.is_partitioned(connection):
+        for name, partition_start, partition_end in partitions.list_partitions(connection):
+            if (partition_start, partition_end) == (start, end):
+                with connection.cursor() as cursor:
+                    partitions.run_deferred_checks(cursor)
+                    cursor.execute(f'ALTER TABLE {partitions.quote(partitions.TABLE)} DETACH PARTITION {partitions.quote(name)}')
+                    cursor.execute(f'DROP TABLE {partitions.quote(name)}')
+                return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {connection.ops.quote_name(Attendance._meta.db_table)} WHERE date >= %s AND date < %s',
+            [start, end]
+        )
@@ -0,0 +1,263 @@
+"""
+Async API views for the read-heavy HRMS Lite endpoints.
+
+These mirror the sync GET endpoints under /api/async/ and use Django's async
+ORM, so under an ASGI server (uvicorn) a slow query waits without holding a
+worker. DRF 3.14 has no async views, so they are plain Django views returning
+the same JSON envelope.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views import View
+from rest_framework.exceptions import ValidationError
+
+from . import cache as dashboard_cache
+from . import dashboard
+from . import listing
+from .filters import get_date_range
+from .pagination import (
+    acount_queryset,
+    apaginate_by_page,
+    get_count_mode,
+    get_page_number,
+    get_page_size
+)
+from .serializers import AttendanceSerializer, EmployeeSerializer
+from .stats import employee_stats, employee_stats_queryset, format_employee_stats, format_stats_page
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder)
+
+
+async def run_in_thread(func):
+    """
+    Run a sync query function on its own thread and database connection.
+
+    Django 4.2's async ORM runs every query on one shared thread per request,
+    so gathering several of them doesn't overlap them. Queries run this way
+    do, each holding a connection from a worker thread; stale connections are
+    closed before and after just like at the start and end of a request.
+    """
+    def call():
+        close_old_connections()
+        try:
+            return func()
+        finally:
+            close_old_connections()
+
+    return await sync_to_async(call, thread_sensitive=False)()
+
+
+class AsyncAPIView(View):
+    """Base for async read endpoints"""
+    use_read_replica = True
+
+    def setup(self, request, *args, **kwargs):
+        # Lets the pagination and filter helpers shared with the DRF views read parameters
+        request.query_params = request.GET
+        super().setup(request, *args, **kwargs)
+
+
+class AsyncEmployeeListView(AsyncAPIView):
+    """
+    Async API endpoint for listing employees
+    GET: Same parameters and response as GET /api/employees/
+    """
+    paginator = listing.employee_paginator
+
+    async def get(self, request):
+        """Get a page of employees"""
+        try:
+            employees, fields, related = listing.employee_list_queryset(request.query_params)
+            page_size = get_page_size(request)
+
+            if 'page' in request.query_params:
+                page = get_page_number(request)
+                rows, total = await apaginate_by_page(employees, page, page_size)
+                meta = {'count': total, 'page': page, 'page_size': page_size}
+            else:
+                total = await acount_queryset(employees, get_count_mode(request))
+                rows, next_cursor = await self.paginator.apaginate(
+                    employees, request.query_params.get('cursor'), page_size
+                )
+                meta = {'count': total, 'next': next_cursor}
+
+            return listing.list_response(
+                request, json_response, rows, related, EmployeeSerializer(rows, many=True, fields=fields), meta
+            )
+
+        except ValidationError as e:
+            return json_response({
+                'success': False,
+                'error': e.detail
+            }, status=400)
+
+        except Exception as e:
+            return json_response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to fetch employees.',
+                    'details': str(e)
+                }
+            }, status=500)
+
+
+class AsyncAttendanceListView(AsyncAPIView):
+    """
+    Async API endpoint for listing attendance records
+    GET: Same filters, parameters and response as GET /api/attendance/
+    """
+    paginator = listing.attendance_paginator
+
+    async def get(self, request):
+        """Get attendance records with optional filters"""
+        try:
+            attendances, related = listing.attendance_list_queryset(request.query_params)
+
+            page_size = get_page_size(request)
+            total = await acount_queryset(attendances, get_count_mode(request))
+            page, next_cursor = await self.paginator.apaginate(
+                attendances, request.query_params.get('cursor'), page_size
+            )
+
+            return listing.list_response(
+                request, json_response, page, related, AttendanceSerializer(page, many=True),
+                {'count': total, 'next': next_cursor}
+            )
+
+        except ValidationError as e:
+            return json_response({
+                'success': False,
+                'error': e.detail
+            }, status=400)
+
+        except Exception as e:
+            return json_response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to fetch attendance records.',
+                    'details': str(e)
+                }
+            }, status=500)
+
+
+class AsyncEmployeeAttendanceStatsView(AsyncAPIView):
+    """
+    Async API endpoint for employee attendance statistics
+    GET: Same parameters and response as GET /api/employees/<employee_id>/stats/
+    """
+
+    async def get(self, request, employee_id):
+        """Get attendance statistics for an employee, optionally within a date range"""
+        try:
+            date_from, date_to = get_date_range(request.query_params)
+
+            stats = await employee_stats(employee_id, date_from, date_to).afirst()
+
+            if stats is None:
+                return json_response({
+                    'success': False,
+                    'error': {
+                        'message': f'Employee with ID {employee_id} not found.'
+                    }
+                }, status=404)
+
+            return json_response({
+                'success': True,
+                'data': format_employee_stats(stats, date_from, date_to)
+            })
+
+        except ValidationError as e:
+            return json_response({
+                'success': False,
+                'error': e.detail
+            }, status=400)
+
+        except Exception as e:
+            return json_response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to fetch attendance statistics.',
+                    'details': str(e)
+                }
+            }, status=500)
+
+
+class AsyncEmployeeStatsBatchView(AsyncAPIView):
+    """
+    Async API endpoint for attendance statistics of many employees
+    GET: Same parameters and response as GET /api/stats/employees/
+    """
+
+    async def get(self, request):
+        """Get attendance statistics for a page of employees"""
+        try:
+            params = request.query_params
+            date_from, date_to = get_date_range(params)
+            stats = employee_stats_queryset(params, date_from, date_to)
+
+            page = get_page_number(request)
+            page_size = get_page_size(request)
+            rows, total = await apaginate_by_page(stats, page, page_size)
+
+            return json_response(format_stats_page(rows, total, page, page_size, date_from, date_to))
+
+        except ValidationError as e:
+            return json_response({
+                'success': False,
+                'error': e.detail
+            }, status=400)
+
+        except Exception as e:
+            return json_response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to fetch attendance statistics.',
+                    'details': str(e)
+                }
+            }, status=500)
+
+
+class AsyncDashboardStatsView(AsyncAPIView):
+    """
+    Async API endpoint for dashboard statistics
+    GET: Same response as GET /api/dashboard/; on a cache miss the three
+    dashboard queries run concurrently
+    """
+
+    async def get(self, request):
+        """Get dashboard statistics"""
+        try:
+            payload, hit = await dashboard_cache.aget_dashboard(self.build_payload)
+
+            response = json_response({
+                'success': True,
+                'data': payload
+            })
+            response['X-Cache'] = 'HIT' if hit else 'MISS'
+            return response
+
+        except Exception as e:
+            return json_response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to fetch dashboard statistics.',
+                    'details': str(e)
+                }
+            }, status=500)
+
+    async def build_payload(self):
+        """Compute the dashboard statistics with the independent queries in parallel"""
+        today = timezone.now().date()
+        employees, totals, recent = await asyncio.gather(
+            run_in_thread(dashboard.total_employees),
+            run_in_thread(lambda: dashboard.today_totals(today)),
+            run_in_thread(dashboard.recent_attendance)
+        )
+        return dashboard.make_payload(today, employees, totals, recent)
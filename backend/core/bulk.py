@@ -0,0 +1,325 @@
+"""
+Bulk and upsert write helpers for HRMS Lite
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import cache, summary
+from .models import Employee, Attendance
+
+
+BULK_BATCH_SIZE = 1000
+MAX_BULK_ROWS = 10000
+
+
+def row_result(row, result, errors=None):
+    """Build the per-row result entry returned by bulk endpoints"""
+    entry = {
+        'index': row['index'],
+        'employee_id': row.get('employee_id'),
+        'date': str(row['date']) if row.get('date') else None,
+        'status': row.get('status'),
+        'result': result
+    }
+    if errors:
+        entry['errors'] = errors
+    return entry
+
+
+def mark_attendance(rows, upsert=False):
+    """
+    Mark attendance for many employees with a fixed number of queries:
+    one to resolve employee IDs, one to find existing marks and the batched INSERTs.
+    On PostgreSQL an upsert skips the lookup and takes each row's result from
+    the write itself, so concurrent roll calls never count a mark twice.
+
+    Each row is a dict with index, employee_id, date and status that already passed
+    field validation. Rows may carry a resolved 'employee' primary key and 'department' id.
+    Daily summaries are updated in the same transaction as the INSERTs.
+    Returns one result entry per row, in input order.
+    """
+    unresolved = {row['employee_id'] for row in rows if 'employee' not in row}
+    employees = {}
+    if unresolved:
+        employees = {
+            employee_id: (employee_pk, department)
+            for employee_id, employee_pk, department in Employee.objects.filter(
+                employee_id__in=unresolved
+            ).values_list('employee_id', 'pk', 'department_id')
+        }
+
+    results = {}
+    pending = {}
+    departments = {}
+    for row in rows:
+        if 'employee' in row:
+            employee_pk, department = row['employee'], row['department']
+        else:
+            employee_pk, department = employees.get(row['employee_id'], (None, None))
+
+        if employee_pk is None:
+            results[row['index']] = row_result(row, 'error', {
+                'employee_id': [f"Employee with ID '{row['employee_id']}' does not exist."]
+            })
+            continue
+
+        key = (employee_pk, row['date'])
+        if key in pending:
+            results[row['index']] = row_result(row, 'error', {
+                'detail': f"Duplicate of row {pending[key]['index']} in this request."
+            })
+            continue
+
+        pending[key] = row
+        departments[employee_pk] = department
+
+    if not pending:
+        return [results[row['index']] for row in rows]
+
+    with transaction.atomic():
+        if upsert and connection.vendor == 'postgresql':
+            written = upsert_rows_returning_results(pending)
+        else:
+            written = write_rows(pending, results, upsert)
+
+        changes = []
+        for key, result in written.items():
+            row = pending[key]
+            results[row['index']] = row_result(row, result)
+            if result == 'unchanged':
+                continue
+            department = departments[key[0]]
+            changes.append((key[1], department, row['status'], 1))
+            if result == 'updated':
+                changes.append((key[1], department, other_status(row['status']), -1))
+
+        if changes:
+            summary.apply_changes(changes)
+            cache.invalidate_dashboard()
+
+    return [results[row['index']] for row in rows]
+
+
+def other_status(status):
+    """The status a changed mark had before (a mark is either Present or Absent)"""
+    return next(value for value, _ in Attendance.STATUS_CHOICES if value != status)
+
+
+def write_rows(pending, results, upsert):
+    """
+    Read the existing marks of the pending {(employee_pk, date): row} under
+    row locks, then write the new and changed ones. A mark that already
+    exists is an error result unless upserting.
+    Returns {(employee_pk, date): result} for the rows that are not errors.
+    """
+    existing = {
+        (employee_pk, date): status
+        for employee_pk, date, status in Attendance.objects.select_for_update().filter(
+            employee_id__in={key[0] for key in pending},
+            date__in={key[1] for key in pending}
+        ).values_list('employee_id', 'date', 'status')
+    }
+
+    written = {}
+    to_write = []
+    for key, row in pending.items():
+        if key in existing:
+            if not upsert:
+                results[row['index']] = row_result(row, 'error', {
+                    'detail': f"Attendance for employee {row['employee_id']} on {row['date']} already exists."
+                })
+                continue
+            if existing[key] == row['status']:
+                written[key] = 'unchanged'
+                continue
+            written[key] = 'updated'
+        else:
+            written[key] = 'created'
+        to_write.append(Attendance(employee_id=key[0], date=key[1], status=row['status']))
+
+    if upsert:
+        Attendance.objects.bulk_create(
+            to_write,
+            batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['employee', 'date'],
+            update_fields=['status', 'updated_at']
+        )
+    else:
+        Attendance.objects.bulk_create(to_write, batch_size=BULK_BATCH_SIZE)
+    return written
+
+
+def upsert_rows_returning_results(pending):
+    """
+    PostgreSQL: upsert the pending {(employee_pk, date): row} marks in batched
+    INSERT ... ON CONFLICT statements that report what they did, as in
+    upsert_returning_result. Rows the statement didn't return already had
+    their status.
+    Returns {(employee_pk, date): result} for every pending row.
+    """
+    attendances = connection.ops.quote_name(Attendance._meta.db_table)
+    stamp = connection.ops.adapt_datetimefield_value(timezone.now())
+    written = dict.fromkeys(pending, 'unchanged')
+    keys = list(pending)
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(keys), BULK_BATCH_SIZE):
+            batch = keys[start:start + BULK_BATCH_SIZE]
+            params = []
+            for employee_pk, date in batch:
+                params += [
+                    employee_pk, connection.ops.adapt_datefield_value(date), pending[(employee_pk, date)]['status'],
+                    stamp, stamp
+                ]
+            cursor.execute(
+                f"""
+                INSERT INTO {attendances} (employee_id, date, status, created_at, updated_at)
+                VALUES {', '.join(['(%s, %s, %s, %s, %s)'] * len(batch))}
+                ON CONFLICT (employee_id, date) DO UPDATE SET
+                    status = excluded.status,
+                    updated_at = excluded.updated_at
+                WHERE {attendances}.status <> excluded.status
+                RETURNING employee_id, date, xmax = 0
+                """,
+                params
+            )
+            for employee_pk, date, created in cursor.fetchall():
+                written[(employee_pk, date)] = 'created' if created else 'updated'
+
+    return written
+
+
+def current_attendance(employee_id, date):
+    """
+    The employee's attendance row for a day, with the employee's department
+    and full_name; pk is None when there is no mark yet. None when the
+    employee does not exist.
+    """
+    attendances = connection.ops.quote_name(Attendance._meta.db_table)
+    employees = connection.ops.quote_name(Employee._meta.db_table)
+    sql = f"""
+        SELECT a.id, e.id AS employee_id, a.date, a.status, a.created_at, a.updated_at,
+            e.department_id AS department, e.full_name
+        FROM {employees} e
+        LEFT JOIN {attendances} a ON a.employee_id = e.id AND a.date = %s
+        WHERE e.employee_id = %s
+    """
+    return next(iter(Attendance.objects.raw(sql, [connection.ops.adapt_datefield_value(date), employee_id])), None)
+
+
+def upsert_returning_result(employee_id, date, status):
+    """
+    PostgreSQL: mark attendance with one INSERT ... ON CONFLICT statement that
+    reports what it did. (xmax = 0) is true only for a freshly inserted row,
+    and the DO UPDATE only fires when the status changes, so any other
+    returned row was updated from the other status. When nothing is written
+    the current row is read in the same statement.
+    Returns (attendance, result), or (None, None) when the employee does not exist.
+    """
+    attendances = connection.ops.quote_name(Attendance._meta.db_table)
+    employees = connection.ops.quote_name(Employee._meta.db_table)
+    day = connection.ops.adapt_datefield_value(date)
+    stamp = connection.ops.adapt_datetimefield_value(timezone.now())
+    sql = f"""
+        WITH employee AS (
+            SELECT id, department_id, full_name FROM {employees} WHERE employee_id = %s
+        ), written AS (
+            INSERT INTO {attendances} (employee_id, date, status, created_at, updated_at)
+            SELECT id, %s, %s, %s, %s FROM employee
+            ON CONFLICT (employee_id, date) DO UPDATE SET
+                status = excluded.status,
+                updated_at = excluded.updated_at
+            WHERE {attendances}.status <> excluded.status
+            RETURNING id, employee_id, date, status, created_at, updated_at, xmax = 0 AS is_created
+        )
+        SELECT w.id, w.employee_id, w.date, w.status, w.created_at, w.updated_at,
+            CASE WHEN w.is_created THEN 'created' ELSE 'updated' END AS result,
+            e.department_id AS department, e.full_name
+        FROM written w JOIN employee e ON e.id = w.employee_id
+        UNION ALL
+        SELECT a.id, a.employee_id, a.date, a.status, a.created_at, a.updated_at,
+            'unchanged', e.department_id, e.full_name
+        FROM {attendances} a JOIN employee e ON e.id = a.employee_id
+        WHERE a.date = %s AND a.status = %s AND NOT EXISTS (SELECT 1 FROM written)
+    """
+    params = [employee_id, day, status, stamp, stamp, day, status]
+    attendance = next(iter(Attendance.objects.raw(sql, params)), None)
+    if attendance is not None:
+        return attendance, attendance.result
+
+    # Nothing written or read: either the employee does not exist, or the row
+    # was committed by a concurrent marker after this statement's snapshot
+    # (it already has this status, or the DO UPDATE would have fired)
+    attendance = current_attendance(employee_id, date)
+    if attendance is None:
+        return None, None
+    return attendance, 'unchanged'
+
+
+def read_then_upsert(employee_id, date, status):
+    """
+    Other backends: read the current mark, then write. SQLite serializes
+    writers, so nothing can change the row between the two statements of
+    this transaction.
+    Returns (attendance, result), or (None, None) when the employee does not exist.
+    """
+    attendance = current_attendance(employee_id, date)
+    if attendance is None:
+        return None, None
+    if attendance.pk is not None and attendance.status == status:
+        return attendance, 'unchanged'
+
+    attendances = connection.ops.quote_name(Attendance._meta.db_table)
+    now = timezone.now()
+    stamp = connection.ops.adapt_datetimefield_value(now)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {attendances} (employee_id, date, status, created_at, updated_at)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (employee_id, date) DO UPDATE SET
+                status = excluded.status,
+                updated_at = excluded.updated_at
+            RETURNING id
+            """,
+            [attendance.employee_id, connection.ops.adapt_datefield_value(date), status, stamp, stamp]
+        )
+        pk = cursor.fetchone()[0]
+
+    result = 'created' if attendance.pk is None else 'updated'
+    attendance.pk, attendance.date, attendance.status, attendance.updated_at = pk, date, status, now
+    if result == 'created':
+        attendance.created_at = now
+    return attendance, result
+
+
+def upsert_attendance(employee_id, date, status):
+    """
+    Mark one employee's attendance for a day with a single
+    INSERT ... ON CONFLICT (employee_id, date) DO UPDATE, so retries and
+    concurrent markers never race between a lookup and the write.
+
+    The employee is resolved by the same statement on PostgreSQL. A repeated
+    mark doesn't write the row at all. Daily summaries and the dashboard
+    cache are updated in the same transaction.
+    Returns (attendance, result) with result one of 'created', 'updated' or
+    'unchanged', or (None, None) when the employee does not exist.
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            attendance, result = upsert_returning_result(employee_id, date, status)
+        else:
+            attendance, result = read_then_upsert(employee_id, date, status)
+
+        if result == 'created':
+            changes = [(date, attendance.department, status, 1)]
+        elif result == 'updated':
+            changes = [(date, attendance.department, status, 1), (date, attendance.department, other_status(status), -1)]
+        else:
+            return attendance, result
+
+        summary.apply_changes(changes)
+        cache.invalidate_dashboard()
+
+    return attendance, result
@@ -0,0 +1,238 @@
+"""
+Response and lookup caching for HRMS Lite
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import routers
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters for one cache (per process)"""
+
+    # Every cache's counters, for the metrics endpoint
+    registry = []
+
+    def __init__(self, name):
+        self.name = name
+        CacheStats.registry.append(self)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def invalidated(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self):
+        """Current counters and hit ratio"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+dashboard_stats = CacheStats('dashboard')
+
+
+def get_cache():
+    """Cache backend used for API responses"""
+    return caches[getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')]
+
+
+def dashboard_key(today=None):
+    """Cache key for the dashboard payload; it includes the date so it rolls over at midnight"""
+    today = today or timezone.now().date()
+    return f'hrms:dashboard:{today.isoformat()}'
+
+
+def get_dashboard(build):
+    """
+    Return (payload, hit) for today's dashboard, calling build() on a miss.
+    A TTL of 0 disables caching.
+
+    A miss is rebuilt from the primary: invalidation runs when a write
+    commits there, and a lagging replica read right after it would put the
+    stale numbers back in the cache for the whole TTL.
+    """
+    ttl = getattr(settings, 'DASHBOARD_CACHE_TTL', 30)
+    if ttl <= 0:
+        return build(), False
+
+    cache = get_cache()
+    key = dashboard_key()
+    payload = cache.get(key)
+    if payload is not None:
+        dashboard_stats.hit()
+        return payload, True
+
+    dashboard_stats.miss()
+    with routers.read_from_primary():
+        payload = build()
+    cache.set(key, payload, ttl)
+    return payload, False
+
+
+async def aget_dashboard(build):
+    """Async version of get_dashboard; build is a coroutine function"""
+    ttl = getattr(settings, 'DASHBOARD_CACHE_TTL', 30)
+    if ttl <= 0:
+        return await build(), False
+
+    cache = get_cache()
+    key = dashboard_key()
+    payload = await cache.aget(key)
+    if payload is not None:
+        dashboard_stats.hit()
+        return payload, True
+
+    dashboard_stats.miss()
+    with routers.read_from_primary():
+        payload = await build()
+    await cache.aset(key, payload, ttl)
+    return payload, False
+
+
+def invalidate_dashboard():
+    """Drop the cached dashboard once the current transaction commits"""
+    def delete():
+        get_cache().delete(dashboard_key())
+        dashboard_stats.invalidated()
+
+    transaction.on_commit(delete)
+
+
+class LRUCache:
+    """Thread-safe in-process LRU mapping with a per-entry time to live"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Cached value, or None when absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Normalized employee_id -> (pk, employee_id, full_name, department_id) for attendance writes.
+# Misses are not cached, so a new employee is found straight away.
+employee_stats = CacheStats('employee')
+employee_shared_stats = CacheStats('employee_shared')
+employee_lru = LRUCache(
+    getattr(settings, 'EMPLOYEE_CACHE_SIZE', 5000), getattr(settings, 'EMPLOYEE_CACHE_LOCAL_TTL', 60)
+)
+
+
+def employee_key(employee_id):
+    return f'hrms:employee:{employee_id}'
+
+
+def get_employee(employee_id, load):
+    """
+    Return the cached (pk, employee_id, full_name, department_id) for a
+    normalized employee_id, trying this process's LRU, then the shared cache
+    (when EMPLOYEE_CACHE_TTL > 0), then load(), which returns the tuple or
+    None for an unknown employee.
+    """
+    if employee_lru.maxsize <= 0:
+        return load()
+
+    row = employee_lru.get(employee_id)
+    if row is not None:
+        employee_stats.hit()
+        return row
+    employee_stats.miss()
+
+    shared_ttl = getattr(settings, 'EMPLOYEE_CACHE_TTL', 0)
+    if shared_ttl > 0:
+        row = get_cache().get(employee_key(employee_id))
+        if row is not None:
+            employee_shared_stats.hit()
+            employee_lru.set(employee_id, row)
+            return row
+        employee_shared_stats.miss()
+
+    row = load()
+    if row is not None:
+        employee_lru.set(employee_id, row)
+        if shared_ttl > 0:
+            get_cache().set(employee_key(employee_id), row, shared_ttl)
+    return row
+
+
+@receiver(setting_changed)
+def reset_employee_lru(setting, **kwargs):
+    if setting in ('EMPLOYEE_CACHE_SIZE', 'EMPLOYEE_CACHE_LOCAL_TTL'):
+        employee_lru.maxsize = getattr(settings, 'EMPLOYEE_CACHE_SIZE', 5000)
+        employee_lru.ttl = getattr(settings, 'EMPLOYEE_CACHE_LOCAL_TTL', 60)
+        employee_lru.clear()
+
+
+def invalidate_employee(*employee_ids):
+    """
+    Forget cached employees now and again once the current transaction
+    commits, so a concurrent lookup can't re-cache the old row in between.
+    Other processes' LRUs keep an entry for at most EMPLOYEE_CACHE_LOCAL_TTL.
+    """
+    def delete():
+        for employee_id in employee_ids:
+            employee_lru.delete(employee_id)
+            if getattr(settings, 'EMPLOYEE_CACHE_TTL', 0) > 0:
+                get_cache().delete(employee_key(employee_id))
+
+    delete()
+    transaction.on_commit(delete)
+    employee_stats.invalidated()
@@ -0,0 +1,65 @@
+"""
+Conditional GET helpers (ETag / Last-Modified) for HRMS API
+"""
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+
+
+def make_etag(*parts):
+    """Hash validator parts into an ETag value"""
+    raw = '|'.join(str(part) for part in parts)
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def page_etag(request, rows, related=(), extra=()):
+    """
+    ETag for one page of a list endpoint, from what the page shows: the pk and
+    updated_at of its rows (and of related rows whose fields are serialized)
+    plus the other response values, such as the total and the next cursor.
+    It costs no query, so a page's cost doesn't grow with the filtered set.
+    """
+    parts = []
+    for row in rows:
+        parts.append(f'{row.pk}:{row.updated_at.isoformat()}')
+        for name in related:
+            related_row = getattr(row, name)
+            parts.append(f'{name}{related_row.pk}:{related_row.updated_at.isoformat()}')
+    return make_etag(request.get_full_path(), *extra, *parts)
+
+
+def object_validators(request, *instances):
+    """ETag and Last-Modified for a detail endpoint from the updated_at of the serialized rows"""
+    last_modified = max(instance.updated_at for instance in instances)
+    etag = make_etag(request.get_full_path(), *(instance.updated_at.isoformat() for instance in instances))
+    return etag, last_modified
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Return a 304 response when the client's validators still match, otherwise None.
+    If-None-Match takes precedence over If-Modified-Since.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        client_etags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+        if '*' in client_etags or quote_etag(etag) in client_etags:
+            return with_validators(HttpResponseNotModified(), etag, last_modified)
+        return None
+
+    if last_modified is not None:
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+        if if_modified_since is not None and int(last_modified.timestamp()) <= if_modified_since:
+            return with_validators(HttpResponseNotModified(), etag, last_modified)
+
+    return None
+
+
+def with_validators(response, etag, last_modified=None):
+    """Attach validators and ask clients to revalidate before reusing the response"""
+    response['ETag'] = quote_etag(etag)
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    response['Cache-Control'] = 'no-cache'
+    return response
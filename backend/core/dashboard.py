@@ -0,0 +1,52 @@
+"""
+Dashboard statistics for HRMS Lite
+"""
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Attendance, DailyAttendanceSummary, Department
+from .serializers import AttendanceSerializer
+
+
+RECENT_ATTENDANCE_LIMIT = 10
+
+
+def total_employees():
+    """Sum of the department headcount counters (a few rows instead of counting employees)"""
+    return Department.objects.aggregate(total=Sum('headcount'))['total'] or 0
+
+
+def today_totals(today):
+    """Today's present/absent totals from the per-department daily summaries"""
+    totals = DailyAttendanceSummary.objects.filter(date=today).aggregate(
+        present=Sum('present'),
+        absent=Sum('absent')
+    )
+    return totals['present'] or 0, totals['absent'] or 0
+
+
+def recent_attendance():
+    """Serialized latest attendance records"""
+    recent = Attendance.objects.select_related('employee').order_by('-date', '-created_at')[:RECENT_ATTENDANCE_LIMIT]
+    return AttendanceSerializer(list(recent), many=True).data
+
+
+def build_payload(today=None):
+    """Compute the dashboard statistics, one query after another"""
+    today = today or timezone.now().date()
+    return make_payload(today, total_employees(), today_totals(today), recent_attendance())
+
+
+def make_payload(today, employees, totals, recent):
+    """Assemble the dashboard payload from its query results"""
+    present_today, absent_today = totals
+    attendance_rate = (present_today / employees * 100) if employees > 0 else 0
+
+    return {
+        'total_employees': employees,
+        'present_today': present_today,
+        'absent_today': absent_today,
+        'attendance_rate': round(attendance_rate, 2),
+        'today_date': str(today),
+        'recent_attendance': recent
+    }
@@ -0,0 +1,136 @@
+"""
+PostgreSQL backend that takes connections from a psycopg connection pool.
+
+Django 4.2 has no built-in pooling, so each worker process keeps one
+psycopg_pool.ConnectionPool per database and Django borrows a connection for
+the length of a request (or of a CONN_MAX_AGE=0 "connection") and gives it
+back afterwards, instead of opening and closing a server connection each time.
+
+Pool settings live in OPTIONS['pool'] (min_size, max_size, timeout, max_idle,
+max_lifetime); CONN_HEALTH_CHECKS makes the pool check a connection before
+handing it out.
+"""
+import os
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base, creation
+
+
+DEFAULT_POOL_OPTIONS = {
+    'min_size': 2,
+    'max_size': 10,
+    'timeout': 10.0,
+}
+
+
+def load_pool_class():
+    try:
+        from psycopg_pool import ConnectionPool
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            'The pooled PostgreSQL backend requires psycopg_pool; install it with `pip install "psycopg[pool]"`.'
+        ) from e
+    return ConnectionPool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Pooled connections to the test database would block DROP DATABASE
+        self.connection.close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    # (alias, pid, database) -> pool, shared by the threads of one process
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        if not base.is_psycopg3:
+            raise ImproperlyConfigured('The pooled PostgreSQL backend requires psycopg 3.')
+        super().__init__(*args, **kwargs)
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured(
+                'CONN_MAX_AGE must be 0 with the pooled PostgreSQL backend; the pool keeps connections open.'
+            )
+
+    @property
+    def pool_key(self):
+        settings_dict = self.settings_dict
+        # The pid keeps forked workers from sharing a parent's pool (and its threads)
+        return (
+            self.alias, os.getpid(),
+            settings_dict['NAME'], settings_dict['HOST'], settings_dict['PORT'], settings_dict['USER']
+        )
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_pool(self):
+        """This process's pool for this database, created and opened on first use"""
+        key = self.pool_key
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                ConnectionPool = load_pool_class()
+                options = {**DEFAULT_POOL_OPTIONS, **self.settings_dict['OPTIONS'].get('pool', {})}
+                check = None
+                if self.settings_dict['CONN_HEALTH_CHECKS']:
+                    check = getattr(ConnectionPool, 'check_connection', None)
+                pool = ConnectionPool(
+                    # Connections are handed back in autocommit; Django sets the mode it needs on checkout
+                    kwargs={**self.get_connection_params(), 'autocommit': True},
+                    name=f'hrms-{self.alias}',
+                    open=False,
+                    check=check,
+                    **options
+                )
+                pool.open()
+                self._pools[key] = pool
+        return pool
+
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict['OPTIONS']
+        set_isolation_level = False
+        try:
+            isolation_level_value = options['isolation_level']
+        except KeyError:
+            self.isolation_level = base.IsolationLevel.READ_COMMITTED
+        else:
+            try:
+                self.isolation_level = base.IsolationLevel(isolation_level_value)
+                set_isolation_level = True
+            except ValueError:
+                raise ImproperlyConfigured(
+                    f"Invalid transaction isolation level {isolation_level_value} "
+                    f"specified. Use one of the psycopg.IsolationLevel values."
+                )
+
+        self.connection_pool = self.get_pool()
+        connection = self.connection_pool.getconn()
+        if set_isolation_level:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                # Hand the connection back to the pool it came from; the pool
+                # rolls back anything left open and discards broken connections
+                self.connection_pool.putconn(self.connection)
+                self.connection = None
+
+    def close_pools(self):
+        """Close every pool this process holds for this alias"""
+        with self._pools_lock:
+            for key in [key for key in self._pools if key[0] == self.alias]:
+                self._pools.pop(key).close()
@@ -0,0 +1,62 @@
+"""
+Departments and their headcount counters for HRMS Lite
+"""
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Upper
+
+from .models import Department, Employee
+
+
+def matching(names):
+    """Departments whose name equals one of names, ignoring case (uses the unique index on UPPER(name))"""
+    return Department.objects.annotate(key=Upper('name')).filter(key__in={name.upper() for name in names}).order_by()
+
+
+def resolve(names):
+    """
+    {name: Department} for stripped department names, matched ignoring case.
+    Missing departments are created with the first spelling given; a
+    concurrent creator of the same name wins and its row is returned.
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+
+    found = {department.name.upper(): department for department in matching(names)}
+    missing = {}
+    for name in names:
+        if name.upper() not in found:
+            missing.setdefault(name.upper(), name)
+    if missing:
+        Department.objects.bulk_create([Department(name=name) for name in missing.values()], ignore_conflicts=True)
+        found.update((department.name.upper(), department) for department in matching(missing.values()))
+
+    return {name: found[name.upper()] for name in names}
+
+
+def get(name):
+    """The department with this stripped name (any case), created if missing"""
+    return resolve([name])[name]
+
+
+def adjust_headcount(department_deltas):
+    """Apply {department_id: delta} to the headcount counters in place, one UPDATE per department"""
+    for department_id, delta in department_deltas.items():
+        if delta:
+            Department.objects.filter(pk=department_id).update(headcount=F('headcount') + delta)
+
+
+def headcounts(department_ids=None):
+    """{department_id: headcount} from the counters"""
+    departments = Department.objects.all()
+    if department_ids is not None:
+        departments = departments.filter(pk__in=department_ids)
+    return dict(departments.values_list('pk', 'headcount'))
+
+
+def recount():
+    """Recompute every headcount counter from the employees table; returns the number of departments"""
+    employees = Employee.objects.filter(department=OuterRef('pk')).order_by().values('department').annotate(
+        total=Count('pk')
+    ).values('total')
+    return Department.objects.update(headcount=Coalesce(Subquery(employees), 0))
@@ -1,15 +1,58 @@
 """
 Custom exception handler for HRMS API
 """
+import re
+
+from django.db import IntegrityError
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status
 
 
+# Columns of a violated unique constraint, as reported by PostgreSQL
+# ("Key (employee_id, date)=(...) already exists.") and SQLite
+# ("UNIQUE constraint failed: attendances.employee_id, attendances.date")
+POSTGRESQL_UNIQUE_KEY = re.compile(r'Key \((?P<columns>[^)]*)\)=')
+SQLITE_UNIQUE_KEY = re.compile(r'UNIQUE constraint failed: (?P<columns>.*)$')
+
+UNIQUE_ERRORS = {
+    ('employee_id',): {'employee_id': ['Employee ID already exists.']},
+    ('email',): {'email': ['Email already exists.']},
+    ('date', 'employee_id'): {'detail': ['Attendance for this employee on this date already exists.']},
+}
+
+
+def unique_violation_columns(exc):
+    """Sorted column names of the unique constraint an IntegrityError violated, or None"""
+    cause = exc.__cause__
+    diag = getattr(cause, 'diag', None)
+    text = getattr(diag, 'message_detail', None) or str(cause or exc)
+
+    match = POSTGRESQL_UNIQUE_KEY.search(text) or SQLITE_UNIQUE_KEY.search(text)
+    if not match:
+        return None
+    return tuple(sorted(
+        column.strip().rsplit('.', 1)[-1].strip('"') for column in match.group('columns').split(',')
+    ))
+
+
+def integrity_error_detail(exc):
+    """Field errors for an IntegrityError, shaped like serializer errors"""
+    detail = UNIQUE_ERRORS.get(unique_violation_columns(exc))
+    if detail is None:
+        return {'detail': ['The change conflicts with existing data.']}
+    return detail
+
+
 def custom_exception_handler(exc, context):
     """
     Custom exception handler that provides consistent error responses
     """
+    # Constraint violations are client errors, reported like validation errors
+    if isinstance(exc, IntegrityError):
+        exc = ValidationError(integrity_error_detail(exc))
+
     # Call REST framework's default exception handler first
     response = exception_handler(exc, context)
 
@@ -0,0 +1,53 @@
+"""
+Streaming export writers for HRMS Lite
+"""
+import csv
+import json
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+EXPORT_CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+class Echo:
+    """File-like object whose write() hands the formatted line straight back"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows, header):
+    """Yield a CSV header and one CSV line per row"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def jsonl_lines(rows, header):
+    """Yield one JSON object per row"""
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), default=str) + '\n'
+
+
+def buffered(lines, size=BUFFER_SIZE):
+    """Group small lines into chunks of roughly `size` characters to cut per-write overhead"""
+    buffer, length = [], 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_rows(rows, header, fmt):
+    """Stream rows (tuples matching header) in the requested export format"""
+    lines = csv_lines(rows, header) if fmt == 'csv' else jsonl_lines(rows, header)
+    return buffered(lines)
@@ -0,0 +1,107 @@
+"""
+Query parameter parsing and filtering helpers for HRMS API
+"""
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+from .models import Attendance, Employee
+
+
+STATUS_VALUES = [value for value, _ in Attendance.STATUS_CHOICES]
+
+
+def parse_date_param(params, name):
+    """Parse an optional YYYY-MM-DD query parameter"""
+    value = params.get(name)
+    if not value:
+        return None
+
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+
+    if parsed is None:
+        raise ValidationError({name: 'Date must be in YYYY-MM-DD format.'})
+
+    return parsed
+
+
+def get_date_range(params, start='from', end='to'):
+    """Parse an optional inclusive date range from query parameters"""
+    date_from = parse_date_param(params, start)
+    date_to = parse_date_param(params, end)
+
+    if date_from and date_to and date_from > date_to:
+        raise ValidationError({end: f"'{end}' must not be before '{start}'."})
+
+    return date_from, date_to
+
+
+def get_list_param(params, name):
+    """Read a multi-value parameter given as repeated keys and/or comma-separated values"""
+    return [
+        value.strip()
+        for param in params.getlist(name)
+        for value in param.split(',')
+        if value.strip()
+    ]
+
+
+def filter_by_employee(queryset, params):
+    """
+    Apply the employee_id and department filters to a queryset of a model with
+    an `employee` foreign key.
+
+    They become an `employee_id IN (subquery)` rather than a join, so an index
+    leading with employee drives the scan.
+    """
+    employee_id = params.get('employee_id')
+    if employee_id:
+        queryset = queryset.filter(employee__in=Employee.objects.filter(
+            employee_id=employee_id.strip().upper()
+        ).values('pk'))
+
+    department = params.get('department')
+    if department:
+        queryset = queryset.filter(employee__in=Employee.objects.filter(
+            department__name__iexact=department.strip()
+        ).values('pk'))
+
+    return queryset
+
+
+def get_statuses(params):
+    """Validated set of status filter values (empty when not filtering)"""
+    statuses = set(get_list_param(params, 'status'))
+    unknown = statuses - set(STATUS_VALUES)
+    if unknown:
+        raise ValidationError({'status': f"Status must be one of: {', '.join(STATUS_VALUES)}."})
+    return statuses
+
+
+def filter_attendance(attendances, params):
+    """
+    Apply the attendance list filters shared by the list and export endpoints:
+    employee_id, department, date, date_from/date_to (inclusive) and status
+    (one or more values).
+    """
+    attendances = filter_by_employee(attendances, params)
+
+    date = parse_date_param(params, 'date')
+    if date:
+        attendances = attendances.filter(date=date)
+
+    date_from, date_to = get_date_range(params, start='date_from', end='date_to')
+    if date_from:
+        attendances = attendances.filter(date__gte=date_from)
+    if date_to:
+        attendances = attendances.filter(date__lte=date_to)
+
+    statuses = get_statuses(params)
+    if len(statuses) == 1:
+        attendances = attendances.filter(status=next(iter(statuses)))
+    elif statuses:
+        attendances = attendances.filter(status__in=statuses)
+
+    return attendances
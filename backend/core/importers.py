@@ -0,0 +1,160 @@
+"""
+Streaming employee import for HRMS Lite
+"""
+import csv
+import json
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+
+from . import cache, departments, summary
+from .models import Employee
+from .serializers import EmployeeImportRowSerializer
+
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+DEFAULT_CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+
+CONTENT_TYPE_FORMATS = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/jsonl': 'jsonl',
+    'application/x-ndjson': 'jsonl',
+    'application/x-jsonlines': 'jsonl',
+}
+
+
+def read_records(lines, fmt):
+    """
+    Parse an iterable of text lines incrementally.
+    Yields (line_number, record, error) tuples; record is None when the line could not be parsed.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        try:
+            for record in reader:
+                yield reader.line_num, record, None
+        except csv.Error as e:
+            yield reader.line_num, None, f'Invalid CSV: {e}'
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, 'Each line must be a JSON object.'
+            continue
+        yield line_number, record, None
+
+
+class EmployeeImporter:
+    """
+    Imports employees in chunks: each chunk is checked for duplicates with two IN queries
+    and written with a single bulk_create inside its own transaction.
+    Invalid rows are reported and skipped; they never abort the import.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.processed = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, records):
+        """Import (line_number, record, error) tuples as produced by read_records"""
+        batch = []
+        for line_number, record, error in records:
+            self.processed += 1
+
+            if error:
+                self.add_error(line_number, {'detail': error})
+                continue
+
+            serializer = EmployeeImportRowSerializer(data=record)
+            if not serializer.is_valid():
+                self.add_error(line_number, serializer.errors)
+                continue
+
+            batch.append((line_number, serializer.validated_data))
+            if len(batch) >= self.chunk_size:
+                self.flush(batch)
+                batch = []
+
+        if batch:
+            self.flush(batch)
+
+        return self.report()
+
+    def flush(self, batch):
+        """Check a chunk for duplicates and insert the remaining rows"""
+        taken_ids = set(Employee.objects.filter(
+            employee_id__in={data['employee_id'] for _, data in batch}
+        ).values_list('employee_id', flat=True))
+        taken_emails = set(Employee.objects.filter(
+            email__in={data['email'] for _, data in batch}
+        ).values_list('email', flat=True))
+
+        pending = []
+        for line_number, data in batch:
+            errors = {}
+            if data['employee_id'] in taken_ids:
+                errors['employee_id'] = ['Employee ID already exists.']
+            if data['email'] in taken_emails:
+                errors['email'] = ['Email already exists.']
+            if errors:
+                self.add_error(line_number, errors)
+                continue
+
+            # Later rows in the same chunk must not reuse these values either
+            taken_ids.add(data['employee_id'])
+            taken_emails.add(data['email'])
+            pending.append((line_number, data))
+
+        if not pending:
+            return
+
+        try:
+            with transaction.atomic():
+                # Only departments of rows that are written, and rolled back with them
+                department_names = departments.resolve(data['department'] for _, data in pending)
+                employees = [
+                    Employee(**{**data, 'department': department_names[data['department']]}) for _, data in pending
+                ]
+                Employee.objects.bulk_create(employees)
+                # bulk_create sends no signals, so keep today's headcounts in step here
+                summary.adjust_headcount(Counter(employee.department_id for employee in employees))
+                cache.invalidate_dashboard()
+            self.created += len(pending)
+        except IntegrityError:
+            # A concurrent writer took some of these values; retry row by row
+            for line_number, data in pending:
+                try:
+                    with transaction.atomic():
+                        Employee(**{**data, 'department': departments.get(data['department'])}).save()
+                    self.created += 1
+                except IntegrityError:
+                    self.add_error(line_number, {'detail': 'Employee ID or email already exists.'})
+
+    def add_error(self, line_number, errors):
+        """Record a row-level error, keeping at most MAX_REPORTED_ERRORS details"""
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_number, 'errors': errors})
+
+    def report(self):
+        """Summary of the import"""
+        return {
+            'processed': self.processed,
+            'created': self.created,
+            'failed': self.failed,
+            'errors': sorted(self.errors, key=lambda error: error['line']),
+            'errors_truncated': self.failed > len(self.errors)
+        }
@@ -0,0 +1,63 @@
+"""
+List endpoint helpers shared by the sync views and their async mirrors.
+
+A list request is handled in three steps: build the queryset from the query
+parameters, fetch a page (with the sync or async pagination helpers), then
+answer with a 304 or the page envelope. The first and last steps live here so
+both kinds of view always return the same rows, fields and validators.
+"""
+from .conditional import not_modified, page_etag, with_validators
+from .filters import filter_attendance
+from .models import Attendance, Employee
+from .pagination import KeysetPaginator
+from .serializers import EmployeeSerializer
+
+
+employee_paginator = KeysetPaginator(ordering=('-created_at', '-id'))
+attendance_paginator = KeysetPaginator(ordering=('-date', '-id'))
+
+
+def employee_list_queryset(params):
+    """
+    (employees, fields, related) for GET /employees/: the ?fields= sparse
+    fieldset (None for every field) and the related rows its response shows
+    """
+    employees = Employee.objects.all()
+    related = ['department']
+
+    # Sparse fieldset, e.g. ?fields=employee_id,full_name
+    fields = params.get('fields')
+    if fields:
+        fields = [name.strip() for name in fields.split(',') if name.strip()]
+        serializer_fields = EmployeeSerializer(fields=fields).fields
+        employees = employees.only('id', 'created_at', 'updated_at', *serializer_fields)
+        if 'department' not in serializer_fields:
+            related = []
+    else:
+        fields = None
+    return employees.select_related(*related), fields, related
+
+
+def attendance_list_queryset(params):
+    """(attendances, related) for GET /attendance/ with the list filters applied"""
+    related = ['employee']
+    return filter_attendance(Attendance.objects.select_related(*related), params), related
+
+
+def list_response(request, response_class, rows, related, serializer, meta):
+    """
+    304 when the client's ETag still matches the page, otherwise the page
+    envelope built with response_class. meta holds the other response values
+    (count, page and page_size, or next), which the ETag covers as well.
+    The serializer is only evaluated for a full response.
+    """
+    etag = page_etag(request, rows, related, extra=meta.values())
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    return with_validators(response_class({
+        'success': True,
+        'data': serializer.data,
+        **meta
+    }), etag)
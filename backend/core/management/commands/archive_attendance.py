@@ -0,0 +1,53 @@
+"""
+Management command to archive closed attendance months
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core import archive
+
+
+class Command(BaseCommand):
+    help = 'Compact attendance of closed months into per-employee monthly archive rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before',
+            help='Archive months before this date (YYYY-MM-DD, default: every closed month)'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='List the months that would be archived')
+
+    def handle(self, *args, **options):
+        cutoff = archive.closed_before()
+        if cutoff is None:
+            raise CommandError('ATTENDANCE_OPEN_MONTHS is None, so no month is closed.')
+
+        before = cutoff
+        if options['before']:
+            before = self.parse(options['before'], '--before')
+            if before > cutoff:
+                raise CommandError(f'--before must not be after {cutoff}: later months are still open.')
+            before = archive.month_start(before)
+
+        months = archive.archivable_months(before)
+        if options['dry_run']:
+            for month in months:
+                self.stdout.write(f'Would archive {month:%Y-%m}')
+            self.stdout.write(f'{len(months)} months to archive.')
+            return
+
+        archived = 0
+        for month in months:
+            rows, written = archive.archive_month(month)
+            archived += rows
+            self.stdout.write(f'{month:%Y-%m}: {rows} attendance rows into {written} archive rows')
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} attendance rows from {len(months)} months.'))
+
+    def parse(self, value, option):
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise CommandError(f'{option} must be a date in YYYY-MM-DD format.')
+        return parsed
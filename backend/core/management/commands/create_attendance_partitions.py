@@ -0,0 +1,57 @@
+"""
+Management command to create upcoming attendance partitions
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core import partitions
+
+
+class Command(BaseCommand):
+    help = 'Create attendance partitions for the coming months or years (PostgreSQL only)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead', type=int, default=settings.ATTENDANCE_PARTITIONS_AHEAD,
+            help='Periods after the current one to create partitions for'
+        )
+        parser.add_argument(
+            '--interval', choices=partitions.INTERVALS,
+            help='Partition size (default: the size of the existing partitions)'
+        )
+        parser.add_argument('--list', action='store_true', help='List the partitions and their row counts')
+
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned(connection):
+            self.stdout.write('The attendances table is not partitioned; nothing to do.')
+            return
+
+        if options['list']:
+            self.list_partitions()
+            return
+
+        interval = options['interval'] or partitions.table_interval(connection)
+        if interval not in partitions.INTERVALS:
+            raise CommandError(f"--interval must be one of: {', '.join(partitions.INTERVALS)}.")
+        if options['ahead'] < 0:
+            raise CommandError('--ahead must not be negative.')
+
+        today = timezone.now().date()
+        with transaction.atomic():
+            created = partitions.create_partitions(
+                connection, today, partitions.add_periods(today, interval, options['ahead']), interval
+            )
+
+        for name in created:
+            self.stdout.write(f'Created {name}')
+        self.stdout.write(self.style.SUCCESS(f'Created {len(created)} attendance partitions.'))
+
+    def list_partitions(self):
+        with connection.cursor() as cursor:
+            for name, start, end in partitions.list_partitions(connection):
+                cursor.execute(f'SELECT COUNT(*) FROM {partitions.quote(name)}')
+                rows = cursor.fetchone()[0]
+                bounds = f'{start} to {end}' if start else 'default'
+                self.stdout.write(f'{name}: {bounds}, {rows} rows')
@@ -0,0 +1,62 @@
+"""
+Management command to bulk import employees from a CSV or JSON Lines file
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importers import DEFAULT_CHUNK_SIZE, IMPORT_FORMATS, EmployeeImporter, read_records
+
+
+class Command(BaseCommand):
+    help = 'Import employees from a CSV or JSON Lines file (use - for stdin)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - to read from stdin')
+        parser.add_argument(
+            '--format',
+            dest='fmt',
+            choices=IMPORT_FORMATS,
+            help='Input format (default: guessed from the file extension)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Rows inserted per transaction (default: {DEFAULT_CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['fmt']
+        if fmt is None:
+            if path.endswith('.csv'):
+                fmt = 'csv'
+            elif path.endswith(('.jsonl', '.ndjson')):
+                fmt = 'jsonl'
+            else:
+                raise CommandError('Cannot guess the format; pass --format csv or --format jsonl.')
+
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive integer.')
+
+        importer = EmployeeImporter(chunk_size=options['chunk_size'])
+
+        if path == '-':
+            report = importer.run(read_records(sys.stdin, fmt))
+        else:
+            try:
+                with open(path, encoding='utf-8-sig', newline='') as handle:
+                    report = importer.run(read_records(handle, fmt))
+            except OSError as e:
+                raise CommandError(f'Cannot read {path}: {e}')
+
+        for error in report['errors']:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        if report['errors_truncated']:
+            self.stderr.write('... further errors omitted')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {report['processed']} rows: "
+            f"{report['created']} imported, {report['failed']} failed."
+        ))
@@ -0,0 +1,55 @@
+"""
+Management command to convert the attendances table to and from a partitioned table
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Range-partition the attendances table by date (PostgreSQL only). '
+        'The table is locked while its rows are copied; run it in a maintenance window.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', choices=partitions.INTERVALS,
+            help='Partition size (default: ATTENDANCE_PARTITIONING)'
+        )
+        parser.add_argument(
+            '--ahead', type=int, default=settings.ATTENDANCE_PARTITIONS_AHEAD,
+            help='Periods after the current one to create partitions for'
+        )
+        parser.add_argument('--undo', action='store_true', help='Convert back to a single table')
+
+    def handle(self, *args, **options):
+        if not partitions.supported(connection):
+            raise CommandError('Partitioning needs PostgreSQL.')
+
+        if options['undo']:
+            if not partitions.is_partitioned(connection):
+                self.stdout.write('The attendances table is not partitioned; nothing to do.')
+                return
+            with transaction.atomic():
+                partitions.unpartition_table(connection)
+            self.stdout.write(self.style.SUCCESS('Converted attendances back to a single table.'))
+            return
+
+        if partitions.is_partitioned(connection):
+            self.stdout.write('The attendances table is already partitioned; nothing to do.')
+            return
+
+        interval = options['interval'] or settings.ATTENDANCE_PARTITIONING
+        if interval not in partitions.INTERVALS:
+            raise CommandError(f"Pass --interval ({', '.join(partitions.INTERVALS)}) or set ATTENDANCE_PARTITIONING.")
+        if options['ahead'] < 0:
+            raise CommandError('--ahead must not be negative.')
+
+        with transaction.atomic():
+            partitions.partition_table(connection, interval, options['ahead'])
+
+        count = len(partitions.list_partitions(connection))
+        self.stdout.write(self.style.SUCCESS(f'Partitioned attendances by {interval} into {count} partitions.'))
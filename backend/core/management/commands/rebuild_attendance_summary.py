@@ -0,0 +1,35 @@
+"""
+Management command to backfill or repair the daily attendance summaries
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core import summary
+
+
+class Command(BaseCommand):
+    help = 'Recompute daily attendance summaries from attendance records'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', help='First date to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', help='Last date to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        date_from = self.parse(options['date_from'], '--from')
+        date_to = self.parse(options['date_to'], '--to')
+        if date_from and date_to and date_from > date_to:
+            raise CommandError('--from must not be after --to.')
+
+        written = summary.rebuild(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} daily summary rows.'))
+
+    def parse(self, value, option):
+        if value is None:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise CommandError(f'{option} must be a date in YYYY-MM-DD format.')
+        return parsed
@@ -0,0 +1,343 @@
+"""
+Prometheus metrics for HRMS Lite, aggregated across worker processes.
+
+Each process keeps its counters in memory and periodically writes them,
+with its pid and OS start time, to `<METRICS_DIR>/<pid>-<start>.json`. A
+scrape merges the files of every process: counters and histograms are summed
+(including processes that have exited, so counters never go backwards),
+gauges only count live processes. Files of exited processes are folded into
+`archive.json` to keep the directory small.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+from .cache import CacheStats
+from .performance import LATENCY_BUCKETS_MS, BaseSink
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+LATENCY_BUCKETS = tuple(bound / 1000 for bound in LATENCY_BUCKETS_MS)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = 'unmatched'
+ARCHIVE_FILE = 'archive.json'
+LOCK_FILE = '.lock'
+
+METRICS = {
+    'hrms_http_requests_total': ('counter', 'HTTP requests by route, method and status.'),
+    'hrms_http_request_duration_seconds': ('histogram', 'HTTP request latency by route and method.'),
+    'hrms_http_requests_in_flight': ('gauge', 'HTTP requests currently being handled.'),
+    'hrms_db_queries_per_request': ('histogram', 'SQL queries run per request by route and method.'),
+    'hrms_db_query_duration_seconds_total': ('counter', 'Time spent in SQL queries by route and method.'),
+    'hrms_http_response_bytes_total': ('counter', 'Response body bytes by route and method.'),
+    'hrms_cache_hits_total': ('counter', 'Cache hits by cache.'),
+    'hrms_cache_misses_total': ('counter', 'Cache misses by cache.'),
+    'hrms_cache_invalidations_total': ('counter', 'Cache invalidations by cache.'),
+    'hrms_cache_hit_ratio': ('gauge', 'Cache hits / lookups by cache, over all processes.'),
+}
+
+
+def series_key(name, labels):
+    """Serializable key for one labelled series"""
+    return json.dumps([name, sorted(labels.items())])
+
+
+def parse_key(key):
+    name, labels = json.loads(key)
+    return name, dict(labels)
+
+
+def empty_state():
+    return {'counters': {}, 'histograms': {}, 'gauges': {}}
+
+
+def merge(total, state, gauges=True):
+    """Add one process's state into the running total"""
+    for key, value in state.get('counters', {}).items():
+        total['counters'][key] = total['counters'].get(key, 0) + value
+    for key, histogram in state.get('histograms', {}).items():
+        merged = total['histograms'].get(key)
+        if merged is None:
+            total['histograms'][key] = {
+                'buckets': list(histogram['buckets']),
+                'sum': histogram['sum'],
+                'count': histogram['count']
+            }
+        else:
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], histogram['buckets'])]
+            merged['sum'] += histogram['sum']
+            merged['count'] += histogram['count']
+    if gauges:
+        for key, value in state.get('gauges', {}).items():
+            total['gauges'][key] = total['gauges'].get(key, 0) + value
+    return total
+
+
+def process_start_time(pid):
+    """When a process started, in clock ticks since boot (Linux); None where /proc is unavailable"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name in parentheses may contain spaces; starttime is the 20th field after it
+    return int(stat.rsplit(')', 1)[1].split()[19])
+
+
+def process_alive(pid, start=None):
+    """
+    Whether the process that wrote a metrics file still runs. A pid reused by
+    a new process (common in containers) has another start time, so it
+    counts as exited when the file recorded one.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return start is None or process_start_time(pid) == start
+
+
+def read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    """Replace a file atomically so readers never see a partial write"""
+    text = data if isinstance(data, str) else json.dumps(data)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class MultiProcessCollector:
+    """In-memory metrics of this process, mirrored to a per-process file"""
+
+    def __init__(self, directory=None, flush_interval=None):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _ensure_process(self):
+        """(Re)initialize after import or fork, so each worker writes its own file"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            if self.directory is None:
+                self.directory = settings.METRICS_DIR
+            if self.flush_interval is None:
+                self.flush_interval = settings.METRICS_FLUSH_INTERVAL
+            os.makedirs(self.directory, exist_ok=True)
+            self.state = empty_state()
+            self.path = os.path.join(self.directory, f'{pid}-{time.time_ns()}.json')
+            self._start = process_start_time(pid)
+            self._dirty = False
+            self._pid = pid
+            flusher = threading.Thread(target=self._flush_loop, name='hrms-metrics-flush', daemon=True)
+            flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def inc(self, name, labels, value=1):
+        self._ensure_process()
+        key = series_key(name, labels)
+        with self._lock:
+            self.state['counters'][key] = self.state['counters'].get(key, 0) + value
+            self._dirty = True
+
+    def set_counter(self, name, labels, value):
+        """Overwrite a counter mirrored from another per-process total"""
+        self._ensure_process()
+        key = series_key(name, labels)
+        with self._lock:
+            if self.state['counters'].get(key) != value:
+                self.state['counters'][key] = value
+                self._dirty = True
+
+    def add_gauge(self, name, labels, delta):
+        self._ensure_process()
+        key = series_key(name, labels)
+        with self._lock:
+            self.state['gauges'][key] = self.state['gauges'].get(key, 0) + delta
+            self._dirty = True
+
+    def observe(self, name, labels, value, buckets):
+        self._ensure_process()
+        key = series_key(name, labels)
+        with self._lock:
+            histogram = self.state['histograms'].get(key)
+            if histogram is None:
+                histogram = self.state['histograms'][key] = {
+                    'buckets': [0] * (len(buckets) + 1), 'sum': 0, 'count': 0
+                }
+            index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+            histogram['buckets'][index] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+            self._dirty = True
+
+    def flush(self):
+        """Write this process's metrics to its file"""
+        self._ensure_process()
+        self.sync_cache_stats()
+        with self._lock:
+            text = json.dumps({'pid': self._pid, 'start': self._start, **self.state})
+            self._dirty = False
+        write_json(self.path, text)
+
+    def sync_cache_stats(self):
+        """Mirror the per-process cache counters into this process's metrics"""
+        for stats in CacheStats.registry:
+            snapshot = stats.snapshot()
+            labels = {'cache': stats.name}
+            self.set_counter('hrms_cache_hits_total', labels, snapshot['hits'])
+            self.set_counter('hrms_cache_misses_total', labels, snapshot['misses'])
+            self.set_counter('hrms_cache_invalidations_total', labels, snapshot['invalidations'])
+
+    def collect(self):
+        """Merge the metrics of every process that has written to the directory"""
+        self.flush()
+        lock = None
+        if fcntl is not None:
+            lock = open(os.path.join(self.directory, LOCK_FILE), 'a')
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+            archive = read_json(archive_path) or empty_state()
+            total = merge(empty_state(), archive)
+            exited = []
+            for filename in os.listdir(self.directory):
+                if not filename.endswith('.json') or filename == ARCHIVE_FILE:
+                    continue
+                path = os.path.join(self.directory, filename)
+                state = read_json(path)
+                if state is None:
+                    continue
+                alive = path == self.path or process_alive(state.get('pid', 0), state.get('start'))
+                merge(total, state, gauges=alive)
+                if not alive:
+                    exited.append((path, state))
+
+            if exited and lock is not None:
+                for _, state in exited:
+                    merge(archive, state, gauges=False)
+                write_json(archive_path, archive)
+                for path, _ in exited:
+                    os.unlink(path)
+        finally:
+            if lock is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+                lock.close()
+        return total
+
+
+collector = MultiProcessCollector()
+
+
+class PrometheusSink(BaseSink):
+    """Feed request metrics into the multiprocess collector"""
+
+    def request_started(self, metrics):
+        collector.add_gauge('hrms_http_requests_in_flight', {}, 1)
+
+    def record(self, metrics):
+        collector.add_gauge('hrms_http_requests_in_flight', {}, -1)
+        labels = {'route': metrics.route or UNMATCHED_ROUTE, 'method': metrics.method}
+        collector.inc('hrms_http_requests_total', {**labels, 'status': str(metrics.status)})
+        collector.observe('hrms_http_request_duration_seconds', labels, metrics.duration or 0, LATENCY_BUCKETS)
+        collector.observe('hrms_db_queries_per_request', labels, metrics.queries, QUERY_BUCKETS)
+        collector.inc('hrms_db_query_duration_seconds_total', labels, metrics.db_time)
+        collector.inc('hrms_http_response_bytes_total', labels, metrics.response_bytes)
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return repr(value) if value != int(value) else str(int(value))
+    return str(value)
+
+
+def bucket_bounds(name):
+    return QUERY_BUCKETS if name == 'hrms_db_queries_per_request' else LATENCY_BUCKETS
+
+
+def render(total):
+    """Prometheus text exposition format (version 0.0.4)"""
+    # metric name -> [(sort key, [(sample name, labels, value), ...])]
+    series = {name: [] for name in METRICS}
+
+    for key, value in [*total['counters'].items(), *total['gauges'].items()]:
+        name, labels = parse_key(key)
+        series.setdefault(name, []).append((str(labels), [(name, labels, value)]))
+    if not series['hrms_http_requests_in_flight']:
+        series['hrms_http_requests_in_flight'].append(('', [('hrms_http_requests_in_flight', {}, 0)]))
+
+    for key, histogram in total['histograms'].items():
+        name, labels = parse_key(key)
+        samples = []
+        cumulative = 0
+        for bound, count in zip(bucket_bounds(name), histogram['buckets']):
+            cumulative += count
+            samples.append((f'{name}_bucket', {**labels, 'le': format_value(float(bound))}, cumulative))
+        samples.append((f'{name}_bucket', {**labels, 'le': '+Inf'}, histogram['count']))
+        samples.append((f'{name}_sum', labels, histogram['sum']))
+        samples.append((f'{name}_count', labels, histogram['count']))
+        series.setdefault(name, []).append((str(labels), samples))
+
+    for stats in CacheStats.registry:
+        labels = {'cache': stats.name}
+        hits = total['counters'].get(series_key('hrms_cache_hits_total', labels), 0)
+        misses = total['counters'].get(series_key('hrms_cache_misses_total', labels), 0)
+        lookups = hits + misses
+        ratio = round(hits / lookups, 4) if lookups else 0.0
+        series['hrms_cache_hit_ratio'].append((str(labels), [('hrms_cache_hit_ratio', labels, ratio)]))
+
+    lines = []
+    for name, groups in series.items():
+        if not groups:
+            continue
+        kind, help_text = METRICS.get(name, ('untyped', ''))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for _, samples in sorted(groups, key=lambda group: group[0]):
+            for sample_name, labels, value in samples:
+                lines.append(f'{sample_name}{format_labels(labels)} {format_value(value)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,272 @@
+"""
+Middleware for HRMS Lite
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.urls import Resolver404, resolve
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import performance, routers
+
+
+# Metrics of the request being handled. Context variables follow a request
+# into sync_to_async worker threads, where its queries may run.
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection; counts queries for the current request"""
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def instrument_new_connection(sender, connection, **kwargs):
+    """Connections opened in any thread (including async worker threads) report their queries"""
+    install_query_recorder(connection)
+
+
+def iterate_in_context(content, var, value):
+    """Iterate a sync streaming body with a context variable set while each chunk is produced"""
+    iterator = iter(content)
+    while True:
+        token = var.set(value)
+        try:
+            chunk = next(iterator, None)
+        finally:
+            var.reset(token)
+        if chunk is None:
+            break
+        yield chunk
+
+
+def view_name(request):
+    """Class name of the view that handled the request, or its URL name"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view_class = getattr(match.func, 'view_class', None)
+    if view_class is not None:
+        return view_class.__name__
+    return match.view_name
+
+
+def route_name(request):
+    """URL name of the matched route (namespaced, e.g. 'admin:index'), or None"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None or not match.url_name:
+        return None
+    return match.view_name
+
+
+class PerformanceMiddleware:
+    """
+    Record wall time, SQL query count, DB time and response size of every
+    request, send them to the configured sinks and add a Server-Timing header.
+
+    Queries are counted with an execute wrapper on every database connection,
+    so this works with DEBUG off, and under ASGI for queries run in worker
+    threads. Streaming responses are recorded when the response is closed,
+    including the queries that run while it is consumed; their Server-Timing
+    header only covers the work done before streaming started.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'PERFORMANCE_SERVER_TIMING', True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        # Connections opened before this middleware was loaded have no recorder yet
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+        metrics = self.start(request)
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = self.start(request)
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def start(self, request):
+        metrics = performance.RequestMetrics(request.method, request.path)
+        performance.started(metrics)
+        return metrics
+
+    def finish(self, request, response, metrics):
+        metrics.view = view_name(request)
+        metrics.route = route_name(request)
+        metrics.status = response.status_code
+        if self.server_timing:
+            response['Server-Timing'] = metrics.server_timing()
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.ameasure_stream(response.streaming_content, metrics)
+            else:
+                response.streaming_content = self.measure_stream(response.streaming_content, metrics)
+            self.record_on_close(response, metrics)
+        else:
+            metrics.response_bytes = len(response.content)
+            metrics.finish()
+            performance.record(metrics)
+        return response
+
+    def measure_stream(self, content, metrics):
+        for chunk in iterate_in_context(content, current_metrics, metrics):
+            metrics.response_bytes += len(chunk)
+            yield chunk
+
+    async def ameasure_stream(self, content, metrics):
+        token = current_metrics.set(metrics)
+        try:
+            async for chunk in content:
+                metrics.response_bytes += len(chunk)
+                yield chunk
+        finally:
+            current_metrics.reset(token)
+
+    def record_on_close(self, response, metrics):
+        """Record a streamed request when the server closes the response, even if the client went away early"""
+        close = response.close
+
+        def close_and_record():
+            try:
+                close()
+            finally:
+                if metrics.duration is None:
+                    metrics.finish()
+                    performance.record(metrics)
+
+        response.close = close_and_record
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Send the reads of GET and HEAD requests to views with
+    `use_read_replica = True` to one of the DATABASE_REPLICAS.
+
+    After a write the client gets a short-lived cookie that keeps its reads on
+    the primary for REPLICA_STICKY_SECONDS, so it sees its own changes while
+    the replicas catch up. Without replicas every request uses the primary.
+    """
+    sync_capable = True
+    async_capable = True
+    safe_methods = ('GET', 'HEAD')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        alias = self.replica_for(request)
+        token = routers.read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.read_alias.reset(token)
+        return self.finish(request, response, alias)
+
+    async def __acall__(self, request):
+        alias = self.replica_for(request)
+        token = routers.read_alias.set(alias)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.read_alias.reset(token)
+        return self.finish(request, response, alias)
+
+    def replica_for(self, request):
+        """Replica alias to read from for this request, or None for the primary"""
+        if request.method not in self.safe_methods or not routers.replica_aliases():
+            return None
+        if request.COOKIES.get(settings.REPLICA_STICKY_COOKIE):
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        view_class = getattr(match.func, 'view_class', None)
+        if not getattr(view_class, 'use_read_replica', False):
+            return None
+        return routers.choose_replica()
+
+    def finish(self, request, response, alias):
+        if alias is not None:
+            # Streamed exports run their queries while the body is consumed
+            if response.streaming and not response.is_async:
+                response.streaming_content = iterate_in_context(
+                    response.streaming_content, routers.read_alias, alias
+                )
+        elif (request.method not in self.safe_methods and settings.REPLICA_STICKY_SECONDS
+                and routers.replica_aliases()):
+            secure = request.is_secure()
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                secure=secure,
+                httponly=True,
+                # The frontend is served from another site
+                samesite='None' if secure else 'Lax'
+            )
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs in async mode, so under ASGI it doesn't force the
+    rest of the middleware chain (and async views) back onto a sync thread
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:40
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_summaries(apps, schema_editor):
+    """Populate summaries from existing attendance so incremental updates start from correct totals"""
+    Attendance = apps.get_model('core', 'Attendance')
+    Employee = apps.get_model('core', 'Employee')
+    DailyAttendanceSummary = apps.get_model('core', 'DailyAttendanceSummary')
+    db_alias = schema_editor.connection.alias
+
+    headcounts = dict(
+        Employee.objects.using(db_alias).values_list('department').annotate(Count('id')).order_by()
+    )
+    rows = Attendance.objects.using(db_alias).values('date', 'employee__department').annotate(
+        present=Count('id', filter=Q(status='Present')),
+        absent=Count('id', filter=Q(status='Absent'))
+    ).order_by()
+
+    DailyAttendanceSummary.objects.using(db_alias).bulk_create([
+        DailyAttendanceSummary(
+            date=row['date'],
+            department=row['employee__department'],
+            present=row['present'],
+            absent=row['absent'],
+            headcount=headcounts.get(row['employee__department'], 0)
+        )
+        for row in rows.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_employee_created_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAttendanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('department', models.CharField(max_length=100, verbose_name='Department')),
+                ('present', models.IntegerField(default=0, verbose_name='Present')),
+                ('absent', models.IntegerField(default=0, verbose_name='Absent')),
+                ('headcount', models.IntegerField(default=0, help_text='Employees in the department when the day was first recorded', verbose_name='Headcount')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Daily Attendance Summary',
+                'verbose_name_plural': 'Daily Attendance Summaries',
+                'db_table': 'daily_attendance_summaries',
+                'ordering': ['-date', 'department'],
+                'unique_together': {('date', 'department')},
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
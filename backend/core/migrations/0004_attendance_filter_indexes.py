@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_daily_attendance_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'status'], name='attendances_date_684e3c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(condition=models.Q(('status', 'Absent')), fields=['status', 'date'], name='attendances_absent_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['department'], name='employees_departm_ef7a1f_idx'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Partitioning the attendances table used to happen here. It copies the
+    whole table under a lock, so it is now opt-in and runs from
+    `manage.py partition_attendances` instead; databases partitioned by an
+    earlier version of this migration keep their partitioned table.
+    """
+
+    dependencies = [
+        ('core', '0004_attendance_filter_indexes'),
+    ]
+
+    operations = []
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_partition_attendances'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the archived month', verbose_name='Month')),
+                ('present_mask', models.IntegerField(default=0, verbose_name='Present days mask')),
+                ('known_mask', models.IntegerField(default=0, verbose_name='Recorded days mask')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_archives', to='core.employee', verbose_name='Employee')),
+            ],
+            options={
+                'verbose_name': 'Attendance Archive',
+                'verbose_name_plural': 'Attendance Archives',
+                'db_table': 'attendance_archives',
+                'ordering': ['-month'],
+                'indexes': [models.Index(fields=['month'], name='attendance__month_dbe881_idx')],
+                'unique_together': {('employee', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+
+# The DDL is frozen here rather than imported from core.search, so that later
+# changes to the search module can't change what this migration does.
+# Without fastupdate, new rows go straight into the GIN index instead of a
+# pending list that every search scans until the next VACUUM.
+POSTGRESQL_INDEX = (
+    'CREATE INDEX IF NOT EXISTS employees_search_idx ON employees '
+    "USING gin (to_tsvector('simple', \"full_name\" || ' ' || \"department\")) WITH (fastupdate = off)"
+)
+COLUMNS = 'employee_id, email, full_name, department'
+VALUES = 'new.employee_id, new.email, new.full_name, new.department'
+SQLITE_TRIGGERS = {
+    'insert': 'AFTER INSERT ON employees BEGIN '
+              f'INSERT INTO employees_search (rowid, {COLUMNS}) VALUES (new.id, {VALUES}); END',
+    'update': 'AFTER UPDATE ON employees BEGIN '
+              'DELETE FROM employees_search WHERE rowid = old.id; '
+              f'INSERT INTO employees_search (rowid, {COLUMNS}) VALUES (new.id, {VALUES}); END',
+    'delete': 'AFTER DELETE ON employees BEGIN '
+              'DELETE FROM employees_search WHERE rowid = old.id; END',
+}
+
+
+def install_search(apps, schema_editor):
+    """GIN full-text index on PostgreSQL, FTS5 table and triggers on SQLite"""
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(POSTGRESQL_INDEX)
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS employees_search USING fts5({COLUMNS}, prefix='2 3')")
+            for event, body in SQLITE_TRIGGERS.items():
+                cursor.execute(f'DROP TRIGGER IF EXISTS employees_search_{event}')
+                cursor.execute(f'CREATE TRIGGER employees_search_{event} {body}')
+            cursor.execute('DELETE FROM employees_search')
+            cursor.execute(f'INSERT INTO employees_search (rowid, {COLUMNS}) SELECT id, {COLUMNS} FROM employees')
+
+
+def uninstall_search(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS employees_search_idx')
+        elif connection.vendor == 'sqlite':
+            for event in SQLITE_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS employees_search_{event}')
+            cursor.execute('DROP TABLE IF EXISTS employees_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_attendance_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
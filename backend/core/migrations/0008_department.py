@@ -0,0 +1,84 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.text
+
+
+# 0007's SQLite search triggers, which read the department name column
+COLUMNS = 'employee_id, email, full_name, department'
+VALUES = 'new.employee_id, new.email, new.full_name, new.department'
+SQLITE_TRIGGERS = {
+    'insert': 'AFTER INSERT ON employees BEGIN '
+              f'INSERT INTO employees_search (rowid, {COLUMNS}) VALUES (new.id, {VALUES}); END',
+    'update': 'AFTER UPDATE ON employees BEGIN '
+              'DELETE FROM employees_search WHERE rowid = old.id; '
+              f'INSERT INTO employees_search (rowid, {COLUMNS}) VALUES (new.id, {VALUES}); END',
+    'delete': 'AFTER DELETE ON employees BEGIN '
+              'DELETE FROM employees_search WHERE rowid = old.id; END',
+}
+
+
+def restore_search_triggers(apps, schema_editor):
+    """Unapplying the AlterFields below rebuilds employees on SQLite, which drops 0007's triggers"""
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for event, body in SQLITE_TRIGGERS.items():
+            cursor.execute(f'DROP TRIGGER IF EXISTS employees_search_{event}')
+            cursor.execute(f'CREATE TRIGGER employees_search_{event} {body}')
+
+
+class Migration(migrations.Migration):
+    """
+    Department table and nullable foreign keys to it, filled in by 0009.
+    The name columns become nullable so that unapplying 0010 can add them back
+    before 0009 refills them.
+    """
+
+    dependencies = [
+        ('core', '0007_employee_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AlterField(
+            model_name='employee',
+            name='department',
+            field=models.CharField(help_text='Department name (e.g., IT, HR, Sales)', max_length=100, null=True, verbose_name='Department'),
+        ),
+        migrations.AlterField(
+            model_name='dailyattendancesummary',
+            name='department',
+            field=models.CharField(max_length=100, null=True, verbose_name='Department'),
+        ),
+        migrations.CreateModel(
+            name='Department',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Department name (e.g., IT, HR, Sales)', max_length=100, verbose_name='Name')),
+                ('headcount', models.IntegerField(default=0, help_text='Current number of employees', verbose_name='Headcount')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Department',
+                'verbose_name_plural': 'Departments',
+                'db_table': 'departments',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='department',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Upper('name'), name='departments_name_upper_key'),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='department_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.department'),
+        ),
+        migrations.AddField(
+            model_name='dailyattendancesummary',
+            name='department_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.department'),
+        ),
+    ]
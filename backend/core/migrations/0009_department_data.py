@@ -0,0 +1,74 @@
+from collections import Counter, defaultdict
+
+from django.db import migrations
+from django.db.models import Count, Min, Sum
+
+
+UNNAMED = 'Unassigned'
+
+
+def create_departments(apps, schema_editor):
+    """
+    One Department per department name, ignoring case and surrounding spaces.
+    The spelling most employees use wins. Summary rows that now share a
+    (date, department) are merged.
+    """
+    Department = apps.get_model('core', 'Department')
+    Employee = apps.get_model('core', 'Employee')
+    Summary = apps.get_model('core', 'DailyAttendanceSummary')
+    db = schema_editor.connection.alias
+
+    employee_counts = dict(Employee.objects.using(db).values_list('department').annotate(Count('id')).order_by())
+    raw_names = set(employee_counts) | set(Summary.objects.using(db).values_list('department', flat=True).distinct())
+
+    spellings = defaultdict(Counter)
+    for raw in raw_names:
+        name = raw.strip() or UNNAMED
+        spellings[name.upper()][name] += employee_counts.get(raw, 0)
+
+    departments = {}
+    for key, counts in spellings.items():
+        name = min(counts, key=lambda spelling: (-counts[spelling], spelling))
+        departments[key] = Department.objects.using(db).create(name=name, headcount=sum(counts.values()))
+
+    for raw in raw_names:
+        department = departments[(raw.strip() or UNNAMED).upper()]
+        Employee.objects.using(db).filter(department=raw).update(department_ref=department)
+        Summary.objects.using(db).filter(department=raw).update(department_ref=department)
+
+    duplicates = Summary.objects.using(db).values('date', 'department_ref').annotate(
+        rows=Count('id'), first=Min('id'),
+        present_total=Sum('present'), absent_total=Sum('absent'), headcount_total=Sum('headcount')
+    ).filter(rows__gt=1).order_by()
+    for row in duplicates:
+        Summary.objects.using(db).filter(pk=row['first']).update(
+            present=row['present_total'], absent=row['absent_total'], headcount=row['headcount_total']
+        )
+        Summary.objects.using(db).filter(date=row['date'], department_ref=row['department_ref']).exclude(
+            pk=row['first']
+        ).delete()
+
+
+def restore_names(apps, schema_editor):
+    Department = apps.get_model('core', 'Department')
+    Employee = apps.get_model('core', 'Employee')
+    Summary = apps.get_model('core', 'DailyAttendanceSummary')
+    db = schema_editor.connection.alias
+
+    for department in Department.objects.using(db).all():
+        Employee.objects.using(db).filter(department_ref=department).update(department=department.name)
+        Summary.objects.using(db).filter(department_ref=department).update(department=department.name)
+    Employee.objects.using(db).update(department_ref=None)
+    Summary.objects.using(db).update(department_ref=None)
+    Department.objects.using(db).all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_department'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_departments, restore_names),
+    ]
@@ -0,0 +1,103 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# 0007's search index, which reads the department name columns removed below
+POSTGRESQL_INDEX = (
+    'CREATE INDEX IF NOT EXISTS employees_search_idx ON employees '
+    "USING gin (to_tsvector('simple', \"full_name\" || ' ' || \"department\")) WITH (fastupdate = off)"
+)
+COLUMNS = 'employee_id, email, full_name, department'
+VALUES = 'new.employee_id, new.email, new.full_name, new.department'
+SQLITE_TRIGGERS = {
+    'insert': 'AFTER INSERT ON employees BEGIN '
+              f'INSERT INTO employees_search (rowid, {COLUMNS}) VALUES (new.id, {VALUES}); END',
+    'update': 'AFTER UPDATE ON employees BEGIN '
+              'DELETE FROM employees_search WHERE rowid = old.id; '
+              f'INSERT INTO employees_search (rowid, {COLUMNS}) VALUES (new.id, {VALUES}); END',
+    'delete': 'AFTER DELETE ON employees BEGIN '
+              'DELETE FROM employees_search WHERE rowid = old.id; END',
+}
+
+
+def uninstall_previous_search(apps, schema_editor):
+    """Drop 0007's search index; 0011 creates one over the department names"""
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS employees_search_idx')
+        elif connection.vendor == 'sqlite':
+            for event in SQLITE_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS employees_search_{event}')
+            cursor.execute('DROP TABLE IF EXISTS employees_search')
+
+
+def install_previous_search(apps, schema_editor):
+    """Back to 0007's search index once the department name columns are restored"""
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(POSTGRESQL_INDEX)
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS employees_search USING fts5({COLUMNS}, prefix='2 3')")
+            for event, body in SQLITE_TRIGGERS.items():
+                cursor.execute(f'DROP TRIGGER IF EXISTS employees_search_{event}')
+                cursor.execute(f'CREATE TRIGGER employees_search_{event} {body}')
+            cursor.execute('DELETE FROM employees_search')
+            cursor.execute(f'INSERT INTO employees_search (rowid, {COLUMNS}) SELECT id, {COLUMNS} FROM employees')
+
+
+class Migration(migrations.Migration):
+    """Replace the department name columns with the foreign keys filled in by 0009"""
+
+    dependencies = [
+        ('core', '0009_department_data'),
+    ]
+
+    operations = [
+        migrations.RunPython(uninstall_previous_search, install_previous_search),
+        migrations.RemoveIndex(
+            model_name='employee',
+            name='employees_departm_ef7a1f_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailyattendancesummary',
+            unique_together=set(),
+        ),
+        migrations.RemoveField(
+            model_name='employee',
+            name='department',
+        ),
+        migrations.RemoveField(
+            model_name='dailyattendancesummary',
+            name='department',
+        ),
+        migrations.RenameField(
+            model_name='employee',
+            old_name='department_ref',
+            new_name='department',
+        ),
+        migrations.RenameField(
+            model_name='dailyattendancesummary',
+            old_name='department_ref',
+            new_name='department',
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='department',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='employees', to='core.department', verbose_name='Department'),
+        ),
+        migrations.AlterField(
+            model_name='dailyattendancesummary',
+            name='department',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to='core.department', verbose_name='Department'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailyattendancesummary',
+            unique_together={('date', 'department')},
+        ),
+        migrations.AlterModelOptions(
+            name='dailyattendancesummary',
+            options={'ordering': ['-date', 'department_id'], 'verbose_name': 'Daily Attendance Summary', 'verbose_name_plural': 'Daily Attendance Summaries'},
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations
+
+
+# Without fastupdate, new rows go straight into the GIN index instead of a
+# pending list that every search scans until the next VACUUM
+POSTGRESQL_INDEX = (
+    'CREATE INDEX IF NOT EXISTS employees_search_idx ON employees '
+    "USING gin (to_tsvector('simple', \"full_name\")) WITH (fastupdate = off)"
+)
+COLUMNS = 'employee_id, email, full_name, department'
+DEPARTMENT = 'SELECT name FROM departments WHERE id = new.department_id'
+VALUES = f'new.employee_id, new.email, new.full_name, ({DEPARTMENT})'
+SQLITE_TRIGGERS = {
+    'insert': 'AFTER INSERT ON employees BEGIN '
+              f'INSERT INTO employees_search (rowid, {COLUMNS}) VALUES (new.id, {VALUES}); END',
+    'update': 'AFTER UPDATE ON employees BEGIN '
+              'DELETE FROM employees_search WHERE rowid = old.id; '
+              f'INSERT INTO employees_search (rowid, {COLUMNS}) VALUES (new.id, {VALUES}); END',
+    'delete': 'AFTER DELETE ON employees BEGIN '
+              'DELETE FROM employees_search WHERE rowid = old.id; END',
+    'department': 'AFTER UPDATE OF name ON departments BEGIN '
+                  'UPDATE employees_search SET department = new.name '
+                  'WHERE rowid IN (SELECT id FROM employees WHERE department_id = new.id); END',
+}
+
+
+def install_search(apps, schema_editor):
+    """
+    GIN full-text index over full_name on PostgreSQL (department names are
+    matched through the departments table), FTS5 table over the department
+    name and triggers on employees and departments on SQLite
+    """
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(POSTGRESQL_INDEX)
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS employees_search USING fts5({COLUMNS}, prefix='2 3')")
+            for event, body in SQLITE_TRIGGERS.items():
+                cursor.execute(f'DROP TRIGGER IF EXISTS employees_search_{event}')
+                cursor.execute(f'CREATE TRIGGER employees_search_{event} {body}')
+            cursor.execute('DELETE FROM employees_search')
+            cursor.execute(
+                f'INSERT INTO employees_search (rowid, {COLUMNS}) '
+                'SELECT e.id, e.employee_id, e.email, e.full_name, d.name '
+                'FROM employees e JOIN departments d ON d.id = e.department_id'
+            )
+
+
+def uninstall_search(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('DROP INDEX IF EXISTS employees_search_idx')
+        elif connection.vendor == 'sqlite':
+            for event in SQLITE_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER IF EXISTS employees_search_{event}')
+            cursor.execute('DROP TABLE IF EXISTS employees_search')
+
+
+class Migration(migrations.Migration):
+    """Search index over the department names now that they live in departments"""
+
+    dependencies = [
+        ('core', '0010_department_finalize'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
@@ -1,12 +1,54 @@
 """
 Database models for HRMS Lite
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.core.validators import EmailValidator
-from django.core.exceptions import ValidationError
 
 
-class Employee(models.Model):
+class LoadedValuesMixin:
+    """Remember the field values a row was loaded with, so signal handlers can see what changed"""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class Department(models.Model):
+    """
+    Department employees belong to. Names are unique regardless of case.
+    headcount is kept up to date on every employee write (see core.departments)
+    and recounted by `manage.py rebuild_attendance_summary`.
+    """
+    name = models.CharField(
+        max_length=100,
+        verbose_name="Name",
+        help_text="Department name (e.g., IT, HR, Sales)"
+    )
+    headcount = models.IntegerField(
+        default=0,
+        verbose_name="Headcount",
+        help_text="Current number of employees"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'departments'
+        ordering = ['name']
+        verbose_name = 'Department'
+        verbose_name_plural = 'Departments'
+        constraints = [
+            models.UniqueConstraint(Upper('name'), name='departments_name_upper_key'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class Employee(LoadedValuesMixin, models.Model):
     """
     Employee model to store employee information
     """
@@ -27,10 +69,11 @@ class Employee(models.Model):
         verbose_name="Email Address",
         help_text="Employee's email address"
     )
-    department = models.CharField(
-        max_length=100,
-        verbose_name="Department",
-        help_text="Department name (e.g., IT, HR, Sales)"
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.PROTECT,
+        related_name='employees',
+        verbose_name="Department"
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -40,6 +83,9 @@ class Employee(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Employee'
         verbose_name_plural = 'Employees'
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.employee_id} - {self.full_name}"
@@ -52,11 +98,17 @@ class Employee(models.Model):
             self.full_name = self.full_name.strip()
         if self.email:
             self.email = self.email.strip().lower()
-        if self.department:
-            self.department = self.department.strip()
+
+    def save(self, *args, **kwargs):
+        """
+        Save in a transaction so signal-maintained headcounts commit together
+        with the row; inside a caller's transaction no extra savepoint is made
+        """
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
 
 
-class Attendance(models.Model):
+class Attendance(LoadedValuesMixin, models.Model):
     """
     Attendance model to track employee attendance
     """
@@ -93,20 +145,94 @@ class Attendance(models.Model):
         indexes = [
             models.Index(fields=['employee', 'date']),
             models.Index(fields=['date']),
+            models.Index(fields=['date', 'status']),
+            models.Index(
+                fields=['status', 'date'],
+                condition=models.Q(status='Absent'),
+                name='attendances_absent_date_idx'
+            ),
         ]
 
     def __str__(self):
         return f"{self.employee.employee_id} - {self.date} - {self.status}"
 
-    def clean(self):
-        """Custom validation to prevent duplicate attendance"""
-        if self.employee and self.date:
-            existing = Attendance.objects.filter(
-                employee=self.employee,
-                date=self.date
-            ).exclude(pk=self.pk)
-
-            if existing.exists():
-                raise ValidationError(
-                    f"Attendance for {self.employee.employee_id} on {self.date} already exists."
-                )
+    def save(self, *args, **kwargs):
+        """
+        Save in a transaction so signal-maintained summaries commit together
+        with the row; inside a caller's transaction no extra savepoint is made
+        """
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Delete in a transaction so signal-maintained summaries commit together with the row"""
+        with transaction.atomic(using=kwargs.get('using')):
+            return super().delete(*args, **kwargs)
+
+
+class AttendanceArchive(models.Model):
+    """
+    One employee's attendance for one closed month, stored as bitmaps.
+    Bit n-1 of known_mask is set when day n was recorded and bit n-1 of
+    present_mask when the employee was present that day. Written by
+    `manage.py archive_attendance`, which removes the archived Attendance
+    rows (see core.archive).
+    """
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='attendance_archives',
+        verbose_name="Employee"
+    )
+    month = models.DateField(
+        verbose_name="Month",
+        help_text="First day of the archived month"
+    )
+    present_mask = models.IntegerField(default=0, verbose_name="Present days mask")
+    known_mask = models.IntegerField(default=0, verbose_name="Recorded days mask")
+
+    class Meta:
+        db_table = 'attendance_archives'
+        ordering = ['-month']
+        verbose_name = 'Attendance Archive'
+        verbose_name_plural = 'Attendance Archives'
+        unique_together = ['employee', 'month']
+        indexes = [
+            models.Index(fields=['month']),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.month:%Y-%m}"
+
+
+class DailyAttendanceSummary(models.Model):
+    """
+    Per-day, per-department attendance counts.
+    Maintained incrementally from Attendance writes (see core.summary) and
+    rebuilt with `manage.py rebuild_attendance_summary`.
+    """
+    date = models.DateField(verbose_name="Date")
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.CASCADE,
+        related_name='daily_summaries',
+        verbose_name="Department"
+    )
+    present = models.IntegerField(default=0, verbose_name="Present")
+    absent = models.IntegerField(default=0, verbose_name="Absent")
+    headcount = models.IntegerField(
+        default=0,
+        verbose_name="Headcount",
+        help_text="Employees in the department when the day was first recorded"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'daily_attendance_summaries'
+        ordering = ['-date', 'department_id']
+        verbose_name = 'Daily Attendance Summary'
+        verbose_name_plural = 'Daily Attendance Summaries'
+        unique_together = ['date', 'department']
+
+    def __str__(self):
+        return f"{self.date} - {self.department}: {self.present} present, {self.absent} absent"
@@ -0,0 +1,211 @@
+"""
+Pagination helpers for HRMS API
+"""
+import base64
+import binascii
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Count, Q, Window
+from rest_framework.exceptions import ValidationError
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+COUNT_MODES = ('exact', 'estimated', 'none')
+
+
+def get_page_size(request, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Read and clamp the page_size query parameter"""
+    value = request.query_params.get('page_size')
+    if not value:
+        return default
+
+    try:
+        page_size = int(value)
+    except ValueError:
+        raise ValidationError({'page_size': 'Page size must be a positive integer.'})
+
+    if page_size < 1:
+        raise ValidationError({'page_size': 'Page size must be a positive integer.'})
+
+    return min(page_size, maximum)
+
+
+def get_page_number(request):
+    """Read the 1-based page query parameter"""
+    value = request.query_params.get('page', '1')
+    try:
+        page = int(value)
+    except ValueError:
+        raise ValidationError({'page': 'Page must be a positive integer.'})
+
+    if page < 1:
+        raise ValidationError({'page': 'Page must be a positive integer.'})
+
+    return page
+
+
+def get_count_mode(request, default='none'):
+    """Read the count query parameter (exact, estimated or none)"""
+    mode = request.query_params.get('count', default).lower()
+    if mode not in COUNT_MODES:
+        raise ValidationError({'count': f"Count must be one of: {', '.join(COUNT_MODES)}."})
+    return mode
+
+
+def count_queryset(queryset, mode):
+    """Count a queryset according to the requested count mode"""
+    if mode == 'exact':
+        return queryset.count()
+    if mode == 'estimated':
+        return estimate_count(queryset)
+    return None
+
+
+async def acount_queryset(queryset, mode):
+    """Async version of count_queryset"""
+    if mode == 'exact':
+        return await queryset.acount()
+    if mode == 'estimated':
+        return await sync_to_async(estimate_count)(queryset)
+    return None
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate for a queryset.
+    Only PostgreSQL exposes a cheap estimate; other backends fall back to an exact count.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def paginate_by_page(queryset, page, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Return (rows, total) for a numbered page.
+    The total comes from a COUNT(*) OVER () window on the page query itself, so no second query is needed.
+    """
+    rows = list(page_queryset(queryset, page, page_size))
+    if rows or page == 1:
+        return rows, page_total(rows)
+    # Past the last page there is no row to carry the window count
+    return rows, queryset.count()
+
+
+async def apaginate_by_page(queryset, page, page_size=DEFAULT_PAGE_SIZE):
+    """Async version of paginate_by_page"""
+    rows = [row async for row in page_queryset(queryset, page, page_size)]
+    if rows or page == 1:
+        return rows, page_total(rows)
+    return rows, await queryset.acount()
+
+
+def page_queryset(queryset, page, page_size):
+    """One page of a queryset, each row annotated with the total row count"""
+    offset = (page - 1) * page_size
+    counted = queryset.annotate(page_total=Window(expression=Count('pk')))
+    return counted[offset:offset + page_size]
+
+
+def page_total(rows):
+    """Total row count carried by the rows of a page_queryset() page"""
+    if not rows:
+        return 0
+    first = rows[0]
+    return first['page_total'] if isinstance(first, dict) else first.page_total
+
+
+def encode_cursor(values):
+    """Encode ordering values into an opaque cursor token"""
+    payload = json.dumps(values, default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a cursor token produced by encode_cursor"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+
+    if not isinstance(values, list):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+    return values
+
+
+class KeysetPaginator:
+    """
+    Cursor (keyset) pagination over a fixed ordering.
+    The ordering must end with a unique field so every row has a stable position.
+    """
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+
+    def paginate(self, queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+        """Return (rows, next_cursor) for the page following the cursor"""
+        rows = list(self.page_queryset(queryset, cursor, page_size))
+        return self.split_page(rows, page_size)
+
+    async def apaginate(self, queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+        """Async version of paginate"""
+        rows = [row async for row in self.page_queryset(queryset, cursor, page_size)]
+        return self.split_page(rows, page_size)
+
+    def page_queryset(self, queryset, cursor, page_size):
+        """The page after the cursor plus one extra row, which tells whether another page follows"""
+        queryset = queryset.order_by(*self.ordering)
+
+        if cursor:
+            try:
+                queryset = queryset.filter(self.after(decode_cursor(cursor)))
+            except (DjangoValidationError, TypeError, ValueError):
+                raise ValidationError({'cursor': 'Invalid cursor.'})
+
+        return queryset[:page_size + 1]
+
+    def split_page(self, rows, page_size):
+        """Trim the extra row and return (rows, next_cursor)"""
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(self.position(rows[-1]))
+
+        return rows, next_cursor
+
+    def position(self, row):
+        """Ordering values of a row (model instance or values() dict)"""
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    def after(self, values):
+        """Build the filter selecting rows strictly after the given position"""
+        if len(values) != len(self.ordering):
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[index]})
+            for previous, value in zip(self.ordering[:index], values):
+                step &= Q(**{previous.lstrip('-'): value})
+            condition |= step
+
+        return condition
@@ -0,0 +1,252 @@
+"""
+Range partitioning of the attendances table by month or year (PostgreSQL only).
+
+A partitioned `attendances` keeps the columns, indexes and constraints of the
+plain table, except that its primary key becomes (id, date): PostgreSQL
+requires the partition key in every unique constraint. Ids still come from a
+single sequence, so they stay unique. Rows outside every partition land in
+`attendances_default`, so a write never fails for lack of a partition.
+
+Queries filtering on `date` with plain comparisons (=, <, >=, BETWEEN, IN)
+only scan the partitions that can hold matching rows. Other backends keep a
+single table and every function here is a no-op.
+"""
+import re
+from datetime import date, datetime
+
+from django.utils import timezone
+
+
+TABLE = 'attendances'
+DEFAULT_PARTITION = f'{TABLE}_default'
+SEQUENCE = f'{TABLE}_id_seq'
+INTERVALS = ('month', 'year')
+BOUNDS = re.compile(r"FROM \('([0-9-]+)'\) TO \('([0-9-]+)'\)")
+
+
+def supported(connection):
+    return connection.vendor == 'postgresql'
+
+
+def is_partitioned(connection):
+    """Whether the attendances table is partitioned"""
+    if not supported(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)', [TABLE])
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def run_deferred_checks(cursor):
+    """
+    Check the deferred foreign keys of this transaction's earlier writes now:
+    PostgreSQL refuses to drop or rename a table with checks still pending
+    """
+    cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+    cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+
+
+def period_start(day, interval):
+    """First day of the month or year containing `day`"""
+    if interval == 'year':
+        return day.replace(month=1, day=1)
+    return day.replace(day=1)
+
+
+def next_period(start, interval):
+    if interval == 'year':
+        return start.replace(year=start.year + 1)
+    return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+
+def add_periods(day, interval, count):
+    start = period_start(day, interval)
+    for _ in range(count):
+        start = next_period(start, interval)
+    return start
+
+
+def periods(first, last, interval):
+    """(start, end) of every period from the one containing `first` to the one containing `last`"""
+    start = period_start(first, interval)
+    while start <= last:
+        end = next_period(start, interval)
+        yield start, end
+        start = end
+
+
+def partition_name(start, interval):
+    if interval == 'year':
+        return f'{TABLE}_p{start:%Y}'
+    return f'{TABLE}_p{start:%Y_%m}'
+
+
+def list_partitions(connection):
+    """(name, start, end) of every partition, oldest first; the default partition has no bounds"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+        """, [TABLE])
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        match = BOUNDS.search(bound)
+        if match:
+            start, end = (datetime.strptime(value, '%Y-%m-%d').date() for value in match.groups())
+        else:
+            start = end = None
+        partitions.append((name, start, end))
+    return sorted(partitions, key=lambda partition: (partition[1] is None, partition[1] or date.min))
+
+
+def table_interval(connection):
+    """'year' or 'month', as the existing partitions were created, or None without any"""
+    for _, start, end in list_partitions(connection):
+        if start is not None:
+            return 'year' if (end - start).days > 31 else 'month'
+    return None
+
+
+def create_partitions(connection, first, last, interval):
+    """
+    Create the missing partitions for every period from `first` to `last`.
+    Periods overlapping an existing partition are skipped; rows of a new
+    period already in the default partition are moved into it.
+    Returns the names of the partitions created.
+    """
+    partitions = list_partitions(connection)
+    existing = [(start, end) for _, start, end in partitions if start is not None]
+    has_default = len(existing) < len(partitions)
+    created = []
+    with connection.cursor() as cursor:
+        for start, end in periods(first, last, interval):
+            if any(start < other_end and other_start < end for other_start, other_end in existing):
+                continue
+            name = partition_name(start, interval)
+            create_partition(cursor, quote(name), start, end, has_default)
+            created.append(name)
+    return created
+
+
+def create_partition(cursor, name, start, end, has_default):
+    """Create one partition, moving its rows out of the default partition first"""
+    table = quote(TABLE)
+    bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    if not has_default:
+        cursor.execute(f'CREATE TABLE {name} PARTITION OF {table} FOR VALUES {bounds}')
+        return
+
+    # Attaching checks the default partition holds no rows of the new range
+    cursor.execute(f'CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} WHERE date >= %s AND date < %s RETURNING *) '
+        f'INSERT INTO {name} SELECT * FROM moved',
+        [start, end]
+    )
+    cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {bounds}')
+
+
+def partition_table(connection, interval, ahead=3):
+    """
+    Convert the plain attendances table into a partitioned one, with a
+    partition per period from the oldest row to `ahead` periods from today.
+    The table is locked while its rows are copied.
+    """
+    today = timezone.now().date()
+    table = quote(TABLE)
+    old = quote(f'{TABLE}_unpartitioned')
+    new_sequence = quote(f'{SEQUENCE}_partitioned')
+
+    with connection.cursor() as cursor:
+        run_deferred_checks(cursor)
+        constraints, indexes = table_definition(cursor)
+
+        cursor.execute(f'ALTER TABLE {table} RENAME TO {old}')
+        cursor.execute(f'CREATE TABLE {table} (LIKE {old}) PARTITION BY RANGE (date)')
+        # Identity columns aren't supported on partitioned tables before PostgreSQL 17
+        cursor.execute(f'CREATE SEQUENCE {new_sequence} OWNED BY {table}.id')
+        cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{new_sequence}')")
+
+        cursor.execute(f'SELECT MIN(date) FROM {old}')
+        oldest = cursor.fetchone()[0] or today
+        last = add_periods(today, interval, ahead)
+        for start, end in periods(min(oldest, today), last, interval):
+            create_partition(cursor, quote(partition_name(start, interval)), start, end, has_default=False)
+        cursor.execute(f'CREATE TABLE {quote(DEFAULT_PARTITION)} PARTITION OF {table} DEFAULT')
+
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        cursor.execute(f"SELECT setval('{new_sequence}', COALESCE(MAX(id), 0) + 1, false) FROM {table}")
+        cursor.execute(f'DROP TABLE {old}')
+        cursor.execute(f'ALTER SEQUENCE {new_sequence} RENAME TO {quote(SEQUENCE)}')
+
+        for name, kind, definition in constraints:
+            if kind == 'p':
+                definition = 'PRIMARY KEY (id, date)'
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {quote(name)} {definition}')
+        for definition in indexes:
+            cursor.execute(definition)
+
+
+def unpartition_table(connection):
+    """Convert the partitioned attendances table back into a single plain table"""
+    table = quote(TABLE)
+    old = quote(f'{TABLE}_partitioned')
+
+    with connection.cursor() as cursor:
+        run_deferred_checks(cursor)
+        constraints, indexes = table_definition(cursor)
+
+        cursor.execute(f'ALTER TABLE {table} RENAME TO {old}')
+        cursor.execute(f'CREATE TABLE {table} (LIKE {old})')
+        cursor.execute(f'ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}",
+            [TABLE]
+        )
+        # Dropping the parent drops its partitions and the sequence it owned
+        cursor.execute(f'DROP TABLE {old}')
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+        cursor.execute(f'ALTER SEQUENCE {cursor.fetchone()[0]} RENAME TO {quote(SEQUENCE)}')
+
+        for name, kind, definition in constraints:
+            if kind == 'p':
+                definition = 'PRIMARY KEY (id)'
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {quote(name)} {definition}')
+        for definition in indexes:
+            cursor.execute(definition.replace(' ON ONLY ', ' ON ', 1))
+
+
+def table_definition(cursor):
+    """
+    Constraints as (name, type, definition), primary key first, and the
+    CREATE INDEX statements of indexes not backing a constraint
+    """
+    cursor.execute("""
+        SELECT conname, contype, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f', 'c')
+        ORDER BY contype != 'p', conname
+    """, [TABLE])
+    constraints = cursor.fetchall()
+    cursor.execute("""
+        SELECT pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = to_regclass(%s)
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_constraint c
+              WHERE c.conrelid = i.indrelid AND c.conindid = i.indexrelid
+          )
+        ORDER BY i.indexrelid
+    """, [TABLE])
+    indexes = [row[0] for row in cursor.fetchall()]
+    return constraints, indexes
+
+
+def quote(name):
+    return '"%s"' % name
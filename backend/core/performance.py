@@ -0,0 +1,209 @@
+"""
+Per-request performance measurements and the sinks that receive them
+"""
+import bisect
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger('hrms.performance')
+
+DEFAULT_SINKS = ['core.performance.LogSink']
+# Upper bounds in milliseconds; anything slower lands in the final +Inf bucket
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class RequestMetrics:
+    """Wall time, SQL query count, DB time and response size of one request"""
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.view = None
+        self.route = None
+        self.status = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.response_bytes = 0
+        self.started = time.perf_counter()
+        self.duration = None
+        # Async views may run queries for one request on several threads at once
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook: time every query the request runs"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.db_time += elapsed
+                self.queries += 1
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def finish(self):
+        self.duration = self.elapsed()
+
+    def server_timing(self):
+        """Server-Timing header value with durations in milliseconds"""
+        duration = self.duration if self.duration is not None else self.elapsed()
+        return (
+            f'app;dur={duration * 1000:.2f}, '
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"'
+        )
+
+    def as_dict(self):
+        return {
+            'method': self.method,
+            'path': self.path,
+            'view': self.view,
+            'route': self.route,
+            'status': self.status,
+            'duration_ms': round((self.duration or 0) * 1000, 3),
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 3),
+            'response_bytes': self.response_bytes
+        }
+
+
+class BaseSink:
+    """Receives the metrics of every finished request"""
+
+    def request_started(self, metrics):
+        """Called when a request comes in, before its view runs"""
+
+    def record(self, metrics):
+        raise NotImplementedError
+
+
+class LogSink(BaseSink):
+    """Write one JSON line per request to the `hrms.performance` logger"""
+
+    def record(self, metrics):
+        logger.info(json.dumps(metrics.as_dict()))
+
+
+class Histogram:
+    """Bucketed latency histogram with running totals"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.queries = 0
+        self.db_ms = 0.0
+        self.response_bytes = 0
+
+    def observe(self, metrics):
+        duration_ms = (metrics.duration or 0) * 1000
+        self.counts[bisect.bisect_left(self.buckets, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.queries += metrics.queries
+        self.db_ms += metrics.db_time * 1000
+        self.response_bytes += metrics.response_bytes
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+    def snapshot(self):
+        count = self.count or 1
+        return {
+            'requests': self.count,
+            'buckets_ms': {
+                **{str(bound): count for bound, count in zip(self.buckets, self.counts)},
+                '+Inf': self.counts[-1]
+            },
+            'p50_ms': self.quantile(0.5),
+            'p95_ms': self.quantile(0.95),
+            'p99_ms': self.quantile(0.99),
+            'mean_ms': round(self.total_ms / count, 3),
+            'mean_queries': round(self.queries / count, 2),
+            'mean_db_ms': round(self.db_ms / count, 3),
+            'mean_response_bytes': round(self.response_bytes / count)
+        }
+
+
+class HistogramSink(BaseSink):
+    """In-process latency histograms per (view, method), for this worker only"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+
+    def record(self, metrics):
+        key = (metrics.view, metrics.method)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(metrics)
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {'view': view, 'method': method, **histogram.snapshot()}
+                for (view, method), histogram in sorted(self.histograms.items(), key=lambda item: str(item[0]))
+            ]
+
+
+_sinks = None
+
+
+def get_sinks():
+    """Sink instances configured by PERFORMANCE_SINKS (dotted class paths), created once per process"""
+    global _sinks
+    if _sinks is None:
+        _sinks = [import_string(path)() for path in getattr(settings, 'PERFORMANCE_SINKS', DEFAULT_SINKS)]
+    return _sinks
+
+
+def get_sink(sink_class):
+    """The configured sink of the given class, if any"""
+    return next((sink for sink in get_sinks() if isinstance(sink, sink_class)), None)
+
+
+@receiver(setting_changed)
+def reset_sinks(setting, **kwargs):
+    global _sinks
+    if setting == 'PERFORMANCE_SINKS':
+        _sinks = None
+
+
+def notify(method, metrics):
+    """Call a sink hook on every sink; a failing sink never breaks the response"""
+    for sink in get_sinks():
+        try:
+            getattr(sink, method)(metrics)
+        except Exception:
+            logger.exception('Performance sink %s failed', type(sink).__name__)
+
+
+def started(metrics):
+    """Tell the sinks a request has started"""
+    notify('request_started', metrics)
+
+
+def record(metrics):
+    """Hand finished request metrics to every sink"""
+    notify('record', metrics)
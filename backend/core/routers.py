@@ -0,0 +1,62 @@
+"""
+Database routing between the primary database and its read replicas
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+# Replica the current request reads from; None reads from the primary.
+# Set by ReplicaRoutingMiddleware for GET requests to views that opt in.
+read_alias = ContextVar('read_alias', default=None)
+
+
+def replica_aliases():
+    """Database aliases configured as read replicas (DATABASE_REPLICAS)"""
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def choose_replica():
+    """A replica alias picked at random, or None when no replica is configured"""
+    aliases = replica_aliases()
+    return random.choice(aliases) if aliases else None
+
+
+@contextmanager
+def read_from_replica(alias=None):
+    """Send the reads inside the block to a replica (the primary when there is none)"""
+    token = read_alias.set(alias or choose_replica())
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """Send the reads inside the block to the primary, even within a replica-routed request"""
+    token = read_alias.set(None)
+    try:
+        yield
+    finally:
+        read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica chosen for the current request, if any, and
+    everything else to the primary. Writes always go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
@@ -0,0 +1,155 @@
+"""
+Employee search for HRMS Lite
+
+A query matches employees whose employee_id or email starts with it, or whose
+full name or department name contains words starting with each of its words.
+Results come best match first: exact employee ID, then ID prefix, then email
+prefix, then text relevance.
+
+Every match is found through an index:
+- PostgreSQL: the varchar_pattern_ops indexes Django creates for the unique
+  employee_id and email columns, a GIN full-text index over full_name
+  ('simple' configuration, so names aren't stemmed), and the department_id
+  index for the (few) departments whose name matches. Here the words must
+  all be in the full name or all in the department name.
+- SQLite: an FTS5 table over the ID, email, name and department name, kept
+  in sync by triggers on employees and departments.
+The indexes, table and triggers are created by migration 0011_department_search.
+Other backends fall back to unindexed LIKE matching.
+"""
+import re
+
+from django.db import connections, router
+from django.db.models import BooleanField, Case, FloatField, Q, Value, When, prefetch_related_objects
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+from .models import Department, Employee
+from .pagination import DEFAULT_PAGE_SIZE, page_total, paginate_by_page
+
+
+MAX_QUERY_LENGTH = 100
+WORD = re.compile(r'\w+')
+
+POSTGRESQL_INDEX = 'employees_search_idx'
+FTS_TABLE = 'employees_search'
+# Column weights for SQLite's bm25 ranking: employee_id, email, full_name, department
+FTS_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+
+def document(table=None, column='full_name'):
+    """The full-text document of a row's column, as indexed on PostgreSQL"""
+    prefix = f'"{table}".' if table else ''
+    return f"to_tsvector('simple', {prefix}\"{column}\")"
+
+
+def normalize(query):
+    """Collapse whitespace and cap the length of a search query"""
+    return ' '.join(query.split())[:MAX_QUERY_LENGTH]
+
+
+def words(query):
+    return WORD.findall(query.lower())
+
+
+def fts_query(query):
+    """FTS5 query requiring a token starting with each word, or None"""
+    terms = words(query)
+    return ' '.join(f'"{term}"*' for term in terms) or None
+
+
+def tsquery(query):
+    """PostgreSQL tsquery requiring a lexeme starting with each word, or None"""
+    terms = words(query)
+    return ' & '.join(f'{term}:*' for term in terms) or None
+
+
+def prefix_rank(query):
+    """3 for the exact employee ID, 2 for an ID prefix, 1 for an email prefix, else 0"""
+    return Case(
+        When(employee_id=query.upper(), then=Value(3.0)),
+        When(employee_id__startswith=query.upper(), then=Value(2.0)),
+        When(email__startswith=query.lower(), then=Value(1.0)),
+        default=Value(0.0),
+        output_field=FloatField()
+    )
+
+
+def filter_employees(queryset, query):
+    """Employees of a queryset matching a search query (unordered)"""
+    query = normalize(query)
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'sqlite':
+        match = fts_query(query)
+        if match is None:
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]
+        ))
+
+    matches = Q(employee_id__startswith=query.upper()) | Q(email__startswith=query.lower())
+    if vendor == 'postgresql':
+        text = tsquery(query)
+        if text is not None:
+            matches |= Q(RawSQL(
+                f"{document(Employee._meta.db_table)} @@ to_tsquery('simple', %s)", [text],
+                output_field=BooleanField()
+            ))
+            matches |= Q(department__in=Department.objects.filter(RawSQL(
+                f"{document(Department._meta.db_table, 'name')} @@ to_tsquery('simple', %s)", [text],
+                output_field=BooleanField()
+            )))
+    else:
+        matches |= Q(full_name__icontains=query) | Q(department__name__icontains=query)
+    return queryset.filter(matches)
+
+
+def search_employees(query, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """Return (employees, total) for a page of matches, best first"""
+    query = normalize(query)
+    db = router.db_for_read(Employee)
+    vendor = connections[db].vendor
+
+    if vendor == 'sqlite':
+        return search_sqlite(db, query, page, page_size)
+
+    employees = filter_employees(Employee.objects.using(db), query)
+    rank = prefix_rank(query)
+    text = tsquery(query)
+    if vendor == 'postgresql' and text is not None:
+        rank = Greatest(rank, RawSQL(
+            f"ts_rank({document(Employee._meta.db_table)}, to_tsquery('simple', %s))", [text],
+            output_field=FloatField()
+        ))
+    employees = employees.select_related('department').annotate(search_rank=rank).order_by('-search_rank', 'employee_id')
+    return paginate_by_page(employees, page, page_size)
+
+
+def search_sqlite(db, query, page, page_size):
+    """FTS5 search, ordered by prefix_rank(), then text-only matches by bm25 (lower is better)"""
+    match = fts_query(query)
+    if match is None:
+        return [], 0
+    employee_id, email = query.upper(), query.lower()
+
+    table = Employee._meta.db_table
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    rows = list(Employee.objects.using(db).raw(
+        f'WITH matches AS ('
+        f'SELECT rowid AS id, -bm25({FTS_TABLE}, {weights}) AS score FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        f') '
+        f'SELECT e.*, CASE '
+        f'WHEN e.employee_id = %s THEN 3 '
+        f'WHEN substr(e.employee_id, 1, length(%s)) = %s THEN 2 '
+        f'WHEN substr(e.email, 1, length(%s)) = %s THEN 1 '
+        f'ELSE 0 END AS prefix_rank, matches.score AS text_rank, COUNT(*) OVER () AS page_total '
+        f'FROM matches JOIN {table} e ON e.id = matches.id '
+        f'ORDER BY prefix_rank DESC, CASE WHEN prefix_rank > 0 THEN 0 ELSE text_rank END DESC, e.employee_id '
+        f'LIMIT %s OFFSET %s',
+        [match, employee_id, employee_id, employee_id, email, email, page_size, (page - 1) * page_size]
+    ))
+    prefetch_related_objects(rows, 'department')
+    if rows or page == 1:
+        return rows, page_total(rows)
+    return rows, filter_employees(Employee.objects.using(db), query).count()
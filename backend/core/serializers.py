@@ -2,17 +2,82 @@
 Serializers for HRMS API
 """
 from rest_framework import serializers
+from . import cache, departments
+from .archive import is_closed
+from .exceptions import integrity_error_detail, unique_violation_columns
 from .models import Employee, Attendance
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
 from django.utils import timezone
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+EMPLOYEE_CACHE_FIELDS = ('id', 'employee_id', 'full_name', 'department_id')
+
+
+def resolve_employee(employee_id):
+    """
+    Employee with a normalized employee_id, or None. Only the fields attendance
+    writes and responses use are loaded, and they usually come from the cache.
+    """
+    row = cache.get_employee(employee_id, lambda: Employee.objects.filter(
+        employee_id=employee_id
+    ).values_list(*EMPLOYEE_CACHE_FIELDS).first())
+    if row is None:
+        return None
+    return Employee.from_db(DEFAULT_DB_ALIAS, EMPLOYEE_CACHE_FIELDS, row)
+
+
+class UniqueConstraintMixin:
+    """
+    Leave uniqueness to the database's unique constraints instead of checking
+    with a query first, which costs a round trip per field and still lets a
+    concurrent duplicate through. A violation becomes a ValidationError.
+    """
+
+    def save(self, **kwargs):
+        try:
+            # The savepoint keeps an enclosing transaction usable after a violation
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as e:
+            raise serializers.ValidationError(self.unique_error(e)) from e
+
+    def unique_error(self, exc):
+        return integrity_error_detail(exc)
+
+
+class DepartmentNameField(serializers.CharField):
+    """A department by name: its name on output, a name string on input (resolved on save)"""
+
+    def to_representation(self, value):
+        return value.name
+
+
+class EmployeeSerializer(UniqueConstraintMixin, serializers.ModelSerializer):
     """Serializer for Employee model"""
+    department = DepartmentNameField(max_length=100)
 
     class Meta:
         model = Employee
         fields = ['id', 'employee_id', 'full_name', 'email', 'department', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        # Uniqueness is enforced by the database (see UniqueConstraintMixin)
+        extra_kwargs = {
+            'employee_id': {'validators': []},
+            'email': {'validators': []},
+        }
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """Optionally restrict output to a sparse fieldset"""
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            unknown = set(fields) - set(self.fields)
+            if unknown:
+                raise serializers.ValidationError({
+                    'fields': f"Unknown field(s): {', '.join(sorted(unknown))}."
+                })
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     def validate_employee_id(self, value):
         """Validate employee_id format and uniqueness"""
@@ -24,11 +89,6 @@ class EmployeeSerializer(serializers.ModelSerializer):
         if len(value) < 3:
             raise serializers.ValidationError("Employee ID must be at least 3 characters long.")
 
-        # Check uniqueness (excluding current instance during update)
-        instance = self.instance
-        if Employee.objects.filter(employee_id=value).exclude(pk=instance.pk if instance else None).exists():
-            raise serializers.ValidationError("Employee ID already exists.")
-
         return value
 
     def validate_full_name(self, value):
@@ -44,18 +104,11 @@ class EmployeeSerializer(serializers.ModelSerializer):
         return value
 
     def validate_email(self, value):
-        """Validate email uniqueness"""
+        """Normalize email"""
         if not value:
             raise serializers.ValidationError("Email is required.")
 
-        value = value.strip().lower()
-
-        # Check uniqueness (excluding current instance during update)
-        instance = self.instance
-        if Employee.objects.filter(email=value).exclude(pk=instance.pk if instance else None).exists():
-            raise serializers.ValidationError("Email already exists.")
-
-        return value
+        return value.strip().lower()
 
     def validate_department(self, value):
         """Validate department"""
@@ -64,8 +117,46 @@ class EmployeeSerializer(serializers.ModelSerializer):
 
         return value.strip()
 
+    def create(self, validated_data):
+        """Create employee, adding the department on first use"""
+        validated_data['department'] = departments.get(validated_data['department'])
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        """Update employee, adding the department on first use"""
+        if 'department' in validated_data:
+            validated_data['department'] = departments.get(validated_data['department'])
+        return super().update(instance, validated_data)
+
+
+class EmployeeImportRowSerializer(serializers.Serializer):
+    """
+    Serializer for one row of a bulk employee import.
+    Field checks only; uniqueness is checked for a whole batch by the importer.
+    """
+    employee_id = serializers.CharField(max_length=20)
+    full_name = serializers.CharField(max_length=200)
+    email = serializers.EmailField()
+    department = serializers.CharField(max_length=100)
+
+    validate_full_name = EmployeeSerializer.validate_full_name
+    validate_department = EmployeeSerializer.validate_department
+
+    def validate_employee_id(self, value):
+        """Validate employee_id format"""
+        value = value.strip().upper()
+
+        if len(value) < 3:
+            raise serializers.ValidationError("Employee ID must be at least 3 characters long.")
+
+        return value
+
+    def validate_email(self, value):
+        """Normalize email"""
+        return value.strip().lower()
+
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(UniqueConstraintMixin, serializers.ModelSerializer):
     """Serializer for Attendance model"""
     employee_id = serializers.CharField(write_only=True)
     employee_name = serializers.CharField(source='employee.full_name', read_only=True)
@@ -80,17 +171,16 @@ class AttendanceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'employee', 'created_at', 'updated_at']
 
     def validate_employee_id(self, value):
-        """Validate employee exists"""
+        """Validate employee exists (resolved through the employee cache)"""
         if not value:
             raise serializers.ValidationError("Employee ID is required.")
 
         value = value.strip().upper()
 
-        try:
-            employee = Employee.objects.get(employee_id=value)
-            return employee
-        except Employee.DoesNotExist:
+        employee = resolve_employee(value)
+        if employee is None:
             raise serializers.ValidationError(f"Employee with ID '{value}' does not exist.")
+        return employee
 
     def validate_date(self, value):
         """Validate attendance date"""
@@ -100,6 +190,9 @@ class AttendanceSerializer(serializers.ModelSerializer):
         if value > timezone.now().date():
             raise serializers.ValidationError("Cannot mark attendance for future dates.")
 
+        if is_closed(value):
+            raise serializers.ValidationError(f"Attendance for {value:%B %Y} is closed.")
+
         return value
 
     def validate_status(self, value):
@@ -113,28 +206,22 @@ class AttendanceSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, attrs):
-        """Validate unique attendance per employee per day"""
-        employee = attrs.get('employee_id')  # This is actually the Employee object from validate_employee_id
-        date = attrs.get('date')
-
-        if employee and date:
-            # Check for existing attendance
-            existing = Attendance.objects.filter(
-                employee=employee,
-                date=date
-            )
-
-            # Exclude current instance during update
-            if self.instance:
-                existing = existing.exclude(pk=self.instance.pk)
-
-            if existing.exists():
-                raise serializers.ValidationError({
-                    'detail': f"Attendance for employee {employee.employee_id} on {date} already exists."
-                })
+        """Reject changes to closed months (one mark per employee per day is enforced on save)"""
+        if self.instance and is_closed(self.instance.date):
+            raise serializers.ValidationError({
+                'detail': f"Attendance for {self.instance.date:%B %Y} is closed and cannot be changed."
+            })
 
         return attrs
 
+    def unique_error(self, exc):
+        """Name the employee and date in a duplicate mark error"""
+        if unique_violation_columns(exc) != ('date', 'employee_id'):
+            return integrity_error_detail(exc)
+        employee = self.validated_data.get('employee_id') or self.instance.employee
+        date = self.validated_data.get('date') or self.instance.date
+        return {'detail': [f"Attendance for employee {employee.employee_id} on {date} already exists."]}
+
     def create(self, validated_data):
         """Create attendance record"""
         employee = validated_data.pop('employee_id')
@@ -149,9 +236,56 @@ class AttendanceSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class DashboardStatsSerializer(serializers.Serializer):
-    """Serializer for dashboard statistics"""
-    total_employees = serializers.IntegerField()
-    present_today = serializers.IntegerField()
-    absent_today = serializers.IntegerField()
-    attendance_rate = serializers.FloatField()
+class BulkAttendanceRowSerializer(serializers.Serializer):
+    """Serializer for a single row of a bulk attendance request (no database access)"""
+    employee_id = serializers.CharField()
+    date = serializers.DateField()
+    status = serializers.CharField()
+
+    validate_date = AttendanceSerializer.validate_date
+    validate_status = AttendanceSerializer.validate_status
+
+    def validate_employee_id(self, value):
+        """Normalize employee_id; existence is checked for the whole batch at once"""
+        value = value.strip().upper()
+        if not value:
+            raise serializers.ValidationError("Employee ID is required.")
+        return value
+
+
+class AttendanceMarkSerializer(serializers.Serializer):
+    """Serializer for marking one employee's attendance for a date (employee resolved by the upsert itself)"""
+    date = serializers.DateField()
+    status = serializers.CharField()
+
+    validate_date = AttendanceSerializer.validate_date
+    validate_status = AttendanceSerializer.validate_status
+
+
+class BulkAttendanceSerializer(serializers.Serializer):
+    """Serializer for bulk attendance marking (explicit rows or a department roll call)"""
+    records = serializers.ListField(child=serializers.DictField(), required=False)
+    department = serializers.CharField(required=False)
+    date = serializers.DateField(required=False)
+    status = serializers.CharField(required=False)
+    upsert = serializers.BooleanField(default=False)
+
+    validate_date = AttendanceSerializer.validate_date
+    validate_status = AttendanceSerializer.validate_status
+
+    def validate(self, attrs):
+        """Require either records or a department with date and status"""
+        if 'records' in attrs:
+            if not attrs['records']:
+                raise serializers.ValidationError({'records': 'At least one record is required.'})
+            return attrs
+
+        missing = [name for name in ('department', 'date', 'status') if not attrs.get(name)]
+        if missing:
+            raise serializers.ValidationError({
+                'detail': "Provide 'records', or 'department' with 'date' and 'status'.",
+                'missing': missing
+            })
+
+        attrs['department'] = attrs['department'].strip()
+        return attrs
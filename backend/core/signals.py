@@ -0,0 +1,117 @@
+"""
+Signal handlers for HRMS Lite
+"""
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import archive, cache, summary
+from .models import Attendance, Employee
+
+
+TRACKED_ATTENDANCE_FIELDS = ('employee_id', 'date', 'status')
+
+
+def deleted_with_employee(origin):
+    """Whether a delete was cascaded from an Employee delete"""
+    if isinstance(origin, Employee):
+        return True
+    return isinstance(origin, QuerySet) and origin.model is Employee
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_previous_attendance(sender, instance, raw=False, **kwargs):
+    """Make sure updates know the row's previous state, loading it if the instance was not read from the database"""
+    if raw or instance._state.adding:
+        return
+
+    loaded = getattr(instance, '_loaded_values', {})
+    if not all(field in loaded for field in TRACKED_ATTENDANCE_FIELDS):
+        instance._loaded_values = Attendance.objects.filter(pk=instance.pk).values(
+            *TRACKED_ATTENDANCE_FIELDS
+        ).first() or {}
+
+
+@receiver(post_save, sender=Attendance)
+def update_summary_on_attendance_save(sender, instance, created, raw=False, **kwargs):
+    """Count a new mark, or move an edited mark between summary cells"""
+    if raw:
+        return
+
+    department = instance.employee.department_id
+    changes = [(instance.date, department, instance.status, 1)]
+
+    if not created:
+        previous = getattr(instance, '_loaded_values', {})
+        current = {field: getattr(instance, field) for field in TRACKED_ATTENDANCE_FIELDS}
+        if not previous or all(previous.get(field) == current[field] for field in TRACKED_ATTENDANCE_FIELDS):
+            changes = []
+        else:
+            previous_department = department
+            if previous['employee_id'] != instance.employee_id:
+                previous_department = Employee.objects.filter(
+                    pk=previous['employee_id']
+                ).values_list('department_id', flat=True).first()
+            if previous_department is not None:
+                changes.append((previous['date'], previous_department, previous['status'], -1))
+
+    summary.apply_changes(changes)
+    instance._loaded_values = {field: getattr(instance, field) for field in TRACKED_ATTENDANCE_FIELDS}
+
+
+@receiver(post_delete, sender=Attendance)
+def update_summary_on_attendance_delete(sender, instance, origin=None, **kwargs):
+    """Uncount a deleted mark (employee deletes are handled in one go below)"""
+    if deleted_with_employee(origin):
+        return
+
+    summary.apply_changes([(instance.date, instance.employee.department_id, instance.status, -1)])
+
+
+@receiver(post_save, sender=Employee)
+def update_summary_on_employee_save(sender, instance, created, raw=False, **kwargs):
+    """Track headcounts and move an employee's history when their department changes"""
+    if raw:
+        return
+
+    if created:
+        summary.adjust_headcount({instance.department_id: 1})
+    else:
+        previous = getattr(instance, '_loaded_values', {}).get('department_id')
+        if previous is not None and previous != instance.department_id:
+            summary.move_employee(archive.employee_marks(instance), previous, instance.department_id)
+
+    instance._loaded_values = {
+        **getattr(instance, '_loaded_values', {}),
+        'department_id': instance.department_id
+    }
+
+
+@receiver(pre_delete, sender=Employee)
+def update_summary_on_employee_delete(sender, instance, **kwargs):
+    """Uncount all of an employee's marks, live and archived, before they are cascaded away"""
+    marks = archive.employee_marks(instance)
+    summary.apply_changes([(date, instance.department_id, status, -1) for date, status in marks])
+    summary.adjust_headcount({instance.department_id: -1})
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_employee_cache(sender, instance, created=False, raw=False, **kwargs):
+    """Forget the cached lookup of a saved or deleted employee, under its old ID too"""
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    cache.invalidate_employee(*{instance.employee_id, loaded.get('employee_id')} - {None})
+    instance._loaded_values = {**loaded, 'employee_id': instance.employee_id}
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def invalidate_dashboard_cache(sender, origin=None, **kwargs):
+    """Any employee or attendance write can change the dashboard"""
+    if sender is Attendance and deleted_with_employee(origin):
+        return
+    cache.invalidate_dashboard()
@@ -0,0 +1,131 @@
+"""
+Attendance statistics queries for HRMS Lite
+"""
+from django.db.models import Case, Count, F, FilteredRelation, FloatField, Q, Value, When
+from django.db.models.functions import Cast
+from rest_framework.exceptions import ValidationError
+
+from .archive import archived_counts
+from .filters import get_list_param
+from .models import Employee
+
+
+STATS_ORDERING_FIELDS = ('attendance_rate', 'total_days', 'present_days', 'absent_days', 'employee_id')
+
+
+def annotate_attendance_stats(employees, date_from=None, date_to=None):
+    """
+    Annotate an Employee queryset with total_days, present_days, absent_days and
+    attendance_rate, computed by one GROUP BY over the joined attendance rows.
+    A date range is applied in the JOIN condition so only that slice of the
+    (employee, date) index is read. Archived months are added from
+    AttendanceArchive by correlated subqueries in the same statement.
+    """
+    relation = 'attendances'
+    if date_from or date_to:
+        in_range = Q()
+        if date_from:
+            in_range &= Q(attendances__date__gte=date_from)
+        if date_to:
+            in_range &= Q(attendances__date__lte=date_to)
+        employees = employees.annotate(
+            range_attendances=FilteredRelation('attendances', condition=in_range)
+        )
+        relation = 'range_attendances'
+
+    archived_total, archived_present = archived_counts(date_from, date_to)
+    return employees.annotate(
+        total_days=Count(relation) + archived_total,
+        present_days=Count(relation, filter=Q(**{f'{relation}__status': 'Present'})) + archived_present
+    ).annotate(
+        absent_days=F('total_days') - F('present_days'),
+        attendance_rate=Case(
+            When(total_days=0, then=Value(0.0)),
+            default=Cast('present_days', FloatField()) * 100 / F('total_days'),
+            output_field=FloatField()
+        )
+    )
+
+
+def employee_stats_queryset(params, date_from=None, date_to=None):
+    """
+    Per-employee stats rows for the batch stats endpoints, filtered by ids and
+    department and sorted by the ordering parameter (default -attendance_rate)
+    """
+    employees = Employee.objects.all()
+
+    ids = [value.upper() for value in get_list_param(params, 'ids')]
+    if ids:
+        employees = employees.filter(employee_id__in=ids)
+
+    department = params.get('department')
+    if department:
+        employees = employees.filter(department__name__iexact=department.strip())
+
+    ordering = params.get('ordering', '-attendance_rate')
+    if ordering.lstrip('-') not in STATS_ORDERING_FIELDS:
+        raise ValidationError({
+            'ordering': f"Ordering must be one of: {', '.join(STATS_ORDERING_FIELDS)} (prefix '-' for descending)."
+        })
+
+    return annotate_attendance_stats(employees, date_from, date_to).values(
+        'employee_id', 'full_name', 'department__name',
+        'total_days', 'present_days', 'absent_days', 'attendance_rate'
+    ).order_by(ordering, 'pk')
+
+
+def format_stats_row(row):
+    """API representation of one employee_stats_queryset row"""
+    return {
+        'employee_id': row['employee_id'],
+        'employee_name': row['full_name'],
+        'department': row['department__name'],
+        'total_days': row['total_days'],
+        'present_days': row['present_days'],
+        'absent_days': row['absent_days'],
+        'attendance_rate': round(row['attendance_rate'], 2)
+    }
+
+
+def employee_stats(employee_id, date_from=None, date_to=None):
+    """
+    The stats values of one employee by employee ID (take .first() or
+    .afirst()); the lookup and all three counts are one aggregate query
+    """
+    return annotate_attendance_stats(
+        Employee.objects.filter(employee_id=employee_id.upper()), date_from, date_to
+    ).values(
+        'employee_id', 'full_name', 'total_days', 'present_days', 'absent_days', 'attendance_rate'
+    )
+
+
+def format_date_range(date_from, date_to):
+    return {
+        'from': str(date_from) if date_from else None,
+        'to': str(date_to) if date_to else None
+    }
+
+
+def format_employee_stats(stats, date_from=None, date_to=None):
+    """API representation of one employee_stats row"""
+    return {
+        'employee_id': stats['employee_id'],
+        'employee_name': stats['full_name'],
+        **format_date_range(date_from, date_to),
+        'total_days': stats['total_days'],
+        'present_days': stats['present_days'],
+        'absent_days': stats['absent_days'],
+        'attendance_rate': round(stats['attendance_rate'], 2)
+    }
+
+
+def format_stats_page(rows, total, page, page_size, date_from=None, date_to=None):
+    """Response envelope of a page of employee_stats_queryset rows"""
+    return {
+        'success': True,
+        'data': [format_stats_row(row) for row in rows],
+        'count': total,
+        'page': page,
+        'page_size': page_size,
+        **format_date_range(date_from, date_to)
+    }
@@ -0,0 +1,178 @@
+"""
+Incrementally maintained daily attendance summaries for HRMS Lite
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from . import archive, departments
+from .models import Attendance, DailyAttendanceSummary
+
+
+STATUS_FIELDS = {
+    'Present': 'present',
+    'Absent': 'absent',
+}
+REBUILD_BATCH_SIZE = 1000
+
+
+def ensure_rows(keys):
+    """Create any missing (date, department_id) summary rows"""
+    keys = set(keys)
+    existing = set(DailyAttendanceSummary.objects.filter(
+        date__in={date for date, _ in keys},
+        department__in={department for _, department in keys}
+    ).values_list('date', 'department'))
+
+    missing = keys - existing
+    if not missing:
+        return
+
+    headcounts = departments.headcounts({department for _, department in missing})
+    DailyAttendanceSummary.objects.bulk_create([
+        DailyAttendanceSummary(
+            date=date,
+            department_id=department,
+            headcount=headcounts.get(department, 0)
+        )
+        for date, department in missing
+    ], ignore_conflicts=True)
+
+
+def apply_changes(changes):
+    """
+    Apply attendance deltas to the summary table.
+    changes is an iterable of (date, department_id, status, delta) tuples. Deltas are merged
+    per day and department, then written with one UPDATE per distinct
+    (department, present delta, absent delta) group, so a roll call of thousands of
+    marks is a single statement.
+    """
+    deltas = defaultdict(lambda: {'present': 0, 'absent': 0})
+    for date, department, status, delta in changes:
+        deltas[(date, department)][STATUS_FIELDS[status]] += delta
+
+    deltas = {key: value for key, value in deltas.items() if value['present'] or value['absent']}
+    if not deltas:
+        return
+
+    ensure_rows(deltas)
+
+    groups = defaultdict(list)
+    for (date, department), value in deltas.items():
+        groups[(department, value['present'], value['absent'])].append(date)
+
+    for (department, present, absent), dates in groups.items():
+        DailyAttendanceSummary.objects.filter(department=department, date__in=dates).update(
+            present=F('present') + present,
+            absent=F('absent') + absent,
+            updated_at=timezone.now()
+        )
+
+
+def adjust_headcount(department_deltas):
+    """
+    Adjust the headcount counters, and today's summary headcounts, of
+    departments that gained or lost employees ({department_id: delta})
+    """
+    departments.adjust_headcount(department_deltas)
+    today = timezone.now().date()
+    for department, delta in department_deltas.items():
+        if delta:
+            DailyAttendanceSummary.objects.filter(date=today, department=department).update(
+                headcount=F('headcount') + delta,
+                updated_at=timezone.now()
+            )
+
+
+def move_employee(marks, previous, department):
+    """
+    Move one employee's (date, status) marks from the previous department to
+    another, taking their place in those days' headcounts along, and adjust
+    both headcount counters
+    """
+    apply_changes(
+        [(date, previous, status, -1) for date, status in marks] +
+        [(date, department, status, 1) for date, status in marks]
+    )
+
+    # Today's headcounts follow the counters in adjust_headcount
+    dates = {date for date, _ in marks} - {timezone.now().date()}
+    if dates:
+        for department_id, delta in ((previous, -1), (department, 1)):
+            DailyAttendanceSummary.objects.filter(department=department_id, date__in=dates).update(
+                headcount=F('headcount') + delta,
+                updated_at=timezone.now()
+            )
+    adjust_headcount({previous: -1, department: 1})
+
+
+def rebuild(date_from=None, date_to=None):
+    """
+    Recompute summaries from Attendance with one grouped query, plus the
+    archived months. Department headcount counters are recounted from the
+    employee table first. Days that already had a summary row keep their
+    recorded headcount; new rows take the current counter.
+    Returns the number of summary rows written.
+    """
+    attendances = Attendance.objects.all()
+    summaries = DailyAttendanceSummary.objects.all()
+    if date_from:
+        attendances = attendances.filter(date__gte=date_from)
+        summaries = summaries.filter(date__gte=date_from)
+    if date_to:
+        attendances = attendances.filter(date__lte=date_to)
+        summaries = summaries.filter(date__lte=date_to)
+
+    rows = attendances.values('date', 'employee__department').annotate(
+        present=Count('id', filter=Q(status='Present')),
+        absent=Count('id', filter=Q(status='Absent'))
+    ).order_by()
+
+    written = 0
+    with transaction.atomic():
+        departments.recount()
+        headcounts = departments.headcounts()
+        recorded = {
+            (date, department): headcount
+            for date, department, headcount in summaries.values_list('date', 'department', 'headcount')
+        }
+        archived = archive.daily_counts(date_from, date_to)
+        summaries.delete()
+
+        batch = []
+        for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            counts = archived.pop((row['date'], row['employee__department']), {'present': 0, 'absent': 0})
+            batch.append(DailyAttendanceSummary(
+                date=row['date'],
+                department_id=row['employee__department'],
+                present=row['present'] + counts['present'],
+                absent=row['absent'] + counts['absent'],
+                headcount=recorded.get(
+                    (row['date'], row['employee__department']), headcounts.get(row['employee__department'], 0)
+                )
+            ))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                DailyAttendanceSummary.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+
+        for (date, department), counts in archived.items():
+            batch.append(DailyAttendanceSummary(
+                date=date,
+                department_id=department,
+                present=counts['present'],
+                absent=counts['absent'],
+                headcount=recorded.get((date, department), headcounts.get(department, 0))
+            ))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                DailyAttendanceSummary.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+
+        if batch:
+            DailyAttendanceSummary.objects.bulk_create(batch)
+            written += len(batch)
+
+    return written
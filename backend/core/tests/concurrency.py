@@ -0,0 +1,42 @@
+"""
+Shared harness for tests that fire the same request from several threads at once
+"""
+import threading
+from unittest import SkipTest
+
+from django.db import connection, connections
+from django.test import Client, TransactionTestCase
+
+
+class ConcurrentRequestsTestCase(TransactionTestCase):
+    """
+    Runs on PostgreSQL only: SQLite serializes writers, so nothing would race.
+    Each thread uses its own connection, closed when the thread is done.
+    """
+
+    THREADS = 8
+
+    @classmethod
+    def setUpClass(cls):
+        if connection.vendor != 'postgresql':
+            raise SkipTest('needs concurrent writers')
+        super().setUpClass()
+
+    def send_concurrently(self, method, requests):
+        """Send every (url, payload) request from its own thread, all released together; returns the responses"""
+        barrier = threading.Barrier(len(requests))
+        responses = []
+
+        def send(url, payload):
+            try:
+                barrier.wait()
+                responses.append(getattr(Client(), method)(url, payload, content_type='application/json'))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=send, args=request) for request in requests]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
@@ -0,0 +1,131 @@
+"""
+Attendance archiving tests: closed months read the same before and after archiving
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from core import archive, departments, summary
+from core.models import Attendance, AttendanceArchive, DailyAttendanceSummary, Employee
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[], ATTENDANCE_OPEN_MONTHS=1)
+class AttendanceArchiveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employees = Employee.objects.bulk_create([
+            Employee(
+                employee_id=f'EMP{index:03d}',
+                full_name=f'Employee {index}',
+                email=f'emp{index:03d}@example.com',
+                department=departments.get('IT' if index % 2 else 'HR')
+            )
+            for index in range(3)
+        ])
+        cls.cutoff = archive.closed_before()
+        # Four months or so of closed attendance and the open ones, with a few days missing
+        first = cls.cutoff - timedelta(days=120)
+        days = [first + timedelta(days=offset) for offset in range(130) if offset % 7 != 3]
+        Attendance.objects.bulk_create([
+            Attendance(employee=employee, date=day, status='Absent' if (day.day + index) % 3 == 0 else 'Present')
+            for index, employee in enumerate(cls.employees)
+            for day in days
+        ])
+        summary.rebuild()
+
+    def snapshot(self):
+        """Stats, exports and summaries for a few date ranges"""
+        ranges = [
+            {},
+            {'from': str(self.cutoff - timedelta(days=75)), 'to': str(self.cutoff - timedelta(days=20))},
+            {'from': str(self.cutoff - timedelta(days=40)), 'to': str(self.cutoff + timedelta(days=5))},
+        ]
+        result = []
+        for params in ranges:
+            result.append(self.client.get('/api/stats/employees/', params).data['data'])
+            result.append(self.client.get('/api/employees/EMP001/stats/', params).data['data'])
+            export = {key.replace('from', 'date_from').replace('to', 'date_to'): value for key, value in params.items()}
+            for extra in [{}, {'status': 'Absent'}, {'department': 'HR'}]:
+                response = self.client.get('/api/attendance/export/', {**export, **extra, 'output': 'csv'})
+                # Rows of one day may come in a different order once archived
+                result.append(sorted(b''.join(response.streaming_content).splitlines()))
+        result.append(list(DailyAttendanceSummary.objects.order_by('date', 'department__name').values_list(
+            'date', 'department__name', 'present', 'absent'
+        )))
+        return result
+
+    def test_archiving_keeps_stats_and_exports(self):
+        before = self.snapshot()
+        months = archive.archivable_months(self.cutoff)
+        self.assertGreaterEqual(len(months), 4)
+
+        out = StringIO()
+        call_command('archive_attendance', stdout=out)
+        self.assertFalse(Attendance.objects.filter(date__lt=self.cutoff).exists())
+        self.assertTrue(Attendance.objects.filter(date__gte=self.cutoff).exists())
+        self.assertEqual(AttendanceArchive.objects.count(), 3 * len(months))
+        self.assertIn('Archived', out.getvalue())
+
+        self.assertEqual(self.snapshot(), before)
+        summary.rebuild()
+        self.assertEqual(self.snapshot(), before)
+
+    def test_archive_is_idempotent(self):
+        call_command('archive_attendance', stdout=StringIO())
+        archived = list(AttendanceArchive.objects.values_list('employee', 'month', 'present_mask', 'known_mask'))
+        out = StringIO()
+        call_command('archive_attendance', stdout=out)
+        self.assertIn('Archived 0 attendance rows from 0 months.', out.getvalue())
+        self.assertEqual(
+            list(AttendanceArchive.objects.values_list('employee', 'month', 'present_mask', 'known_mask')), archived
+        )
+
+    def test_export_stays_ordered_by_date(self):
+        call_command('archive_attendance', stdout=StringIO())
+        response = self.client.get('/api/attendance/export/', {'output': 'csv'})
+        dates = [line.split(b',')[3] for line in b''.join(response.streaming_content).splitlines()[1:]]
+        self.assertEqual(len(dates), Attendance.objects.count() + sum(
+            bin(known).count('1') for known in AttendanceArchive.objects.values_list('known_mask', flat=True)
+        ))
+        self.assertEqual(dates, sorted(dates))
+
+    def test_closed_months_are_read_only(self):
+        closed_day = self.cutoff - timedelta(days=1)
+        response = self.client.post('/api/attendance/', {
+            'employee_id': 'EMP000', 'date': str(closed_day), 'status': 'Present'
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        attendance = Attendance.objects.filter(date=closed_day).first()
+        response = self.client.put(
+            f'/api/attendance/{attendance.pk}/', {'status': 'Absent'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.delete(f'/api/attendance/{attendance.pk}/')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Attendance.objects.filter(pk=attendance.pk).exists())
+
+    def test_employee_delete_uncounts_archived_days(self):
+        call_command('archive_attendance', stdout=StringIO())
+        Employee.objects.get(employee_id='EMP001').delete()
+        self.assertFalse(AttendanceArchive.objects.filter(employee__employee_id='EMP001').exists())
+
+        counted = list(DailyAttendanceSummary.objects.order_by('date', 'department__name').values_list(
+            'date', 'department__name', 'present', 'absent'
+        ))
+        summary.rebuild()
+        rebuilt = list(DailyAttendanceSummary.objects.order_by('date', 'department__name').values_list(
+            'date', 'department__name', 'present', 'absent'
+        ))
+        self.assertEqual(
+            [row for row in counted if row[2] or row[3]],
+            [row for row in rebuilt if row[2] or row[3]]
+        )
+
+    def test_before_must_be_closed(self):
+        with self.assertRaises(CommandError):
+            call_command('archive_attendance', before=str(self.cutoff + timedelta(days=40)), stdout=StringIO())
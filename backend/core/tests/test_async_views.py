@@ -0,0 +1,62 @@
+"""
+Async view tests: every /api/async/ endpoint answers exactly like its sync counterpart
+"""
+import json
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import departments
+from core.models import Attendance, Employee
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class AsyncViewParityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employees = Employee.objects.bulk_create([
+            Employee(
+                employee_id=f'EMP{index:03d}',
+                full_name=f'Employee {index}',
+                email=f'emp{index:03d}@example.com',
+                department=departments.get('IT' if index % 2 else 'HR')
+            )
+            for index in range(5)
+        ])
+        today = timezone.now().date()
+        Attendance.objects.bulk_create([
+            Attendance(employee=employee, date=today - timedelta(days=day), status='Present' if day % 3 else 'Absent')
+            for employee in employees
+            for day in range(4)
+        ])
+
+    def get_both(self, path, params=None):
+        sync = self.client.get(f'/api{path}', params)
+        mirrored = self.client.get(f'/api/async{path}', params)
+        self.assertEqual(mirrored.status_code, sync.status_code)
+        return sync, mirrored
+
+    def test_same_bodies(self):
+        requests = [
+            ('/employees/', {'page_size': 2}),
+            ('/employees/', {'page': 2, 'page_size': 2, 'fields': 'employee_id,full_name'}),
+            ('/employees/', {'count': 'exact', 'fields': 'employee_id,department'}),
+            ('/attendance/', {'status': 'Absent', 'count': 'exact'}),
+            ('/attendance/', {'page_size': 3}),
+            ('/employees/EMP001/stats/', None),
+            ('/stats/employees/', {'department': 'it', 'ordering': 'employee_id'}),
+            ('/attendance/', {'count': 'bogus'}),
+        ]
+        for path, params in requests:
+            with self.subTest(path=path, params=params):
+                sync, mirrored = self.get_both(path, params)
+                self.assertEqual(json.loads(mirrored.content), json.loads(sync.content))
+                # ETags hash the request path, so only their presence can match
+                self.assertEqual(mirrored.has_header('ETag'), sync.has_header('ETag'))
+
+    def test_not_modified(self):
+        etag = self.client.get('/api/async/attendance/')['ETag']
+        response = self.client.get('/api/async/attendance/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,126 @@
+"""
+Idempotent attendance marking tests (PUT /api/attendance/<employee_id>/<date>/)
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import archive, departments
+from core.models import Attendance, DailyAttendanceSummary, Employee
+from core.tests.concurrency import ConcurrentRequestsTestCase
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class AttendanceMarkTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create(
+            employee_id='EMP001', full_name='Test Employee', email='emp001@example.com', department=departments.get('IT')
+        )
+        cls.today = timezone.now().date()
+
+    def mark(self, status, employee_id='emp001', day=None):
+        return self.client.put(
+            f'/api/attendance/{employee_id}/{day or self.today}/', {'status': status}, content_type='application/json'
+        )
+
+    def summary_counts(self):
+        return DailyAttendanceSummary.objects.filter(date=self.today, department__name='IT').values_list(
+            'present', 'absent'
+        ).first()
+
+    def test_create_repeat_and_correct(self):
+        response = self.mark('Present')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['result'], 'created')
+        self.assertEqual(response.data['data']['employee_emp_id'], 'EMP001')
+        self.assertEqual(self.summary_counts(), (1, 0))
+
+        # A retry is a no-op and reports the same row
+        with self.assertNumQueries(3):  # savepoint, upsert, release
+            retry = self.mark('Present')
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.data['result'], 'unchanged')
+        self.assertEqual(retry.data['data'], response.data['data'])
+
+        corrected = self.mark('Absent')
+        self.assertEqual(corrected.data['result'], 'updated')
+        self.assertEqual(corrected.data['data']['id'], response.data['data']['id'])
+        self.assertEqual(Attendance.objects.get().status, 'Absent')
+        self.assertEqual(self.summary_counts(), (0, 1))
+
+    def test_results_do_not_depend_on_the_clock(self):
+        # Marks written within the same clock tick are still told apart
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now()):
+            self.assertEqual(self.mark('Present').data['result'], 'created')
+            self.assertEqual(self.mark('Absent').data['result'], 'updated')
+            self.assertEqual(self.mark('Absent').data['result'], 'unchanged')
+            self.assertEqual(self.mark('Present').data['result'], 'updated')
+        self.assertEqual(self.summary_counts(), (1, 0))
+
+    def test_unknown_employee(self):
+        response = self.mark('Present', employee_id='NOPE')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Attendance.objects.exists())
+
+    @override_settings(ATTENDANCE_OPEN_MONTHS=1)
+    def test_invalid_marks(self):
+        self.assertEqual(self.mark('Late').status_code, 400)
+        self.assertEqual(self.mark('Present', day='not-a-date').status_code, 400)
+        self.assertEqual(self.mark('Present', day=self.today + timedelta(days=1)).status_code, 400)
+        self.assertEqual(self.mark('Present', day=archive.closed_before() - timedelta(days=1)).status_code, 400)
+
+        response = self.client.put(f'/api/attendance/EMP001/{self.today}/', [1, 2], content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('non_field_errors', response.data['error'])
+        self.assertFalse(Attendance.objects.exists())
+
+    @override_settings(ATTENDANCE_OPEN_MONTHS=None)
+    def test_months_never_close_without_setting(self):
+        old_day = self.today - timedelta(days=3 * 365)
+        self.assertEqual(self.mark('Present', day=old_day).status_code, 201)
+        attendance = Attendance.objects.get()
+        response = self.client.delete(f'/api/attendance/{attendance.pk}/')
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class ConcurrentMarkTests(ConcurrentRequestsTestCase):
+    """Several kiosks marking the same employee at once"""
+
+    def create_employee(self):
+        return Employee.objects.create(
+            employee_id='EMP001', full_name='Test Employee', email='emp001@example.com', department=departments.get('IT')
+        )
+
+    def summary_counts(self):
+        return DailyAttendanceSummary.objects.filter(date=timezone.now().date()).values_list('present', 'absent').get()
+
+    def test_concurrent_marks_write_one_row(self):
+        self.create_employee()
+        today = timezone.now().date()
+        responses = self.send_concurrently(
+            'put', [(f'/api/attendance/EMP001/{today}/', {'status': 'Present'})] * self.THREADS
+        )
+        results = [(response.status_code, response.data.get('result')) for response in responses]
+
+        self.assertEqual(sorted(results), [(200, 'unchanged')] * (self.THREADS - 1) + [(201, 'created')])
+        self.assertEqual(Attendance.objects.count(), 1)
+        self.assertEqual(self.summary_counts(), (1, 0))
+
+    def test_concurrent_edits_move_the_mark_once(self):
+        attendance = Attendance.objects.create(
+            employee=self.create_employee(), date=timezone.now().date(), status='Present'
+        )
+        url = f'/api/attendance/{attendance.pk}/'
+
+        responses = self.send_concurrently('put', [(url, {'status': 'Absent'})] * self.THREADS)
+        self.assertEqual([response.status_code for response in responses], [200] * self.THREADS)
+        self.assertEqual(self.summary_counts(), (0, 1))
+
+        responses = self.send_concurrently('delete', [(url, None)] * self.THREADS)
+        self.assertEqual(sorted(response.status_code for response in responses), [200] + [404] * (self.THREADS - 1))
+        self.assertEqual(self.summary_counts(), (0, 0))
@@ -0,0 +1,81 @@
+"""
+Bulk attendance tests (POST /api/attendance/bulk/): per-row results and the daily summaries they leave behind
+"""
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import departments
+from core.models import Attendance, DailyAttendanceSummary, Employee
+from core.tests.concurrency import ConcurrentRequestsTestCase
+
+
+EMPLOYEES = 5
+
+
+def create_employees():
+    it = departments.get('IT')
+    for index in range(EMPLOYEES):
+        Employee.objects.create(
+            employee_id=f'EMP{index:03d}', full_name=f'Employee {index}', email=f'emp{index}@example.com', department=it
+        )
+
+
+def roll_call(status, upsert=True):
+    return {'department': 'IT', 'date': str(timezone.now().date()), 'status': status, 'upsert': upsert}
+
+
+def summary_counts():
+    return DailyAttendanceSummary.objects.filter(date=timezone.now().date()).values_list('present', 'absent').get()
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class BulkAttendanceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_employees()
+
+    def post(self, payload):
+        response = self.client.post('/api/attendance/bulk/', payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data['data']['summary']
+
+    def test_upsert_results(self):
+        Attendance.objects.create(employee=Employee.objects.get(employee_id='EMP000'), date=timezone.now().date(),
+                                  status='Absent')
+        Attendance.objects.create(employee=Employee.objects.get(employee_id='EMP001'), date=timezone.now().date(),
+                                  status='Present')
+
+        summary = self.post(roll_call('Present'))
+        self.assertEqual((summary['created'], summary['updated'], summary['unchanged']), (EMPLOYEES - 2, 1, 1))
+        self.assertEqual(summary_counts(), (EMPLOYEES, 0))
+
+        summary = self.post(roll_call('Present'))
+        self.assertEqual(summary['unchanged'], EMPLOYEES)
+        self.assertEqual(summary_counts(), (EMPLOYEES, 0))
+
+    def test_existing_marks_are_errors_without_upsert(self):
+        self.post(roll_call('Present'))
+        summary = self.post(roll_call('Absent', upsert=False))
+        self.assertEqual(summary['error'], EMPLOYEES)
+        self.assertEqual(summary_counts(), (EMPLOYEES, 0))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class ConcurrentRollCallTests(ConcurrentRequestsTestCase):
+    """Several supervisors upserting the same department's roll call at once"""
+
+    def test_concurrent_roll_calls_count_each_mark_once(self):
+        create_employees()
+        statuses = ['Present', 'Absent'] * (self.THREADS // 2)
+        responses = self.send_concurrently(
+            'post', [('/api/attendance/bulk/', roll_call(status)) for status in statuses]
+        )
+        self.assertEqual([response.status_code for response in responses], [200] * self.THREADS)
+
+        created = sum(response.data['data']['summary']['created'] for response in responses)
+        self.assertEqual(created, EMPLOYEES)
+        self.assertEqual(summary_counts(), (
+            Attendance.objects.filter(status='Present').count(),
+            Attendance.objects.filter(status='Absent').count()
+        ))
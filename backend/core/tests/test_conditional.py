@@ -0,0 +1,97 @@
+"""
+Conditional GET tests: ETag and Last-Modified on detail endpoints, page ETags on list endpoints
+"""
+from datetime import timedelta
+
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+
+from core import departments
+from core.models import Attendance, Employee
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class ConditionalGetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        it = departments.get('IT')
+        cls.employees = [
+            Employee.objects.create(
+                employee_id=f'EMP{index:03d}', full_name=f'Employee {index}', email=f'emp{index}@example.com',
+                department=it
+            )
+            for index in range(3)
+        ]
+        cls.attendance = Attendance.objects.create(
+            employee=cls.employees[0], date=timezone.now().date(), status='Present'
+        )
+
+    def age(self, model, pk, seconds=5):
+        """Push a row's updated_at forward, past the one-second resolution of Last-Modified"""
+        model.objects.filter(pk=pk).update(updated_at=F('updated_at') + timedelta(seconds=seconds))
+
+    def test_detail_last_modified(self):
+        for url in (f'/api/employees/{self.employees[0].pk}/', f'/api/attendance/{self.attendance.pk}/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Cache-Control'], 'no-cache')
+                last_modified = response['Last-Modified']
+
+                cached = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached['ETag'], response['ETag'])
+
+                earlier = http_date(timezone.now().timestamp() - 3600)
+                self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=earlier).status_code, 200)
+
+                # If-None-Match wins over a matching If-Modified-Since
+                stale = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"', HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(stale.status_code, 200)
+
+    def test_detail_validators_follow_related_rows(self):
+        url = f'/api/attendance/{self.attendance.pk}/'
+        response = self.client.get(url)
+
+        # The attendance shows the employee's name, so an employee edit changes both validators
+        self.age(Employee, self.employees[0].pk)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+        changed = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=changed['ETag']).status_code, 304)
+
+    def test_list_etag_follows_the_page(self):
+        url = '/api/employees/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        response = self.client.put(
+            f'/api/employees/{self.employees[1].pk}/', {'full_name': 'Renamed'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        edited = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(edited.status_code, 200)
+        self.assertNotEqual(edited['ETag'], etag)
+
+        self.client.delete(f'/api/employees/{self.employees[2].pk}/')
+        deleted = self.client.get(url, HTTP_IF_NONE_MATCH=edited['ETag'])
+        self.assertEqual(deleted.status_code, 200)
+        self.assertNotEqual(deleted['ETag'], edited['ETag'])
+
+    def test_attendance_list_etag_follows_the_page(self):
+        url = '/api/attendance/'
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.put(
+            f'/api/attendance/{self.attendance.pk}/', {'status': 'Absent'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        edited = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(edited.status_code, 200)
+
+        self.client.delete(f'/api/attendance/{self.attendance.pk}/')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=edited['ETag']).status_code, 200)
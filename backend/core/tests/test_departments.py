@@ -0,0 +1,144 @@
+"""
+Department tests: names match regardless of case and headcount counters follow every employee write
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import dashboard, departments, summary
+from core.models import Attendance, DailyAttendanceSummary, Department, Employee
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class DepartmentTests(TestCase):
+
+    def create(self, employee_id, department):
+        response = self.client.post('/api/employees/', {
+            'employee_id': employee_id,
+            'full_name': f'Employee {employee_id}',
+            'email': f'{employee_id.lower()}@example.com',
+            'department': department
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['data']
+
+    def headcounts(self):
+        return dict(Department.objects.values_list('name', 'headcount'))
+
+    def test_names_ignore_case(self):
+        it = departments.get('IT')
+        self.assertEqual(departments.resolve(['it', 'It']), {'it': it, 'It': it})
+        self.assertEqual(Department.objects.count(), 1)
+
+        employee = self.create('EMP001', 'it')
+        self.assertEqual(employee['department'], 'IT')
+
+    def test_headcount_follows_writes(self):
+        self.create('EMP001', 'IT')
+        employee = self.create('EMP002', 'it')
+        self.assertEqual(self.headcounts(), {'IT': 2})
+
+        response = self.client.put(
+            f"/api/employees/{employee['id']}/", {'department': 'HR'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['data']['department'], 'HR')
+        self.assertEqual(self.headcounts(), {'IT': 1, 'HR': 1})
+
+        self.client.delete(f"/api/employees/{employee['id']}/")
+        self.assertEqual(self.headcounts(), {'IT': 1, 'HR': 0})
+        self.assertEqual(dashboard.total_employees(), Employee.objects.count())
+
+    def mark_yesterday(self, *employee_ids):
+        yesterday = timezone.now().date() - timedelta(days=1)
+        for employee_id in employee_ids:
+            response = self.client.put(
+                f'/api/attendance/{employee_id}/{yesterday}/', {'status': 'Present'}, content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 201, response.data)
+        return yesterday
+
+    def trend(self, department, day):
+        response = self.client.get('/api/dashboard/trend/', {'department': department, 'from': day, 'to': day})
+        return [(row['present'], row['headcount'], row['attendance_rate']) for row in response.data['data']]
+
+    def test_rebuild_keeps_recorded_headcounts(self):
+        self.create('EMP001', 'IT')
+        self.create('EMP002', 'IT')
+        yesterday = self.mark_yesterday('EMP001', 'EMP002')
+        for index in range(3, 8):
+            self.create(f'EMP{index:03d}', 'IT')
+
+        call_command('rebuild_attendance_summary', stdout=StringIO())
+        self.assertEqual(self.trend('IT', yesterday), [(2, 2, 100.0)])
+
+        # Days first seen by the rebuild take the current counter
+        self.client.delete(f"/api/attendance/{Attendance.objects.filter(date=yesterday).first().pk}/")
+        DailyAttendanceSummary.objects.all().delete()
+        summary.rebuild()
+        self.assertEqual(self.trend('IT', yesterday), [(1, 7, 14.29)])
+
+    def test_moved_marks_take_their_headcount_along(self):
+        self.create('EMP001', 'IT')
+        employee = self.create('EMP002', 'IT')
+        yesterday = self.mark_yesterday('EMP001', 'EMP002')
+
+        response = self.client.put(
+            f"/api/employees/{employee['id']}/", {'department': 'HR'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.trend('IT', yesterday), [(1, 1, 100.0)])
+        self.assertEqual(self.trend('HR', yesterday), [(1, 1, 100.0)])
+        self.assertEqual(self.headcounts(), {'IT': 1, 'HR': 1})
+
+    def test_import_counts_employees(self):
+        body = 'employee_id,full_name,email,department\n' + ''.join(
+            f'EMP{index:03d},Employee {index},emp{index}@example.com,{department}\n'
+            for index, department in enumerate(['Sales', 'sales', 'Finance'])
+        )
+        response = self.client.post('/api/employees/import/', body, content_type='text/csv')
+        self.assertEqual(response.data['data']['created'], 3)
+        self.assertEqual(self.headcounts(), {'Sales': 2, 'Finance': 1})
+
+        Department.objects.update(headcount=0)
+        summary.rebuild()
+        self.assertEqual(self.headcounts(), {'Sales': 2, 'Finance': 1})
+
+    def test_import_skips_departments_of_rejected_rows(self):
+        self.create('EMP001', 'IT')
+        body = (
+            'employee_id,full_name,email,department\n'
+            'EMP001,Duplicate,dup@example.com,Legal\n'
+            'EMP002,Taken Email,emp001@example.com,Research\n'
+            'EMP003,New Employee,emp003@example.com,Finance\n'
+        )
+        response = self.client.post('/api/employees/import/', body, content_type='text/csv')
+        self.assertEqual((response.data['data']['created'], response.data['data']['failed']), (1, 2))
+        self.assertEqual(self.headcounts(), {'IT': 1, 'Finance': 1})
+
+    def test_filters_ignore_case(self):
+        self.create('EMP001', 'IT')
+        self.create('EMP002', 'HR')
+        response = self.client.get('/api/stats/employees/', {'department': 'it'})
+        self.assertEqual([row['employee_id'] for row in response.data['data']], ['EMP001'])
+        self.assertEqual(response.data['data'][0]['department'], 'IT')
+
+    def test_department_list(self):
+        self.create('EMP001', 'IT')
+        self.create('EMP002', 'IT')
+        self.create('EMP003', 'HR')
+        today = str(timezone.now().date())
+        self.client.post('/api/attendance/bulk/', {
+            'department': 'it', 'date': today, 'status': 'Present'
+        }, content_type='application/json')
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/departments/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [
+            {'id': departments.get('HR').pk, 'name': 'HR', 'headcount': 1, 'present_today': 0, 'absent_today': 0},
+            {'id': departments.get('IT').pk, 'name': 'IT', 'headcount': 2, 'present_today': 2, 'absent_today': 0},
+        ])
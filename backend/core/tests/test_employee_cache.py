@@ -0,0 +1,75 @@
+"""
+Employee lookup cache tests: attendance writes skip the employee SELECT once it is cached
+"""
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import cache, departments
+from core.models import Attendance, Employee
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class EmployeeCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create(
+            employee_id='EMP001', full_name='Test Employee', email='emp001@example.com', department=departments.get('IT')
+        )
+        cls.today = timezone.now().date()
+
+    def setUp(self):
+        cache.employee_lru.clear()
+
+    def mark(self, employee_id='emp001'):
+        return self.client.post('/api/attendance/', {
+            'employee_id': employee_id, 'date': str(self.today), 'status': 'Present'
+        }, content_type='application/json')
+
+    def test_second_write_skips_lookup(self):
+        self.assertEqual(self.mark().status_code, 201)
+        Attendance.objects.all().delete()
+
+        hits = cache.employee_stats.hits
+        with self.assertNumQueries(5):  # savepoint, INSERT, summary SELECT and UPDATE, release
+            response = self.mark()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['employee_emp_id'], 'EMP001')
+        self.assertEqual(response.data['data']['employee_name'], 'Test Employee')
+        self.assertEqual(cache.employee_stats.hits, hits + 1)
+
+    def test_unknown_employee_is_not_cached(self):
+        self.assertEqual(self.mark('EMP002').status_code, 400)
+        Employee.objects.create(
+            employee_id='EMP002', full_name='New Employee', email='emp002@example.com', department=departments.get('HR')
+        )
+        self.assertEqual(self.mark('EMP002').status_code, 201)
+
+    def test_update_and_delete_invalidate(self):
+        self.mark()
+        self.client.put(
+            f'/api/employees/{self.employee.pk}/', {'employee_id': 'EMP009', 'department': 'HR'},
+            content_type='application/json'
+        )
+        self.assertIsNone(cache.employee_lru.get('EMP001'))
+        Attendance.objects.all().delete()
+        self.assertEqual(self.mark().status_code, 400)
+
+        self.assertEqual(self.mark('EMP009').status_code, 201)
+        self.assertEqual(cache.employee_lru.get('EMP009')[3], departments.get('HR').pk)
+
+        Employee.objects.get(pk=self.employee.pk).delete()
+        self.assertIsNone(cache.employee_lru.get('EMP009'))
+        self.assertEqual(self.mark('EMP009').status_code, 400)
+
+    def test_lru_evicts_least_recently_used(self):
+        lru = cache.LRUCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+
+        expired = cache.LRUCache(maxsize=2, ttl=-1)
+        expired.set('a', 1)
+        self.assertIsNone(expired.get('a'))
@@ -0,0 +1,139 @@
+"""
+Employee import tests: chunked writes, duplicate handling, error reporting and the import_employees command
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core import departments
+from core.importers import EmployeeImporter, read_records
+from core.models import Department, Employee
+
+
+def csv_body(*rows):
+    return 'employee_id,full_name,email,department\n' + ''.join(f'{",".join(row)}\n' for row in rows)
+
+
+def employee_row(index, department='IT'):
+    return (f'EMP{index:03d}', f'Employee {index}', f'emp{index}@example.com', department)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class EmployeeImportTests(TestCase):
+
+    def post(self, body, content_type='text/csv', chunk_size=None):
+        url = '/api/employees/import/' + (f'?chunk_size={chunk_size}' if chunk_size else '')
+        response = self.client.post(url, body, content_type=content_type)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data['data']
+
+    def error_lines(self, report):
+        return [error['line'] for error in report['errors']]
+
+    def test_rows_are_written_in_chunks(self):
+        # Line 7 repeats the ID of line 2, which an earlier chunk wrote
+        rows = [employee_row(index) for index in range(1, 8)]
+        rows[5] = ('EMP001', 'Again', 'again@example.com', 'IT')
+
+        with CaptureQueriesContext(connection) as queries:
+            report = self.post(csv_body(*rows), chunk_size=3)
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "employees"')]
+        self.assertEqual(len(inserts), 3)
+
+        self.assertEqual((report['processed'], report['created'], report['failed']), (7, 6, 1))
+        self.assertEqual(report['errors'], [{'line': 7, 'errors': {'employee_id': ['Employee ID already exists.']}}])
+        self.assertEqual(Department.objects.get(name='IT').headcount, 6)
+
+    def test_duplicates_within_a_file(self):
+        report = self.post(csv_body(
+            employee_row(1),
+            ('emp001', 'Same ID', 'other@example.com', 'IT'),
+            ('EMP002', 'Same Email', 'Emp1@Example.com', 'IT'),
+            employee_row(3),
+        ))
+        self.assertEqual((report['created'], report['failed']), (2, 2))
+        self.assertEqual(report['errors'], [
+            {'line': 3, 'errors': {'employee_id': ['Employee ID already exists.']}},
+            {'line': 4, 'errors': {'email': ['Email already exists.']}},
+        ])
+        self.assertEqual(sorted(Employee.objects.values_list('employee_id', flat=True)), ['EMP001', 'EMP003'])
+
+    def test_rows_are_retried_one_by_one_after_a_conflict(self):
+        Employee.objects.create(
+            employee_id='EMP001', full_name='Existing', email='existing@example.com', department=departments.get('IT')
+        )
+        # A concurrent writer commits EMP001 after the duplicate check ran
+        with mock.patch.object(Employee.objects, 'filter', side_effect=lambda **kwargs: Employee.objects.none()):
+            report = self.post(csv_body(employee_row(1), employee_row(2), employee_row(3, 'HR')))
+
+        self.assertEqual((report['created'], report['failed']), (2, 1))
+        self.assertEqual(report['errors'], [{'line': 2, 'errors': {'detail': 'Employee ID or email already exists.'}}])
+        self.assertEqual(Employee.objects.count(), 3)
+        self.assertEqual(dict(Department.objects.values_list('name', 'headcount')), {'IT': 2, 'HR': 1})
+
+    def test_reported_errors_are_capped(self):
+        rows = [(f'X{index}', 'Bad', 'not-an-email', 'IT') for index in range(5)]
+        with mock.patch('core.importers.MAX_REPORTED_ERRORS', 2):
+            report = self.post(csv_body(*rows))
+        self.assertEqual((report['processed'], report['failed']), (5, 5))
+        self.assertEqual(self.error_lines(report), [2, 3])
+        self.assertTrue(report['errors_truncated'])
+
+    def test_json_lines(self):
+        body = '\n'.join([
+            json.dumps(dict(zip(('employee_id', 'full_name', 'email', 'department'), employee_row(1)))),
+            '{"employee_id": ',
+            '["EMP002"]',
+            '',
+            json.dumps({'employee_id': 'EMP003', 'full_name': 'No Email', 'department': 'IT'}),
+        ])
+        report = self.post(body, content_type='application/x-ndjson')
+        self.assertEqual((report['processed'], report['created'], report['failed']), (4, 1, 3))
+        self.assertEqual(self.error_lines(report), [2, 3, 5])
+        self.assertTrue(report['errors'][0]['errors']['detail'].startswith('Invalid JSON'))
+        self.assertEqual(report['errors'][1]['errors'], {'detail': 'Each line must be a JSON object.'})
+        self.assertIn('email', report['errors'][2]['errors'])
+
+    def test_importer_reads_records(self):
+        lines = csv_body(employee_row(1), employee_row(2)).splitlines(keepends=True)
+        report = EmployeeImporter(chunk_size=1).run(read_records(lines, 'csv'))
+        self.assertEqual((report['created'], report['errors_truncated']), (2, False))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class ImportEmployeesCommandTests(TestCase):
+
+    def write(self, suffix, text):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w') as f:
+            f.write(text)
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def test_imports_a_file(self):
+        path = self.write('.csv', csv_body(employee_row(1), employee_row(1), employee_row(2)))
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_employees', path, '--chunk-size', '1', stdout=stdout, stderr=stderr)
+
+        self.assertIn('Processed 3 rows: 2 imported, 1 failed.', stdout.getvalue())
+        self.assertIn('Line 3:', stderr.getvalue())
+        self.assertEqual(Employee.objects.count(), 2)
+
+    def test_format_and_chunk_size(self):
+        path = self.write('.txt', '')
+        with self.assertRaisesMessage(CommandError, 'Cannot guess the format'):
+            call_command('import_employees', path)
+
+        jsonl = json.dumps(dict(zip(('employee_id', 'full_name', 'email', 'department'), employee_row(1))))
+        call_command('import_employees', self.write('.txt', jsonl), '--format', 'jsonl', stdout=StringIO())
+        self.assertTrue(Employee.objects.filter(employee_id='EMP001').exists())
+
+        with self.assertRaisesMessage(CommandError, '--chunk-size must be a positive integer.'):
+            call_command('import_employees', path, '--format', 'csv', '--chunk-size', '0')
@@ -0,0 +1,91 @@
+"""
+Index usage tests for the attendance list filters and the list endpoints
+"""
+import re
+
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.filters import filter_attendance
+from core.models import Attendance
+
+
+# A full-table scan: PostgreSQL "Seq Scan on attendances", SQLite "SCAN attendances"
+# without a "USING ... INDEX" clause
+SEQUENTIAL_SCAN = re.compile(r'Seq Scan on attendances|SCAN attendances(?! USING)')
+LIST_SEQUENTIAL_SCAN = re.compile(r'Seq Scan on (attendances|employees)|SCAN (attendances|employees)(?! USING)')
+
+FILTER_COMBINATIONS = [
+    'date=2024-01-15',
+    'date_from=2024-01-01&date_to=2024-01-31',
+    'employee_id=EMP001',
+    'employee_id=EMP001&date_from=2024-01-01&date_to=2024-01-31',
+    'department=IT&date_from=2024-01-01&date_to=2024-01-31',
+    'status=Absent',
+    'status=Absent&date_from=2024-01-01&date_to=2024-01-31',
+    'status=Present&date_from=2024-01-01&date_to=2024-01-31',
+    'status=Present,Absent&date=2024-01-15',
+]
+
+
+class AttendanceFilterIndexTests(TestCase):
+    """Every common attendance filter combination must be answered from an index"""
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables make sequential scans look cheapest; ask whether an index can be used at all
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def test_list_queries_use_indexes(self):
+        for params in FILTER_COMBINATIONS:
+            with self.subTest(params=params):
+                queryset = filter_attendance(
+                    Attendance.objects.select_related('employee'), QueryDict(params)
+                ).order_by('-date', '-id')[:51]
+                plan = self.explain(queryset)
+                self.assertIsNone(SEQUENTIAL_SCAN.search(plan), plan)
+
+    def test_count_queries_use_indexes(self):
+        for params in FILTER_COMBINATIONS:
+            with self.subTest(params=params):
+                queryset = filter_attendance(Attendance.objects.all(), QueryDict(params))
+                plan = self.explain(queryset)
+                self.assertIsNone(SEQUENTIAL_SCAN.search(plan), plan)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class ListEndpointIndexTests(TestCase):
+    """A list page, conditional or not, reads only its own rows from an index"""
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}')
+            else:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return '\n'.join(str(row) for row in cursor.fetchall())
+
+    def test_list_requests_read_only_the_page(self):
+        urls = [
+            '/api/employees/',
+            '/api/employees/?fields=employee_id,full_name',
+            '/api/attendance/',
+            '/api/attendance/?department=IT&date_from=2024-01-01&date_to=2024-01-31',
+            '/api/attendance/?status=Absent',
+        ]
+        for url in urls:
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(queries), 1)
+                sql = queries[0]['sql']
+                # The validator comes from the page itself, not from an aggregate over the filtered set
+                self.assertIn('LIMIT', sql)
+                self.assertNotRegex(sql, r'\b(COUNT|MAX)\(')
+                plan = self.explain(sql)
+                self.assertIsNone(LIST_SEQUENTIAL_SCAN.search(plan), plan)
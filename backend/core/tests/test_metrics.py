@@ -0,0 +1,126 @@
+"""
+Prometheus metrics tests: merging the per-process files in METRICS_DIR and the text exposition format
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import skipUnless
+
+from django.test import SimpleTestCase
+
+from core import metrics
+
+
+LABELS = {'route': 'employee-list', 'method': 'GET'}
+REQUESTS = metrics.series_key('hrms_http_requests_total', {**LABELS, 'status': '200'})
+QUERIES = metrics.series_key('hrms_db_queries_per_request', LABELS)
+IN_FLIGHT = metrics.series_key('hrms_http_requests_in_flight', {})
+
+
+class MultiProcessCollectorTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.collector = metrics.MultiProcessCollector(self.directory, flush_interval=3600)
+        self.collector.inc('hrms_http_requests_total', {**LABELS, 'status': '200'})
+        self.collector.observe('hrms_db_queries_per_request', LABELS, 1, metrics.QUERY_BUCKETS)
+
+    def write_process(self, pid, start, requests=5, in_flight=2):
+        """Leave the metrics file of another worker in the directory"""
+        buckets = [0] * (len(metrics.QUERY_BUCKETS) + 1)
+        buckets[3] = requests
+        path = os.path.join(self.directory, f'{pid}-1.json')
+        metrics.write_json(path, {
+            'pid': pid,
+            'start': start,
+            'counters': {REQUESTS: requests},
+            'histograms': {QUERIES: {'buckets': buckets, 'sum': 3 * requests, 'count': requests}},
+            'gauges': {IN_FLIGHT: in_flight}
+        })
+        return path
+
+    def exited_pid(self):
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        return process.pid
+
+    def files(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith('.json'))
+
+    def test_live_processes_are_merged(self):
+        parent = os.getppid()
+        path = self.write_process(parent, metrics.process_start_time(parent))
+        self.collector.add_gauge('hrms_http_requests_in_flight', {}, 1)
+
+        total = self.collector.collect()
+        self.assertEqual(total['counters'][REQUESTS], 6)
+        self.assertEqual(total['gauges'][IN_FLIGHT], 3)
+        self.assertEqual(total['histograms'][QUERIES]['count'], 6)
+        self.assertEqual(total['histograms'][QUERIES]['sum'], 16)
+        self.assertEqual(total['histograms'][QUERIES]['buckets'][1:4], [1, 0, 5])
+        self.assertIn(os.path.basename(path), self.files())
+
+    def test_exited_processes_are_archived(self):
+        path = self.write_process(self.exited_pid(), None)
+
+        total = self.collector.collect()
+        self.assertEqual(total['counters'][REQUESTS], 6)
+        self.assertNotIn(IN_FLIGHT, total['gauges'])
+        self.assertNotIn(os.path.basename(path), self.files())
+        self.assertIn(metrics.ARCHIVE_FILE, self.files())
+
+        # Archived counters are counted once, and never go backwards
+        self.collector.inc('hrms_http_requests_total', {**LABELS, 'status': '200'})
+        total = self.collector.collect()
+        self.assertEqual(total['counters'][REQUESTS], 7)
+        self.assertEqual(total['histograms'][QUERIES]['count'], 6)
+
+    @skipUnless(os.path.exists('/proc/self/stat'), 'needs /proc')
+    def test_reused_pid_counts_as_exited(self):
+        parent = os.getppid()
+        path = self.write_process(parent, metrics.process_start_time(parent) - 1)
+
+        total = self.collector.collect()
+        self.assertEqual(total['counters'][REQUESTS], 6)
+        self.assertNotIn(IN_FLIGHT, total['gauges'])
+        self.assertNotIn(os.path.basename(path), self.files())
+
+    def test_own_file_records_start_time(self):
+        self.collector.flush()
+        state = metrics.read_json(self.collector.path)
+        self.assertEqual((state['pid'], state['start']), (os.getpid(), metrics.process_start_time(os.getpid())))
+
+
+class RenderTests(SimpleTestCase):
+
+    def test_exposition_format(self):
+        total = metrics.empty_state()
+        labels = {'route': 'a"b\\c', 'method': 'GET', 'status': '200'}
+        total['counters'][metrics.series_key('hrms_http_requests_total', labels)] = 3
+        buckets = [0] * (len(metrics.QUERY_BUCKETS) + 1)
+        buckets[0], buckets[3] = 1, 1
+        total['histograms'][QUERIES] = {'buckets': buckets, 'sum': 3, 'count': 2}
+
+        lines = metrics.render(total).splitlines()
+        self.assertIn('# TYPE hrms_http_requests_total counter', lines)
+        self.assertIn('hrms_http_requests_total{method="GET",route="a\\"b\\\\c",status="200"} 3', lines)
+        # Nothing in flight is still reported
+        self.assertIn('hrms_http_requests_in_flight 0', lines)
+
+        self.assertIn('# TYPE hrms_db_queries_per_request histogram', lines)
+        histogram = [line for line in lines if line.startswith('hrms_db_queries_per_request')]
+        self.assertEqual(histogram[:5], [
+            'hrms_db_queries_per_request_bucket{method="GET",route="employee-list",le="0"} 1',
+            'hrms_db_queries_per_request_bucket{method="GET",route="employee-list",le="1"} 1',
+            'hrms_db_queries_per_request_bucket{method="GET",route="employee-list",le="2"} 1',
+            'hrms_db_queries_per_request_bucket{method="GET",route="employee-list",le="3"} 2',
+            'hrms_db_queries_per_request_bucket{method="GET",route="employee-list",le="5"} 2',
+        ])
+        self.assertEqual(histogram[-3:], [
+            'hrms_db_queries_per_request_bucket{method="GET",route="employee-list",le="+Inf"} 2',
+            'hrms_db_queries_per_request_sum{method="GET",route="employee-list"} 3',
+            'hrms_db_queries_per_request_count{method="GET",route="employee-list"} 2',
+        ])
@@ -0,0 +1,130 @@
+"""
+Attendance partitioning tests (PostgreSQL only; other backends keep a single table).
+The test database starts unpartitioned; each class partitions it inside its
+transaction, which is rolled back afterwards.
+"""
+import re
+from datetime import date
+from io import StringIO
+from unittest import SkipTest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.utils import timezone
+
+from core import archive, departments, partitions
+from core.filters import filter_attendance
+from core.models import Attendance, Employee
+
+
+# Table (or index) names after " on " in a query plan
+PLAN_RELATION = re.compile(r' on (\w+)')
+
+
+class PartitionTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        if not partitions.supported(connection):
+            raise SkipTest('partitioning needs PostgreSQL')
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create(
+            employee_id='EMP001', full_name='Test Employee', email='emp001@example.com', department=departments.get('IT')
+        )
+
+
+class PartitionCommandTests(PartitionTestCase):
+
+    def test_partition_and_undo_keep_rows(self):
+        days = [date(2020, 2, 10), date(2023, 7, 1), timezone.now().date()]
+        for day in days:
+            Attendance.objects.create(employee=self.employee, date=day, status='Present')
+        rows = sorted(Attendance.objects.values_list('id', 'date', 'status'))
+        self.assertFalse(partitions.is_partitioned(connection))
+
+        out = StringIO()
+        call_command('partition_attendances', interval='month', stdout=out)
+        self.assertTrue(partitions.is_partitioned(connection))
+        self.assertEqual(sorted(Attendance.objects.values_list('id', 'date', 'status')), rows)
+        names = [name for name, _, _ in partitions.list_partitions(connection)]
+        self.assertIn('attendances_p2020_02', names)
+        self.assertEqual(partitions.table_interval(connection), 'month')
+
+        # New rows get ids after the copied ones
+        created = Attendance.objects.create(employee=self.employee, date=date(2021, 1, 5), status='Absent')
+        self.assertGreater(created.pk, max(row[0] for row in rows))
+
+        call_command('partition_attendances', interval='month', stdout=out)
+        self.assertIn('already partitioned', out.getvalue())
+
+        call_command('partition_attendances', undo=True, stdout=out)
+        self.assertFalse(partitions.is_partitioned(connection))
+        self.assertEqual(Attendance.objects.count(), len(rows) + 1)
+
+    def test_interval_is_required(self):
+        with self.settings(ATTENDANCE_PARTITIONING='none'):
+            with self.assertRaises(CommandError):
+                call_command('partition_attendances', stdout=StringIO())
+        self.assertFalse(partitions.is_partitioned(connection))
+
+    def test_create_partitions_is_a_no_op_until_partitioned(self):
+        out = StringIO()
+        call_command('create_attendance_partitions', stdout=out)
+        self.assertIn('not partitioned', out.getvalue())
+
+
+class AttendancePartitionTests(PartitionTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        call_command('partition_attendances', interval='month', stdout=StringIO())
+
+    def scanned(self, queryset):
+        """Partitions the query plan reads"""
+        names = {name for name, _, _ in partitions.list_partitions(connection)}
+        return names.intersection(PLAN_RELATION.findall(queryset.explain()))
+
+    def test_date_filters_prune_partitions(self):
+        today = timezone.now().date()
+        month = partitions.partition_name(partitions.period_start(today, 'month'), 'month')
+        for params in [f'date={today}', f'date_from={today.replace(day=1)}&date_to={today}']:
+            with self.subTest(params=params):
+                queryset = filter_attendance(Attendance.objects.all(), QueryDict(params))
+                self.assertEqual(self.scanned(queryset), {month})
+
+    def test_rows_outside_partitions_go_to_default_and_move_out(self):
+        far_future = date(2090, 3, 15)
+        attendance = Attendance.objects.create(employee=self.employee, date=far_future, status='Present')
+        self.assertEqual(self.scanned(Attendance.objects.filter(date=far_future)), {partitions.DEFAULT_PARTITION})
+
+        created = partitions.create_partitions(connection, far_future, far_future, 'month')
+        self.assertEqual(created, ['attendances_p2090_03'])
+        self.assertEqual(self.scanned(Attendance.objects.filter(date=far_future)), {'attendances_p2090_03'})
+        self.assertEqual(Attendance.objects.get(date=far_future).pk, attendance.pk)
+
+    def test_command_creates_upcoming_partitions_once(self):
+        out = StringIO()
+        call_command('create_attendance_partitions', ahead=24, stdout=out)
+        names = [name for name, _, _ in partitions.list_partitions(connection)]
+        last = partitions.add_periods(timezone.now().date(), 'month', 24)
+        self.assertIn(partitions.partition_name(last, 'month'), names)
+
+        call_command('create_attendance_partitions', ahead=24, stdout=out)
+        self.assertIn('Created 0 attendance partitions.', out.getvalue())
+
+    def test_archiving_a_month_drops_its_partition(self):
+        month = date(2020, 2, 1)
+        partitions.create_partitions(connection, month, month, 'month')
+        Attendance.objects.create(employee=self.employee, date=date(2020, 2, 3), status='Present')
+
+        self.assertEqual(archive.archive_month(month), (1, 1))
+        names = [name for name, _, _ in partitions.list_partitions(connection)]
+        self.assertNotIn('attendances_p2020_02', names)
+        self.assertFalse(Attendance.objects.filter(date__lt=date(2020, 3, 1)).exists())
@@ -0,0 +1,94 @@
+"""
+Request timing tests: the Server-Timing header, query counting with DEBUG off and the sinks that receive each request
+"""
+import re
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import departments
+from core.models import Attendance, Employee
+from core.performance import BaseSink
+
+
+SERVER_TIMING = re.compile(r'^app;dur=\d+\.\d{2}, db;dur=\d+\.\d{2};desc="(\d+) queries"$')
+
+
+class RecordingSink(BaseSink):
+    """Keeps the metrics of every finished request"""
+    recorded = []
+
+    def record(self, metrics):
+        self.recorded.append(metrics)
+
+
+@override_settings(
+    SECURE_SSL_REDIRECT=False, DATABASE_REPLICAS=[], DEBUG=False,
+    PERFORMANCE_SINKS=['core.tests.test_performance.RecordingSink', 'core.performance.HistogramSink']
+)
+class PerformanceMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employee = Employee.objects.create(
+            employee_id='EMP001', full_name='Test Employee', email='emp001@example.com', department=departments.get('IT')
+        )
+        Attendance.objects.create(employee=employee, date=timezone.now().date(), status='Present')
+
+    def setUp(self):
+        RecordingSink.recorded = []
+
+    def test_server_timing_counts_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/employees/')
+        self.assertEqual(response.status_code, 200)
+
+        timing = SERVER_TIMING.match(response['Server-Timing'])
+        self.assertIsNotNone(timing, response['Server-Timing'])
+        self.assertEqual(int(timing.group(1)), len(queries))
+
+        [metrics] = RecordingSink.recorded
+        self.assertEqual((metrics.view, metrics.route, metrics.status), (
+            'EmployeeListCreateView', 'employee-list-create', 200
+        ))
+        self.assertEqual(metrics.queries, len(queries))
+        self.assertGreater(metrics.db_time, 0)
+        self.assertEqual(metrics.response_bytes, len(response.content))
+
+    @override_settings(PERFORMANCE_SERVER_TIMING=False)
+    def test_server_timing_can_be_turned_off(self):
+        response = self.client.get('/api/employees/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(len(RecordingSink.recorded), 1)
+
+    def test_streamed_response_is_recorded_at_the_end(self):
+        response = self.client.get('/api/attendance/export/')
+        self.assertTrue(response.streaming)
+        self.assertEqual(RecordingSink.recorded, [])
+
+        with CaptureQueriesContext(connection) as queries:
+            body = b''.join(response.streaming_content)
+        self.assertGreater(len(queries), 0)
+
+        [metrics] = RecordingSink.recorded
+        self.assertEqual(metrics.response_bytes, len(body))
+        self.assertGreaterEqual(metrics.queries, len(queries))
+        self.assertIsNotNone(metrics.duration)
+
+    def test_histograms_are_served(self):
+        self.client.get('/api/employees/')
+        self.client.get('/api/employees/')
+
+        response = self.client.get('/api/dashboard/performance/')
+        self.assertEqual(response.status_code, 200)
+        [histogram] = response.data['data']
+        self.assertEqual((histogram['view'], histogram['method'], histogram['requests']), (
+            'EmployeeListCreateView', 'GET', 2
+        ))
+        self.assertEqual(sum(histogram['buckets_ms'].values()), 2)
+
+    @override_settings(PERFORMANCE_SINKS=[])
+    def test_histograms_need_the_sink(self):
+        self.assertEqual(self.client.get('/api/dashboard/performance/').status_code, 404)
@@ -0,0 +1,163 @@
+"""
+Query budget tests: every endpoint must run a fixed number of queries regardless of row count
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import departments, summary
+from core.models import Attendance, Employee
+
+
+DEPARTMENTS = ['IT', 'HR', 'Sales']
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class QueryBudgetTests(TestCase):
+    """
+    Each test calls an endpoint on a small data set, then again after growing it
+    tenfold, asserting the same query budget both times. A per-row query (N+1)
+    shows up as a budget failure on the second call.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.now().date()
+        cls.seed(employees=5, days=5)
+
+    @classmethod
+    def seed(cls, employees, days):
+        start = Employee.objects.count()
+        department_names = departments.resolve(DEPARTMENTS)
+        created = Employee.objects.bulk_create([
+            Employee(
+                employee_id=f'EMP{index:05d}',
+                full_name=f'Employee {index}',
+                email=f'employee{index}@example.com',
+                department=department_names[DEPARTMENTS[index % len(DEPARTMENTS)]]
+            )
+            for index in range(start, start + employees)
+        ])
+        Attendance.objects.bulk_create([
+            Attendance(
+                employee=employee,
+                date=cls.today - timedelta(days=day),
+                status='Present' if (employee.pk + day) % 4 else 'Absent'
+            )
+            for employee in created
+            for day in range(days)
+        ])
+        summary.rebuild()
+
+    def setUp(self):
+        cache.clear()
+
+    def grow(self):
+        """Add ten times more rows than the initial fixture"""
+        self.seed(employees=50, days=5)
+        cache.clear()
+
+    def assertBudget(self, queries, method, url, data=None, expected_status=200, **extra):
+        """Call the endpoint on the small fixture and on the grown one with the same budget"""
+        for _ in range(2):
+            with self.assertNumQueries(queries):
+                if method == 'get':
+                    response = self.client.get(url, data, **extra)
+                else:
+                    response = getattr(self.client, method)(url, data, content_type='application/json', **extra)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            self.assertEqual(response.status_code, expected_status, getattr(response, 'data', None))
+            if method != 'get':
+                return
+            self.grow()
+
+    def test_employee_list_page(self):
+        # Page query only: the total is counted by a window function and the ETag built from the rows
+        self.assertBudget(1, 'get', '/api/employees/', {'page': 1, 'page_size': 20})
+
+    def test_employee_list_cursor_with_count(self):
+        # COUNT + page query
+        self.assertBudget(2, 'get', '/api/employees/', {'page_size': 20, 'count': 'exact'})
+
+    def test_employee_list_sparse_fields(self):
+        self.assertBudget(1, 'get', '/api/employees/', {'page': 1, 'fields': 'employee_id,full_name'})
+
+    def test_employee_detail(self):
+        employee = Employee.objects.first()
+        self.assertBudget(1, 'get', f'/api/employees/{employee.pk}/')
+
+    def test_attendance_list(self):
+        # Page query with the employee joined in
+        self.assertBudget(1, 'get', '/api/attendance/', {'page_size': 100})
+
+    def test_attendance_list_filtered_with_count(self):
+        self.assertBudget(2, 'get', '/api/attendance/', {
+            'department': 'IT',
+            'status': 'Present,Absent',
+            'date_from': str(self.today - timedelta(days=3)),
+            'count': 'exact'
+        })
+
+    def test_attendance_list_not_modified(self):
+        # The page query the validator is built from; nothing is serialized
+        etag = self.client.get('/api/attendance/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/attendance/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_attendance_detail(self):
+        attendance = Attendance.objects.first()
+        self.assertBudget(1, 'get', f'/api/attendance/{attendance.pk}/')
+
+    def test_attendance_export(self):
+        # Archived months, then the live rows
+        self.assertBudget(2, 'get', '/api/attendance/export/', {'output': 'jsonl'})
+
+    def test_employee_stats(self):
+        employee = Employee.objects.first()
+        self.assertBudget(1, 'get', f'/api/employees/{employee.employee_id}/stats/', {
+            'from': str(self.today - timedelta(days=2))
+        })
+
+    def test_employee_stats_batch(self):
+        self.assertBudget(1, 'get', '/api/stats/employees/', {'department': 'HR', 'page_size': 100})
+
+    def test_dashboard(self):
+        # Employee count + today's summary + recent attendance with employees joined
+        self.assertBudget(3, 'get', '/api/dashboard/')
+
+    def test_dashboard_cached(self):
+        self.client.get('/api/dashboard/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/dashboard/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_dashboard_trend(self):
+        self.assertBudget(1, 'get', '/api/dashboard/trend/')
+
+    def test_bulk_roll_call(self):
+        """Marking a whole department costs the same for 2 or 20 employees"""
+        yesterday = self.today - timedelta(days=30)
+        for department in ['IT', 'HR']:
+            Attendance.objects.filter(date=yesterday).delete()
+            payload = {'department': department, 'date': str(yesterday), 'status': 'Present'}
+            # department lookup, existing marks, savepoint, INSERT, summary reads/writes, release
+            with self.assertNumQueries(9):
+                response = self.client.post('/api/attendance/bulk/', payload, content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['data']['summary']['error'], 0)
+            self.grow()
+
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_admin_attendance_changelist(self):
+        user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(user)
+        for _ in range(2):
+            with self.assertNumQueries(7):
+                response = self.client.get('/admin/core/attendance/')
+            self.assertEqual(response.status_code, 200)
+            self.grow()
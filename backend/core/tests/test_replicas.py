@@ -0,0 +1,164 @@
+"""
+Read-replica routing tests, run against a second SQLite database standing in for the replica
+"""
+from datetime import date
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connections
+from django.test import TestCase, override_settings
+
+from core import cache as dashboard_cache
+from core import routers
+from core.models import Attendance, Department, Employee
+
+
+REPLICA = 'replica_test'
+
+# Registered on import so the test runner creates (and migrates) a second
+# SQLite test database for it next to the primary's
+connections.settings[REPLICA] = connections.configure_settings({
+    'default': connections.settings['default'],
+    REPLICA: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': 'replica_test.sqlite3'}
+})[REPLICA]
+
+
+@override_settings(
+    SECURE_SSL_REDIRECT=False,
+    PERFORMANCE_SINKS=[],
+    DATABASE_REPLICAS=[REPLICA],
+    REPLICA_STICKY_SECONDS=10
+)
+class ReplicaRoutingTests(TestCase):
+    """
+    The primary and the replica hold different rows, so each response shows
+    which database it was read from.
+    """
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_employee('default', 'PRIMARY1')
+        replica_employee = cls.create_employee(REPLICA, 'REPLICA1')
+        Attendance.objects.using(REPLICA).bulk_create([
+            Attendance(employee=replica_employee, date=date(2024, 1, 15), status='Present')
+        ])
+
+    @staticmethod
+    def create_employee(alias, employee_id):
+        # bulk_create sends no signals, which would write summaries to the primary
+        department = Department.objects.using(alias).get_or_create(name='IT')[0]
+        return Employee.objects.using(alias).bulk_create([Employee(
+            employee_id=employee_id,
+            full_name=f'Employee {employee_id}',
+            email=f'{employee_id.lower()}@example.com',
+            department=department
+        )])[0]
+
+    def stats_employee_ids(self):
+        response = self.client.get('/api/stats/employees/')
+        self.assertEqual(response.status_code, 200)
+        return [row['employee_id'] for row in response.data['data']]
+
+    def create_via_api(self, employee_id):
+        response = self.client.post('/api/employees/', {
+            'employee_id': employee_id,
+            'full_name': 'New Employee',
+            'email': f'{employee_id.lower()}@example.com',
+            'department': 'HR'
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response
+
+    def test_reporting_views_read_from_replica(self):
+        self.assertEqual(self.stats_employee_ids(), ['REPLICA1'])
+
+        response = self.client.get('/api/employees/REPLICA1/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['present_days'], 1)
+
+    def test_async_views_read_from_replica(self):
+        response = self.client.get('/api/async/stats/employees/')
+        self.assertEqual([row['employee_id'] for row in response.json()['data']], ['REPLICA1'])
+
+    def test_streamed_export_reads_from_replica(self):
+        response = self.client.get('/api/attendance/export/', {'output': 'csv'})
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('REPLICA1', body)
+        self.assertNotIn('PRIMARY1', body)
+
+    def test_other_views_read_from_primary(self):
+        response = self.client.get('/api/employees/', {'page': 1})
+        self.assertEqual([row['employee_id'] for row in response.data['data']], ['PRIMARY1'])
+
+    def dashboard_employee_ids(self):
+        cache.clear()
+        response = self.client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return [row['employee_emp_id'] for row in response.json()['data']['recent_attendance']]
+
+    @override_settings(DASHBOARD_CACHE_TTL=30)
+    def test_cached_dashboard_is_built_from_primary(self):
+        Attendance.objects.create(
+            employee=Employee.objects.get(employee_id='PRIMARY1'), date=date(2024, 1, 16), status='Absent'
+        )
+        # A replica that hasn't replayed the write yet must not be cached
+        self.assertEqual(self.dashboard_employee_ids(), ['PRIMARY1'])
+
+        # The async view runs its queries on other connections, so check where aget_dashboard points them
+        read_from = []
+
+        async def build():
+            read_from.append(Employee.objects.all().db)
+            return {}
+
+        cache.clear()
+        with routers.read_from_replica(REPLICA):
+            async_to_sync(dashboard_cache.aget_dashboard)(build)
+        self.assertEqual(read_from, ['default'])
+
+    @override_settings(DASHBOARD_CACHE_TTL=0)
+    def test_uncached_dashboard_reads_from_replica(self):
+        self.assertEqual(self.dashboard_employee_ids(), ['REPLICA1'])
+
+    def test_writes_go_to_primary(self):
+        self.create_via_api('NEW1')
+        self.assertTrue(Employee.objects.using('default').filter(employee_id='NEW1').exists())
+        self.assertFalse(Employee.objects.using(REPLICA).filter(employee_id='NEW1').exists())
+
+    def test_client_reads_own_writes_after_writing(self):
+        response = self.create_via_api('NEW1')
+        cookie = response.cookies['hrms_read_primary']
+        self.assertEqual(cookie['max-age'], 10)
+        self.assertTrue(cookie['httponly'])
+
+        # The test client sends the cookie back, so reads stay on the primary
+        self.assertEqual(sorted(self.stats_employee_ids()), ['NEW1', 'PRIMARY1'])
+
+        self.client.cookies.pop('hrms_read_primary')
+        self.assertEqual(self.stats_employee_ids(), ['REPLICA1'])
+
+    def test_reads_do_not_set_sticky_cookie(self):
+        response = self.client.get('/api/stats/employees/')
+        self.assertNotIn('hrms_read_primary', response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_primary(self):
+        self.assertEqual(self.stats_employee_ids(), ['PRIMARY1'])
+        response = self.create_via_api('NEW1')
+        self.assertNotIn('hrms_read_primary', response.cookies)
+
+    @override_settings(REPLICA_STICKY_SECONDS=0)
+    def test_stickiness_can_be_disabled(self):
+        response = self.create_via_api('NEW1')
+        self.assertNotIn('hrms_read_primary', response.cookies)
+        self.assertEqual(self.stats_employee_ids(), ['REPLICA1'])
+
+    def test_router_outside_requests(self):
+        self.assertEqual(Employee.objects.all().db, 'default')
+        with routers.read_from_replica():
+            self.assertEqual(Employee.objects.all().db, REPLICA)
+            employee = Employee.objects.get(employee_id='REPLICA1')
+            self.assertEqual(employee._state.db, REPLICA)
+            self.assertEqual(routers.ReplicaRouter().db_for_write(Employee, instance=employee), 'default')
+        self.assertEqual(Employee.objects.all().db, 'default')
@@ -0,0 +1,102 @@
+"""
+Employee search tests (GET /api/employees/search/)
+"""
+import re
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core import departments, search
+from core.models import Employee
+
+
+# A full scan of employees: PostgreSQL "Seq Scan on employees", SQLite "SCAN e" / "SCAN employees"
+SEQUENTIAL_SCAN = re.compile(r'Seq Scan on employees|SCAN (e|employees)\b(?! USING)')
+
+EMPLOYEES = [
+    ('EMP001', 'John Smith', 'john.smith@example.com', 'Engineering'),
+    ('EMP010', 'Johanna Berg', 'jberg@example.com', 'Human Resources'),
+    ('EMP100', 'Maria Garcia', 'maria@example.com', 'Engineering'),
+    ('OPS001', 'Peter Johnson', 'peter@example.com', 'Operations'),
+    ('FIN001', 'Ana Lopez', 'emp.lopez@example.com', 'Finance'),
+]
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class EmployeeSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for employee_id, full_name, email, department in EMPLOYEES:
+            Employee.objects.create(
+                employee_id=employee_id, full_name=full_name, email=email, department=departments.get(department)
+            )
+
+    def search(self, q, **params):
+        response = self.client.get('/api/employees/search/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['employee_id'] for row in response.data['data']], response.data['count']
+
+    def test_employee_id_prefix_ranks_exact_match_first(self):
+        ids, count = self.search('emp001')
+        self.assertEqual(ids[0], 'EMP001')
+        self.assertEqual(count, 1)
+
+        ids, count = self.search('EMP')
+        self.assertEqual(ids, ['EMP001', 'EMP010', 'EMP100', 'FIN001'])  # FIN001 by email prefix
+        self.assertEqual(count, 4)
+
+    def test_email_prefix(self):
+        self.assertEqual(self.search('john.sm')[0], ['EMP001'])
+        self.assertEqual(self.search('emp.lo')[0], ['FIN001'])
+
+    def test_name_and_department_words(self):
+        ids, _ = self.search('joh')
+        self.assertEqual(sorted(ids), ['EMP001', 'EMP010', 'OPS001'])
+        self.assertEqual(self.search('Smith John')[0], ['EMP001'])
+        self.assertEqual(sorted(self.search('engineer')[0]), ['EMP001', 'EMP100'])
+        self.assertEqual(self.search('human res')[0], ['EMP010'])
+        self.assertEqual(self.search('nobody'), ([], 0))
+
+    def test_pagination(self):
+        ids, count = self.search('e', page_size=2)
+        all_ids, _ = self.search('e')
+        self.assertEqual(count, len(all_ids))
+        self.assertEqual(ids, all_ids[:2])
+        self.assertEqual(self.search('e', page_size=2, page=2)[0], all_ids[2:4])
+        self.assertEqual(self.search('e', page=10), ([], count))
+
+    def test_index_follows_updates_and_deletes(self):
+        employee = Employee.objects.get(employee_id='EMP100')
+        employee.full_name = 'Maria Santos'
+        employee.save()
+        self.assertEqual(self.search('santos')[0], ['EMP100'])
+        self.assertEqual(self.search('garcia')[0], [])
+
+        employee.delete()
+        self.assertEqual(self.search('santos')[0], [])
+
+    def test_index_follows_department_renames(self):
+        department = departments.get('Operations')
+        department.name = 'Logistics'
+        department.save()
+        self.assertEqual(self.search('logis')[0], ['OPS001'])
+        self.assertEqual(self.search('operations')[0], [])
+
+    def test_missing_query(self):
+        response = self.client.get('/api/employees/search/', {'q': '  '})
+        self.assertEqual(response.status_code, 400)
+
+    def test_admin_filter(self):
+        matches = search.filter_employees(Employee.objects.all(), 'engineer')
+        self.assertEqual(sorted(matches.values_list('employee_id', flat=True)), ['EMP001', 'EMP100'])
+
+    def test_matches_use_indexes(self):
+        if connection.vendor == 'postgresql':
+            # Tiny test tables make sequential scans look cheapest; ask whether an index can be used at all
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        for q in ['EMP0', 'john.sm', 'joh', 'human res']:
+            with self.subTest(q=q):
+                plan = search.filter_employees(Employee.objects.all(), q).explain()
+                self.assertIsNone(SEQUENTIAL_SCAN.search(plan), plan)
@@ -0,0 +1,114 @@
+"""
+Uniqueness tests: duplicates are rejected by the database constraints, with the usual 400 errors
+"""
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import departments
+from core.models import Attendance, Employee
+from core.tests.concurrency import ConcurrentRequestsTestCase
+
+
+def employee_payload(employee_id, email=None):
+    return {
+        'employee_id': employee_id,
+        'full_name': 'Test Employee',
+        'email': email or f'{employee_id.lower()}@example.com',
+        'department': 'IT'
+    }
+
+
+def create_employee(employee_id):
+    return Employee.objects.create(**{**employee_payload(employee_id), 'department': departments.get('IT')})
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class UniqueConstraintTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = create_employee('EMP001')
+        cls.other = create_employee('EMP002')
+        cls.today = timezone.now().date()
+
+    def post(self, url, data):
+        return self.client.post(url, data, content_type='application/json')
+
+    def test_duplicate_employee_id_and_email(self):
+        response = self.post('/api/employees/', employee_payload('emp001', email='new@example.com'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'success': False, 'error': {'employee_id': ['Employee ID already exists.']}})
+
+        response = self.post('/api/employees/', employee_payload('EMP003', email='EMP001@example.com'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], {'email': ['Email already exists.']})
+        self.assertEqual(Employee.objects.count(), 2)
+
+    def test_update_to_duplicate(self):
+        response = self.client.put(
+            f'/api/employees/{self.other.pk}/', {'email': 'emp001@example.com'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'success': False, 'error': {'email': ['Email already exists.']}})
+
+    def test_update_attendance_to_duplicate(self):
+        today = Attendance.objects.create(employee=self.employee, date=self.today, status='Present')
+        yesterday = Attendance.objects.create(
+            employee=self.employee, date=self.today - timedelta(days=1), status='Absent'
+        )
+        response = self.client.put(
+            f'/api/attendance/{yesterday.pk}/', {'date': str(today.date)}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['success'], False)
+        self.assertEqual(Attendance.objects.get(pk=yesterday.pk).date, yesterday.date)
+
+    def test_duplicate_attendance(self):
+        payload = {'employee_id': 'EMP001', 'date': str(self.today), 'status': 'Present'}
+        self.assertEqual(self.post('/api/attendance/', payload).status_code, 201)
+
+        response = self.post('/api/attendance/', {**payload, 'status': 'Absent'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], {
+            'detail': [f'Attendance for employee EMP001 on {self.today} already exists.']
+        })
+        self.assertEqual(Attendance.objects.get().status, 'Present')
+
+    def test_creates_without_existence_queries(self):
+        # transaction, department lookup, INSERT, department and summary headcount UPDATEs
+        with self.assertNumQueries(6):
+            response = self.post('/api/employees/', employee_payload('EMP003'))
+        self.assertEqual(response.status_code, 201)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, PERFORMANCE_SINKS=[], DATABASE_REPLICAS=[])
+class ConcurrentDuplicateTests(ConcurrentRequestsTestCase):
+    """Simultaneous duplicate writes"""
+
+    def statuses(self, method, requests):
+        return sorted(response.status_code for response in self.send_concurrently(method, requests))
+
+    def test_one_of_many_duplicate_employees_is_created(self):
+        statuses = self.statuses('post', [
+            ('/api/employees/', employee_payload('EMP001', email=f'writer{index}@example.com'))
+            for index in range(self.THREADS)
+        ])
+        self.assertEqual(statuses, [201] + [400] * (self.THREADS - 1))
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_one_of_many_duplicate_marks_is_created(self):
+        create_employee('EMP001')
+        payload = {'employee_id': 'EMP001', 'date': str(timezone.now().date()), 'status': 'Present'}
+        statuses = self.statuses('post', [('/api/attendance/', payload)] * self.THREADS)
+        self.assertEqual(statuses, [201] + [400] * (self.THREADS - 1))
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_one_of_many_updates_to_the_same_email_is_saved(self):
+        employees = [create_employee(f'EMP{index:03d}') for index in range(self.THREADS)]
+        statuses = self.statuses('put', [
+            (f'/api/employees/{employee.pk}/', {'email': 'shared@example.com'}) for employee in employees
+        ])
+        self.assertEqual(statuses, [200] + [400] * (self.THREADS - 1))
+        self.assertEqual(Employee.objects.filter(email='shared@example.com').count(), 1)
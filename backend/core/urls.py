@@ -2,25 +2,63 @@
 URL configuration for core app API endpoints
 """
 from django.urls import path
+from .async_views import (
+    AsyncAttendanceListView,
+    AsyncDashboardStatsView,
+    AsyncEmployeeAttendanceStatsView,
+    AsyncEmployeeListView,
+    AsyncEmployeeStatsBatchView
+)
 from .views import (
     EmployeeListCreateView,
+    EmployeeImportView,
+    EmployeeSearchView,
     EmployeeDetailView,
     AttendanceListCreateView,
+    AttendanceBulkView,
+    AttendanceExportView,
     AttendanceDetailView,
+    AttendanceMarkView,
     EmployeeAttendanceStatsView,
-    DashboardStatsView
+    EmployeeStatsBatchView,
+    DashboardStatsView,
+    DashboardTrendView,
+    CacheStatsView,
+    PerformanceStatsView,
+    DepartmentListView
 )
 
 urlpatterns = [
     # Dashboard
     path('dashboard/', DashboardStatsView.as_view(), name='dashboard-stats'),
+    path('dashboard/trend/', DashboardTrendView.as_view(), name='dashboard-trend'),
+    path('dashboard/cache/', CacheStatsView.as_view(), name='cache-stats'),
+    path('dashboard/performance/', PerformanceStatsView.as_view(), name='performance-stats'),
+
+    # Department endpoints
+    path('departments/', DepartmentListView.as_view(), name='department-list'),
 
     # Employee endpoints
     path('employees/', EmployeeListCreateView.as_view(), name='employee-list-create'),
+    path('employees/import/', EmployeeImportView.as_view(), name='employee-import'),
+    path('employees/search/', EmployeeSearchView.as_view(), name='employee-search'),
     path('employees/<int:pk>/', EmployeeDetailView.as_view(), name='employee-detail'),
     path('employees/<str:employee_id>/stats/', EmployeeAttendanceStatsView.as_view(), name='employee-stats'),
 
+    # Statistics endpoints
+    path('stats/employees/', EmployeeStatsBatchView.as_view(), name='employee-stats-batch'),
+
     # Attendance endpoints
     path('attendance/', AttendanceListCreateView.as_view(), name='attendance-list-create'),
+    path('attendance/export/', AttendanceExportView.as_view(), name='attendance-export'),
+    path('attendance/bulk/', AttendanceBulkView.as_view(), name='attendance-bulk'),
     path('attendance/<int:pk>/', AttendanceDetailView.as_view(), name='attendance-detail'),
+    path('attendance/<str:employee_id>/<str:date>/', AttendanceMarkView.as_view(), name='attendance-mark'),
+
+    # Async read endpoints (same responses, for ASGI deployments)
+    path('async/dashboard/', AsyncDashboardStatsView.as_view(), name='async-dashboard-stats'),
+    path('async/employees/', AsyncEmployeeListView.as_view(), name='async-employee-list'),
+    path('async/employees/<str:employee_id>/stats/', AsyncEmployeeAttendanceStatsView.as_view(), name='async-employee-stats'),
+    path('async/stats/employees/', AsyncEmployeeStatsBatchView.as_view(), name='async-employee-stats-batch'),
+    path('async/attendance/', AsyncAttendanceListView.as_view(), name='async-attendance-list'),
 ]
@@ -1,38 +1,84 @@
 """
 API Views for HRMS Lite
 """
+import codecs
+import hmac
+from datetime import timedelta
+
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
-from django.db.models import Count, Q
-
-from .models import Employee, Attendance
+from django.db import IntegrityError, transaction
+from django.db.models import FilteredRelation, Q, Sum
+
+from .models import Department, Employee, Attendance, DailyAttendanceSummary
+from . import archive
+from . import bulk
+from . import dashboard
+from . import cache as dashboard_cache
+from . import listing
+from . import metrics
+from . import performance
+from . import search
+from .filters import filter_attendance, get_date_range
+from .stats import employee_stats, employee_stats_queryset, format_employee_stats, format_stats_page
+from .exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, stream_rows
+from .conditional import not_modified, object_validators, with_validators
+from .importers import CONTENT_TYPE_FORMATS, DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE, EmployeeImporter, read_records
+from .pagination import (
+    count_queryset,
+    get_count_mode,
+    get_page_number,
+    get_page_size,
+    paginate_by_page
+)
 from .serializers import (
     EmployeeSerializer,
     AttendanceSerializer,
-    DashboardStatsSerializer
+    AttendanceMarkSerializer,
+    BulkAttendanceRowSerializer,
+    BulkAttendanceSerializer
 )
 
 
 class EmployeeListCreateView(APIView):
     """
     API endpoint for listing and creating employees
-    GET: List all employees
+    GET: List employees (page or cursor paginated, optional sparse fieldset)
     POST: Create a new employee
     """
+    paginator = listing.employee_paginator
 
     def get(self, request):
-        """Get all employees"""
+        """Get a page of employees"""
         try:
-            employees = Employee.objects.all()
-            serializer = EmployeeSerializer(employees, many=True)
-
+            employees, fields, related = listing.employee_list_queryset(request.query_params)
+            page_size = get_page_size(request)
+
+            if 'page' in request.query_params:
+                page = get_page_number(request)
+                rows, total = paginate_by_page(employees, page, page_size)
+                meta = {'count': total, 'page': page, 'page_size': page_size}
+            else:
+                total = count_queryset(employees, get_count_mode(request))
+                rows, next_cursor = self.paginator.paginate(
+                    employees, request.query_params.get('cursor'), page_size
+                )
+                meta = {'count': total, 'next': next_cursor}
+
+            return listing.list_response(
+                request, Response, rows, related, EmployeeSerializer(rows, many=True, fields=fields), meta
+            )
+
+        except ValidationError as e:
             return Response({
-                'success': True,
-                'data': serializer.data,
-                'count': employees.count()
-            }, status=status.HTTP_200_OK)
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
             return Response({
@@ -61,6 +107,13 @@ class EmployeeListCreateView(APIView):
                 'error': serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
+        except ValidationError as e:
+            # Raised on save for a unique constraint violation
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
         except Exception as e:
             return Response({
                 'success': False,
@@ -71,6 +124,114 @@ class EmployeeListCreateView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class EmployeeSearchView(APIView):
+    """
+    API endpoint for employee search
+    GET: Ranked, page-numbered matches for ?q= (employee ID or email prefix,
+    words of the name or department)
+    """
+
+    def get(self, request):
+        """Search employees"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({
+                'success': False,
+                'error': {
+                    'q': 'Enter a search term.'
+                }
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page = get_page_number(request)
+            page_size = get_page_size(request)
+            rows, total = search.search_employees(query, page, page_size)
+            serializer = EmployeeSerializer(rows, many=True)
+
+            return Response({
+                'success': True,
+                'data': serializer.data,
+                'count': total,
+                'page': page,
+                'page_size': page_size
+            }, status=status.HTTP_200_OK)
+
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to search employees.',
+                    'details': str(e)
+                }
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class EmployeeImportView(APIView):
+    """
+    API endpoint for bulk employee import
+    POST: Stream a CSV or JSON Lines body and import it in chunks
+    """
+
+    def post(self, request):
+        """Import employees from the request body"""
+        content_type = request.content_type.split(';')[0].strip().lower()
+        fmt = CONTENT_TYPE_FORMATS.get(content_type)
+        if fmt is None:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Upload the file as text/csv or application/x-ndjson.'
+                }
+            }, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+        try:
+            chunk_size = int(request.query_params.get('chunk_size', DEFAULT_CHUNK_SIZE))
+        except ValueError:
+            chunk_size = 0
+        if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+            return Response({
+                'success': False,
+                'error': {
+                    'chunk_size': f'Chunk size must be between 1 and {MAX_CHUNK_SIZE}.'
+                }
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # Decode the body line by line instead of buffering the upload
+            stream = request.stream
+            lines = codecs.iterdecode(stream, 'utf-8-sig') if stream is not None else []
+            report = EmployeeImporter(chunk_size=chunk_size).run(read_records(lines, fmt))
+
+            return Response({
+                'success': report['failed'] == 0,
+                'message': f"{report['created']} employees imported, {report['failed']} rows failed.",
+                'data': report
+            }, status=status.HTTP_200_OK)
+
+        except UnicodeDecodeError:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Upload must be UTF-8 encoded.'
+                }
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to import employees.',
+                    'details': str(e)
+                }
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class EmployeeDetailView(APIView):
     """
     API endpoint for employee detail operations
@@ -82,7 +243,7 @@ class EmployeeDetailView(APIView):
     def get_object(self, pk):
         """Helper method to get employee by ID"""
         try:
-            return Employee.objects.get(pk=pk)
+            return Employee.objects.select_related('department').get(pk=pk)
         except Employee.DoesNotExist:
             return None
 
@@ -98,11 +259,16 @@ class EmployeeDetailView(APIView):
                 }
             }, status=status.HTTP_404_NOT_FOUND)
 
+        etag, last_modified = object_validators(request, employee, employee.department)
+        cached = not_modified(request, etag, last_modified)
+        if cached:
+            return cached
+
         serializer = EmployeeSerializer(employee)
-        return Response({
+        return with_validators(Response({
             'success': True,
             'data': serializer.data
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK), etag, last_modified)
 
     def put(self, request, pk):
         """Update employee"""
@@ -116,20 +282,37 @@ class EmployeeDetailView(APIView):
                 }
             }, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = EmployeeSerializer(employee, data=request.data, partial=True)
+        try:
+            serializer = EmployeeSerializer(employee, data=request.data, partial=True)
+
+            if serializer.is_valid():
+                serializer.save()
+                return Response({
+                    'success': True,
+                    'message': 'Employee updated successfully.',
+                    'data': serializer.data
+                }, status=status.HTTP_200_OK)
 
-        if serializer.is_valid():
-            serializer.save()
             return Response({
-                'success': True,
-                'message': 'Employee updated successfully.',
-                'data': serializer.data
-            }, status=status.HTTP_200_OK)
+                'success': False,
+                'error': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response({
-            'success': False,
-            'error': serializer.errors
-        }, status=status.HTTP_400_BAD_REQUEST)
+        except ValidationError as e:
+            # Raised on save for a unique constraint violation
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to update employee.',
+                    'details': str(e)
+                }
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def delete(self, request, pk):
         """Delete employee"""
@@ -155,37 +338,32 @@ class EmployeeDetailView(APIView):
 class AttendanceListCreateView(APIView):
     """
     API endpoint for listing and creating attendance records
-    GET: List attendance (with optional filters)
+    GET: List attendance (with optional filters, cursor paginated)
     POST: Create a new attendance record
     """
+    paginator = listing.attendance_paginator
 
     def get(self, request):
         """Get attendance records with optional filters"""
         try:
-            attendances = Attendance.objects.select_related('employee').all()
-
-            # Filter by employee_id if provided
-            employee_id = request.query_params.get('employee_id')
-            if employee_id:
-                attendances = attendances.filter(employee__employee_id=employee_id.upper())
+            attendances, related = listing.attendance_list_queryset(request.query_params)
 
-            # Filter by date if provided
-            date = request.query_params.get('date')
-            if date:
-                attendances = attendances.filter(date=date)
+            page_size = get_page_size(request)
+            total = count_queryset(attendances, get_count_mode(request))
+            page, next_cursor = self.paginator.paginate(
+                attendances, request.query_params.get('cursor'), page_size
+            )
 
-            # Filter by status if provided
-            status_filter = request.query_params.get('status')
-            if status_filter:
-                attendances = attendances.filter(status=status_filter)
-
-            serializer = AttendanceSerializer(attendances, many=True)
+            return listing.list_response(
+                request, Response, page, related, AttendanceSerializer(page, many=True),
+                {'count': total, 'next': next_cursor}
+            )
 
+        except ValidationError as e:
             return Response({
-                'success': True,
-                'data': serializer.data,
-                'count': attendances.count()
-            }, status=status.HTTP_200_OK)
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
             return Response({
@@ -214,6 +392,13 @@ class AttendanceListCreateView(APIView):
                 'error': serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
+        except ValidationError as e:
+            # Raised on save for a unique constraint violation
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
         except Exception as e:
             return Response({
                 'success': False,
@@ -224,6 +409,140 @@ class AttendanceListCreateView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class AttendanceExportView(APIView):
+    """
+    API endpoint for exporting attendance
+    GET: Stream attendance as CSV or JSON Lines (same filters as the list endpoint)
+    """
+    use_read_replica = True
+    EXPORT_COLUMNS = ('employee_id', 'employee_name', 'department', 'date', 'status')
+
+    def get(self, request):
+        """Stream attendance records matching the filters"""
+        try:
+            fmt = request.query_params.get('output', 'csv').lower()
+            if fmt not in EXPORT_FORMATS:
+                raise ValidationError({'output': f"Output must be one of: {', '.join(EXPORT_FORMATS)}."})
+
+            attendances = filter_attendance(Attendance.objects.all(), request.query_params)
+
+            # Plain tuples straight from the cursor: no model instances, flat memory.
+            # Archived months are read first and expanded day by day.
+            rows = archive.export_rows(attendances, request.query_params, EXPORT_CHUNK_SIZE)
+
+            response = StreamingHttpResponse(
+                stream_rows(rows, self.EXPORT_COLUMNS, fmt),
+                content_type=EXPORT_FORMATS[fmt]
+            )
+            response['Content-Disposition'] = f'attachment; filename="attendance.{fmt}"'
+            return response
+
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to export attendance records.',
+                    'details': str(e)
+                }
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AttendanceBulkView(APIView):
+    """
+    API endpoint for bulk attendance marking
+    POST: Mark attendance for a list of records or a whole department
+    """
+
+    def post(self, request):
+        """Mark attendance in bulk and return per-row results"""
+        try:
+            serializer = BulkAttendanceSerializer(data=request.data)
+
+            if not serializer.is_valid():
+                return Response({
+                    'success': False,
+                    'error': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            payload = serializer.validated_data
+            rows, results = [], []
+
+            if 'records' in payload:
+                records = payload['records']
+                if len(records) > bulk.MAX_BULK_ROWS:
+                    return Response({
+                        'success': False,
+                        'error': {
+                            'message': f'At most {bulk.MAX_BULK_ROWS} records can be marked per request.'
+                        }
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+                for index, record in enumerate(records):
+                    row_serializer = BulkAttendanceRowSerializer(data=record)
+                    if row_serializer.is_valid():
+                        rows.append({'index': index, **row_serializer.validated_data})
+                    else:
+                        results.append(bulk.row_result(
+                            {'index': index, **record}, 'error', row_serializer.errors
+                        ))
+            else:
+                employees = Employee.objects.filter(
+                    department__name__iexact=payload['department']
+                ).values_list('pk', 'employee_id', 'department_id')
+                rows = [
+                    {
+                        'index': index,
+                        'employee': employee_pk,
+                        'department': department_id,
+                        'employee_id': employee_id,
+                        'date': payload['date'],
+                        'status': payload['status']
+                    }
+                    for index, (employee_pk, employee_id, department_id) in enumerate(employees)
+                ]
+
+            results.extend(bulk.mark_attendance(rows, upsert=payload['upsert']))
+            results.sort(key=lambda entry: entry['index'])
+
+            summary = {
+                outcome: sum(1 for entry in results if entry['result'] == outcome)
+                for outcome in ('created', 'updated', 'unchanged', 'error')
+            }
+
+            return Response({
+                'success': summary['error'] == 0,
+                'message': f"{summary['created']} created, {summary['updated']} updated, "
+                           f"{summary['error']} failed.",
+                'data': {
+                    'summary': summary,
+                    'results': results
+                }
+            }, status=status.HTTP_200_OK)
+
+        except IntegrityError:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Attendance was modified concurrently. Please retry the request.'
+                }
+            }, status=status.HTTP_409_CONFLICT)
+
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to mark attendance in bulk.',
+                    'details': str(e)
+                }
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class AttendanceDetailView(APIView):
     """
     API endpoint for attendance detail operations
@@ -232,10 +551,16 @@ class AttendanceDetailView(APIView):
     DELETE: Delete a specific attendance record
     """
 
-    def get_object(self, pk):
-        """Helper method to get attendance by ID"""
+    def get_object(self, pk, for_update=False):
+        """
+        Helper method to get attendance by ID. for_update locks the row until the
+        transaction ends, so concurrent edits move the summary counts one after another.
+        """
+        attendances = Attendance.objects.select_related('employee')
+        if for_update:
+            attendances = attendances.select_for_update(of=('self',))
         try:
-            return Attendance.objects.select_related('employee').get(pk=pk)
+            return attendances.get(pk=pk)
         except Attendance.DoesNotExist:
             return None
 
@@ -251,52 +576,85 @@ class AttendanceDetailView(APIView):
                 }
             }, status=status.HTTP_404_NOT_FOUND)
 
+        etag, last_modified = object_validators(request, attendance, attendance.employee)
+        cached = not_modified(request, etag, last_modified)
+        if cached:
+            return cached
+
         serializer = AttendanceSerializer(attendance)
-        return Response({
+        return with_validators(Response({
             'success': True,
             'data': serializer.data
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK), etag, last_modified)
 
     def put(self, request, pk):
         """Update attendance"""
-        attendance = self.get_object(pk)
+        try:
+            with transaction.atomic():
+                attendance = self.get_object(pk, for_update=True)
 
-        if not attendance:
-            return Response({
-                'success': False,
-                'error': {
-                    'message': 'Attendance record not found.'
-                }
-            }, status=status.HTTP_404_NOT_FOUND)
+                if not attendance:
+                    return Response({
+                        'success': False,
+                        'error': {
+                            'message': 'Attendance record not found.'
+                        }
+                    }, status=status.HTTP_404_NOT_FOUND)
+
+                serializer = AttendanceSerializer(attendance, data=request.data, partial=True)
+
+                if not serializer.is_valid():
+                    return Response({
+                        'success': False,
+                        'error': serializer.errors
+                    }, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = AttendanceSerializer(attendance, data=request.data, partial=True)
+                serializer.save()
 
-        if serializer.is_valid():
-            serializer.save()
             return Response({
                 'success': True,
                 'message': 'Attendance updated successfully.',
                 'data': serializer.data
             }, status=status.HTTP_200_OK)
 
-        return Response({
-            'success': False,
-            'error': serializer.errors
-        }, status=status.HTTP_400_BAD_REQUEST)
-
-    def delete(self, request, pk):
-        """Delete attendance"""
-        attendance = self.get_object(pk)
+        except ValidationError as e:
+            # Raised on save for a unique constraint violation
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
 
-        if not attendance:
+        except Exception as e:
             return Response({
                 'success': False,
                 'error': {
-                    'message': 'Attendance record not found.'
+                    'message': 'Failed to update attendance.',
+                    'details': str(e)
                 }
-            }, status=status.HTTP_404_NOT_FOUND)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        attendance.delete()
+    def delete(self, request, pk):
+        """Delete attendance"""
+        with transaction.atomic():
+            attendance = self.get_object(pk, for_update=True)
+
+            if not attendance:
+                return Response({
+                    'success': False,
+                    'error': {
+                        'message': 'Attendance record not found.'
+                    }
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            if archive.is_closed(attendance.date):
+                return Response({
+                    'success': False,
+                    'error': {
+                        'message': f'Attendance for {attendance.date:%B %Y} is closed and cannot be deleted.'
+                    }
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            attendance.delete()
 
         return Response({
             'success': True,
@@ -304,19 +662,84 @@ class AttendanceDetailView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+class AttendanceMarkView(APIView):
+    """
+    API endpoint for marking attendance by employee and date
+    PUT: Create or update the employee's mark for the date (idempotent)
+    """
+
+    def put(self, request, employee_id, date):
+        """Mark attendance with a single upsert"""
+        try:
+            if not isinstance(request.data, dict):
+                return Response({
+                    'success': False,
+                    'error': {
+                        'non_field_errors': [
+                            f'Invalid data. Expected a dictionary, but got {type(request.data).__name__}.'
+                        ]
+                    }
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            serializer = AttendanceMarkSerializer(data={'date': date, 'status': request.data.get('status')})
+
+            if not serializer.is_valid():
+                return Response({
+                    'success': False,
+                    'error': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            employee_id = employee_id.strip().upper()
+            attendance, result = bulk.upsert_attendance(
+                employee_id, serializer.validated_data['date'], serializer.validated_data['status']
+            )
+
+            if attendance is None:
+                return Response({
+                    'success': False,
+                    'error': {
+                        'message': f'Employee with ID {employee_id} not found.'
+                    }
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            # The upsert returned the employee's name; no need to load the employee
+            attendance.employee = Employee(
+                pk=attendance.employee_id, employee_id=employee_id, full_name=attendance.full_name
+            )
+
+            return Response({
+                'success': True,
+                'message': f'Attendance {result}.',
+                'result': result,
+                'data': AttendanceSerializer(attendance).data
+            }, status=status.HTTP_201_CREATED if result == 'created' else status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to mark attendance.',
+                    'details': str(e)
+                }
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class EmployeeAttendanceStatsView(APIView):
     """
     API endpoint for employee attendance statistics
-    GET: Get attendance stats for a specific employee
+    GET: Get attendance stats for a specific employee (optional from/to date range)
     """
+    use_read_replica = True
 
     def get(self, request, employee_id):
-        """Get attendance statistics for an employee"""
+        """Get attendance statistics for an employee, optionally within a date range"""
         try:
-            # Get employee
-            try:
-                employee = Employee.objects.get(employee_id=employee_id.upper())
-            except Employee.DoesNotExist:
+            date_from, date_to = get_date_range(request.query_params)
+
+            # Employee lookup and all three counts in a single aggregate query
+            stats = employee_stats(employee_id, date_from, date_to).first()
+
+            if stats is None:
                 return Response({
                     'success': False,
                     'error': {
@@ -324,26 +747,54 @@ class EmployeeAttendanceStatsView(APIView):
                     }
                 }, status=status.HTTP_404_NOT_FOUND)
 
-            # Get attendance records
-            attendances = Attendance.objects.filter(employee=employee)
+            return Response({
+                'success': True,
+                'data': format_employee_stats(stats, date_from, date_to)
+            }, status=status.HTTP_200_OK)
 
-            # Calculate statistics
-            total_days = attendances.count()
-            present_days = attendances.filter(status='Present').count()
-            absent_days = attendances.filter(status='Absent').count()
-            attendance_rate = (present_days / total_days * 100) if total_days > 0 else 0
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
 
+        except Exception as e:
             return Response({
-                'success': True,
-                'data': {
-                    'employee_id': employee.employee_id,
-                    'employee_name': employee.full_name,
-                    'total_days': total_days,
-                    'present_days': present_days,
-                    'absent_days': absent_days,
-                    'attendance_rate': round(attendance_rate, 2)
+                'success': False,
+                'error': {
+                    'message': 'Failed to fetch attendance statistics.',
+                    'details': str(e)
                 }
-            }, status=status.HTTP_200_OK)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class EmployeeStatsBatchView(APIView):
+    """
+    API endpoint for attendance statistics of many employees
+    GET: Per-employee stats filtered by ids/department/date range, paginated and sortable
+    """
+    use_read_replica = True
+
+    def get(self, request):
+        """Get attendance statistics for a page of employees"""
+        try:
+            params = request.query_params
+            date_from, date_to = get_date_range(params)
+            stats = employee_stats_queryset(params, date_from, date_to)
+
+            page = get_page_number(request)
+            page_size = get_page_size(request)
+            rows, total = paginate_by_page(stats, page, page_size)
+
+            return Response(
+                format_stats_page(rows, total, page, page_size, date_from, date_to), status=status.HTTP_200_OK
+            )
+
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
             return Response({
@@ -358,46 +809,198 @@ class EmployeeAttendanceStatsView(APIView):
 class DashboardStatsView(APIView):
     """
     API endpoint for dashboard statistics
-    GET: Get overall system statistics
+    GET: Get overall system statistics (cached, invalidated on writes)
     """
+    use_read_replica = True
 
     def get(self, request):
         """Get dashboard statistics"""
         try:
-            today = timezone.now().date()
+            payload, hit = dashboard_cache.get_dashboard(dashboard.build_payload)
 
-            # Total employees
-            total_employees = Employee.objects.count()
+            response = Response({
+                'success': True,
+                'data': payload
+            }, status=status.HTTP_200_OK)
+            response['X-Cache'] = 'HIT' if hit else 'MISS'
+            return response
 
-            # Today's attendance
-            today_attendance = Attendance.objects.filter(date=today)
-            present_today = today_attendance.filter(status='Present').count()
-            absent_today = today_attendance.filter(status='Absent').count()
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to fetch dashboard statistics.',
+                    'details': str(e)
+                }
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-            # Calculate attendance rate
-            attendance_rate = (present_today / total_employees * 100) if total_employees > 0 else 0
 
-            # Get recent attendance records
-            recent_attendance = Attendance.objects.select_related('employee').order_by('-date', '-created_at')[:10]
-            recent_serializer = AttendanceSerializer(recent_attendance, many=True)
+class MetricsView(APIView):
+    """
+    Prometheus scrape endpoint
+    GET: Request, query and cache metrics of all worker processes on this host
+    """
+
+    def get(self, request):
+        """Render merged metrics in the Prometheus text format"""
+        token = settings.METRICS_TOKEN
+        if token:
+            supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ')
+            if not hmac.compare_digest(supplied.encode(), token.encode()):
+                return Response({
+                    'success': False,
+                    'error': {'message': 'Invalid or missing metrics token.'}
+                }, status=status.HTTP_401_UNAUTHORIZED)
+
+        return HttpResponse(
+            metrics.render(metrics.collector.collect()),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+class CacheStatsView(APIView):
+    """
+    API endpoint for cache monitoring
+    GET: Hit/miss counters of this worker process
+    """
+
+    def get(self, request):
+        """Get cache counters"""
+        return Response({
+            'success': True,
+            'data': {
+                'dashboard': dashboard_cache.dashboard_stats.snapshot(),
+                'employee': {
+                    **dashboard_cache.employee_stats.snapshot(),
+                    'size': len(dashboard_cache.employee_lru),
+                    'max_size': dashboard_cache.employee_lru.maxsize
+                },
+                'employee_shared': dashboard_cache.employee_shared_stats.snapshot()
+            }
+        }, status=status.HTTP_200_OK)
+
+
+class PerformanceStatsView(APIView):
+    """
+    API endpoint for request timing
+    GET: Latency histograms per view and method of this worker process (needs HistogramSink)
+    """
+
+    def get(self, request):
+        """Get the histograms collected by the configured HistogramSink"""
+        sink = performance.get_sink(performance.HistogramSink)
+        if sink is None:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Add core.performance.HistogramSink to PERFORMANCE_SINKS to collect request histograms.'
+                }
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'success': True,
+            'data': sink.snapshot()
+        }, status=status.HTTP_200_OK)
+
+
+class DashboardTrendView(APIView):
+    """
+    API endpoint for attendance trends
+    GET: Daily present/absent totals read from the daily summaries (optional department)
+    """
+    use_read_replica = True
+    DEFAULT_DAYS = 30
+
+    def get(self, request):
+        """Get daily attendance totals for a date range (default: the last 30 days)"""
+        try:
+            date_from, date_to = get_date_range(request.query_params)
+            date_to = date_to or timezone.now().date()
+            date_from = date_from or date_to - timedelta(days=self.DEFAULT_DAYS - 1)
+            if date_from > date_to:
+                raise ValidationError({'from': "'from' must not be after 'to'."})
+
+            summaries = DailyAttendanceSummary.objects.filter(date__range=(date_from, date_to))
+
+            department = request.query_params.get('department')
+            if department:
+                summaries = summaries.filter(department__name__iexact=department.strip())
+
+            days = summaries.values('date').annotate(
+                present=Sum('present'),
+                absent=Sum('absent'),
+                headcount=Sum('headcount')
+            ).order_by('date')
 
             return Response({
                 'success': True,
-                'data': {
-                    'total_employees': total_employees,
-                    'present_today': present_today,
-                    'absent_today': absent_today,
-                    'attendance_rate': round(attendance_rate, 2),
-                    'today_date': str(today),
-                    'recent_attendance': recent_serializer.data
+                'data': [
+                    {
+                        'date': str(day['date']),
+                        'present': day['present'],
+                        'absent': day['absent'],
+                        'headcount': day['headcount'],
+                        'attendance_rate': round(
+                            day['present'] / day['headcount'] * 100 if day['headcount'] > 0 else 0, 2
+                        )
+                    }
+                    for day in days
+                ],
+                'from': str(date_from),
+                'to': str(date_to)
+            }, status=status.HTTP_200_OK)
+
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': {
+                    'message': 'Failed to fetch attendance trend.',
+                    'details': str(e)
                 }
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class DepartmentListView(APIView):
+    """
+    API endpoint for departments
+    GET: Departments with their headcount and today's present/absent totals
+    """
+    use_read_replica = True
+
+    def get(self, request):
+        """Get all departments, read from the counters and today's summaries"""
+        try:
+            today = timezone.now().date()
+            departments = Department.objects.annotate(
+                today=FilteredRelation('daily_summaries', condition=Q(daily_summaries__date=today))
+            ).values('id', 'name', 'headcount', 'today__present', 'today__absent')
+
+            return Response({
+                'success': True,
+                'data': [
+                    {
+                        'id': department['id'],
+                        'name': department['name'],
+                        'headcount': department['headcount'],
+                        'present_today': department['today__present'] or 0,
+                        'absent_today': department['today__absent'] or 0
+                    }
+                    for department in departments
+                ],
+                'today_date': str(today)
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
             return Response({
                 'success': False,
                 'error': {
-                    'message': 'Failed to fetch dashboard statistics.',
+                    'message': 'Failed to fetch departments.',
                     'details': str(e)
                 }
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hrms.settings')
+# Under ASGI every request runs its sync code on a fresh thread, so persistent
+# connections would pile up one per request; reuse them with DB_POOL instead.
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
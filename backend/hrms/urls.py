@@ -4,7 +4,10 @@ URL configuration for hrms project.
 from django.contrib import admin
 from django.urls import path, include
 
+from core.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('core.urls')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
@@ -14,6 +14,8 @@ const API = {
             headers: {
                 'Content-Type': 'application/json',
             },
+            // Send the backend's cookies so reads right after a write see it
+            credentials: 'include',
         };
 
         const config = { ...defaultOptions, ...options };
@@ -52,12 +54,51 @@ const API = {
         }
     },
 
+    /**
+     * Department API
+     */
+    departments: {
+        async getAll() {
+            return await API.request('/departments/');
+        }
+    },
+
     /**
      * Employee API
      */
     employees: {
-        async getAll() {
-            return await API.request('/employees/');
+        async getAll(page = 1, pageSize = 50) {
+            return await API.request(`/employees/?page=${page}&page_size=${pageSize}`);
+        },
+
+        /**
+         * Every employee's ID and name, following the list cursor to the last page
+         */
+        async getOptions() {
+            const employees = [];
+            let cursor = null;
+
+            do {
+                const params = new URLSearchParams({
+                    fields: 'employee_id,full_name',
+                    page_size: 500,
+                    count: 'none'
+                });
+                if (cursor) {
+                    params.append('cursor', cursor);
+                }
+
+                const response = await API.request(`/employees/?${params.toString()}`);
+                employees.push(...response.data);
+                cursor = response.next;
+            } while (cursor);
+
+            return employees;
+        },
+
+        async search(query, page = 1, pageSize = 50) {
+            const params = new URLSearchParams({ q: query, page, page_size: pageSize });
+            return await API.request(`/employees/search/?${params.toString()}`);
         },
 
         async getById(id) {
@@ -89,6 +130,23 @@ const API = {
         }
     },
 
+    /**
+     * Statistics API
+     */
+    stats: {
+        async getEmployees(filters = {}) {
+            const params = new URLSearchParams();
+
+            for (const key of ['ids', 'department', 'from', 'to', 'ordering', 'page', 'page_size']) {
+                if (filters[key]) {
+                    params.append(key, filters[key]);
+                }
+            }
+
+            return await API.request(`/stats/employees/?${params.toString()}`);
+        }
+    },
+
     /**
      * Attendance API
      */
@@ -105,11 +163,13 @@ const API = {
             if (filters.status) {
                 params.append('status', filters.status);
             }
+            if (filters.cursor) {
+                params.append('cursor', filters.cursor);
+            }
+            // The planner's estimate is enough for a badge; exact counts scan every match
+            params.append('count', filters.count || 'estimated');
 
-            const queryString = params.toString();
-            const endpoint = queryString ? `/attendance/?${queryString}` : '/attendance/';
-
-            return await API.request(endpoint);
+            return await API.request(`/attendance/?${params.toString()}`);
         },
 
         async getById(id) {
@@ -123,6 +183,13 @@ const API = {
             });
         },
 
+        async mark(employeeId, date, status) {
+            return await API.request(`/attendance/${encodeURIComponent(employeeId)}/${date}/`, {
+                method: 'PUT',
+                body: JSON.stringify({ status })
+            });
+        },
+
         async update(id, attendanceData) {
             return await API.request(`/attendance/${id}/`, {
                 method: 'PUT',
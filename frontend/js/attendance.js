@@ -5,9 +5,15 @@
 // Store current filters
 let currentFilters = {};
 
+// Rows loaded so far, the cursor of the next page and the (estimated) total
+let loadedAttendance = [];
+let nextAttendanceCursor = null;
+let attendanceTotal = null;
+
 // Initialize attendance page when loaded
 document.addEventListener('DOMContentLoaded', () => {
     loadAttendance();
+    loadEmployeeOptions();
     setupAttendanceForm();
     setupFilters();
 
@@ -19,7 +25,7 @@ document.addEventListener('DOMContentLoaded', () => {
 });
 
 /**
- * Load all attendance records
+ * Load the first page of attendance records
  */
 async function loadAttendance(filters = {}) {
     const container = document.getElementById('attendanceListContainer');
@@ -29,8 +35,11 @@ async function loadAttendance(filters = {}) {
         const response = await API.attendance.getAll(filters);
 
         if (response.success) {
-            updateAttendanceCount(response.count);
-            renderAttendance(response.data);
+            loadedAttendance = response.data;
+            nextAttendanceCursor = response.next;
+            attendanceTotal = response.count;
+            updateAttendanceCount();
+            renderAttendance(loadedAttendance);
         }
     } catch (error) {
         console.error('Failed to load attendance:', error);
@@ -42,13 +51,65 @@ async function loadAttendance(filters = {}) {
     }
 }
 
+/**
+ * Suggest every employee in the employee ID inputs
+ */
+async function loadEmployeeOptions() {
+    const list = document.getElementById('employeeOptions');
+    if (!list) return;
+
+    try {
+        const employees = await API.employees.getOptions();
+        list.innerHTML = employees
+            .map(employee => `<option value="${Utils.escapeHtml(employee.employee_id)}">${Utils.escapeHtml(employee.full_name)}</option>`)
+            .join('');
+    } catch (error) {
+        console.error('Failed to load employees:', error);
+    }
+}
+
+/**
+ * Load the next page of attendance records and append it to the table
+ */
+async function loadMoreAttendance() {
+    const loadMoreBtn = document.getElementById('loadMoreAttendanceBtn');
+    Utils.disableButton(loadMoreBtn, 'Loading...');
+
+    try {
+        // The total came with the first page; later pages skip counting
+        const response = await API.attendance.getAll({
+            ...currentFilters,
+            cursor: nextAttendanceCursor,
+            count: 'none'
+        });
+
+        if (response.success) {
+            loadedAttendance = loadedAttendance.concat(response.data);
+            nextAttendanceCursor = response.next;
+            updateAttendanceCount();
+            renderAttendance(loadedAttendance);
+        }
+    } catch (error) {
+        console.error('Failed to load more attendance:', error);
+        Utils.showError(error);
+        Utils.enableButton(loadMoreBtn);
+    }
+}
+
 /**
  * Update attendance count badge
  */
-function updateAttendanceCount(count) {
+function updateAttendanceCount() {
     const badge = document.getElementById('attendanceCount');
-    if (badge) {
-        badge.textContent = `${count} Record${count !== 1 ? 's' : ''}`;
+    if (!badge) return;
+
+    const shown = loadedAttendance.length;
+    if (!nextAttendanceCursor) {
+        badge.textContent = `${shown} Record${shown !== 1 ? 's' : ''}`;
+    } else if (attendanceTotal !== null && attendanceTotal !== undefined) {
+        badge.textContent = `${shown} of ~${attendanceTotal} Records`;
+    } else {
+        badge.textContent = `${shown}+ Records`;
     }
 }
 
@@ -109,6 +170,13 @@ function renderAttendance(attendances) {
                 </tbody>
             </table>
         </div>
+        ${nextAttendanceCursor ? `
+            <div class="text-center" style="margin-top: 1rem;">
+                <button type="button" class="btn btn-secondary" id="loadMoreAttendanceBtn" onclick="loadMoreAttendance()">
+                    Load More
+                </button>
+            </div>
+        ` : ''}
     `;
 
     container.innerHTML = tableHTML;
@@ -146,10 +214,14 @@ function setupAttendanceForm() {
         Utils.disableButton(submitBtn, 'Marking Attendance...');
 
         try {
-            const response = await API.attendance.create(formData);
+            // Idempotent: marking again corrects the existing record instead of failing
+            const response = await API.attendance.mark(formData.employee_id, formData.date, formData.status);
 
             if (response.success) {
-                Utils.showAlert('Attendance marked successfully!', 'success');
+                Utils.showAlert(
+                    response.result === 'created' ? 'Attendance marked successfully!' : response.message,
+                    'success'
+                );
                 Utils.resetForm(form);
 
                 // Reset date to today
@@ -5,22 +5,47 @@
 // Initialize employees page when loaded
 document.addEventListener('DOMContentLoaded', () => {
     loadEmployees();
+    loadDepartments();
     setupEmployeeForm();
+    setupEmployeeSearch();
 });
 
+// Page of the employee table currently shown
+let currentPage = 1;
+
+/**
+ * Current search text ('' lists all employees)
+ */
+function getSearchQuery() {
+    const input = document.getElementById('employeeSearch');
+    return input ? input.value.trim() : '';
+}
+
 /**
- * Load all employees
+ * Load a page of employees, or of the server-side search results when a search is entered
  */
-async function loadEmployees() {
+async function loadEmployees(page = currentPage) {
     const container = document.getElementById('employeeListContainer');
-    Utils.showLoading(container, 'Loading employees...');
+    const query = getSearchQuery();
+    Utils.showLoading(container, query ? 'Searching employees...' : 'Loading employees...');
 
     try {
-        const response = await API.employees.getAll();
+        const response = query ? await API.employees.search(query, page) : await API.employees.getAll(page);
+
+        // Ignore responses for a search the user has already changed
+        if (query !== getSearchQuery()) return;
 
         if (response.success) {
+            // The last row of a page was deleted: show the page before it
+            const lastPage = Math.max(1, Math.ceil(response.count / response.page_size));
+            if (page > lastPage) {
+                return loadEmployees(lastPage);
+            }
+
+            currentPage = page;
             updateEmployeeCount(response.count);
-            renderEmployees(response.data);
+            renderEmployees(response.data, query);
+            renderPager(container, page, lastPage);
         }
     } catch (error) {
         console.error('Failed to load employees:', error);
@@ -32,6 +57,25 @@ async function loadEmployees() {
     }
 }
 
+/**
+ * Offer the existing departments as suggestions in the form
+ */
+async function loadDepartments() {
+    const list = document.getElementById('departmentOptions');
+    if (!list) return;
+
+    try {
+        const response = await API.departments.getAll();
+        if (response.success) {
+            list.innerHTML = response.data
+                .map(department => `<option value="${Utils.escapeHtml(department.name)}"></option>`)
+                .join('');
+        }
+    } catch (error) {
+        console.error('Failed to load departments:', error);
+    }
+}
+
 /**
  * Update employee count badge
  */
@@ -45,9 +89,19 @@ function updateEmployeeCount(count) {
 /**
  * Render employees table
  */
-function renderEmployees(employees) {
+function renderEmployees(employees, query = '') {
     const container = document.getElementById('employeeListContainer');
 
+    if ((!employees || employees.length === 0) && query) {
+        Utils.showEmpty(
+            container,
+            'No Matching Employees',
+            'Try an employee ID, email, name or department.',
+            '🔍'
+        );
+        return;
+    }
+
     if (!employees || employees.length === 0) {
         Utils.showEmpty(
             container,
@@ -104,6 +158,35 @@ function renderEmployees(employees) {
     container.innerHTML = tableHTML;
 }
 
+/**
+ * Add Previous/Next buttons below the table when there is more than one page
+ */
+function renderPager(container, page, lastPage) {
+    if (lastPage <= 1) return;
+
+    container.insertAdjacentHTML('beforeend', `
+        <div class="text-center" style="margin-top: 1rem;">
+            <button type="button" class="btn btn-secondary" onclick="loadEmployees(${page - 1})" ${page <= 1 ? 'disabled' : ''}>
+                ← Previous
+            </button>
+            <span style="margin: 0 1rem;">Page ${page} of ${lastPage}</span>
+            <button type="button" class="btn btn-secondary" onclick="loadEmployees(${page + 1})" ${page >= lastPage ? 'disabled' : ''}>
+                Next →
+            </button>
+        </div>
+    `);
+}
+
+/**
+ * Search as the user types
+ */
+function setupEmployeeSearch() {
+    const input = document.getElementById('employeeSearch');
+    if (!input) return;
+
+    input.addEventListener('input', Utils.debounce(() => loadEmployees(1), 300));
+}
+
 /**
  * Setup employee form submission
  */
@@ -137,7 +220,9 @@ function setupEmployeeForm() {
             if (response.success) {
                 Utils.showAlert('Employee added successfully!', 'success');
                 Utils.resetForm(form);
-                loadEmployees();
+                // Newest employees are listed first
+                loadEmployees(1);
+                loadDepartments();
                 Utils.scrollToTop();
             }
         } catch (error) {